@@ -14,6 +14,8 @@ import numpy as np
 from pathlib import Path
 from typing import Dict, List
 
+from aggregation import summarize
+
 
 def load_glassdoor_data(csv_path: str) -> pd.DataFrame:
     """Load and clean Glassdoor submission data."""
@@ -39,16 +41,8 @@ def create_city_aggregations(df: pd.DataFrame) -> pd.DataFrame:
     if 'salary_median_cad' not in df.columns or 'city' not in df.columns:
         return pd.DataFrame()
     
-    city_stats = df.groupby('city')['salary_median_cad'].agg([
-        ('count', 'count'),
-        ('avg_salary', 'mean'),
-        ('min_salary', 'min'),
-        ('median_salary', 'median'),
-        ('p25_salary', lambda x: x.quantile(0.25)),
-        ('p75_salary', lambda x: x.quantile(0.75)),
-        ('max_salary', 'max'),
-        ('std_salary', 'std')
-    ]).reset_index()
+    city_stats = summarize(df, 'salary_median_cad', 'city', std=True)
+    city_stats = city_stats[['count', 'mean', 'min', 'median', 'p25', 'p75', 'max', 'std']].reset_index()
     
     city_stats.columns = ['city', 'submissions', 'avg_salary_cad', 'min_salary_cad', 
                           'median_salary_cad', 'p25_salary_cad', 'p75_salary_cad', 
@@ -67,15 +61,8 @@ def create_experience_aggregations(df: pd.DataFrame) -> pd.DataFrame:
                               bins=[0, 3, 6, 9, 12, 20],
                               labels=['0-3 years', '4-6 years', '7-9 years', '10-12 years', '13+ years'])
     
-    exp_stats = df.groupby('exp_level')['salary_median_cad'].agg([
-        ('count', 'count'),
-        ('avg_salary', 'mean'),
-        ('min_salary', 'min'),
-        ('median_salary', 'median'),
-        ('p25_salary', lambda x: x.quantile(0.25)),
-        ('p75_salary', lambda x: x.quantile(0.75)),
-        ('max_salary', 'max'),
-    ]).reset_index()
+    exp_stats = summarize(df, 'salary_median_cad', 'exp_level')
+    exp_stats = exp_stats[['count', 'mean', 'min', 'median', 'p25', 'p75', 'max']].reset_index()
     
     exp_stats.columns = ['experience_level', 'submissions', 'avg_salary_cad', 'min_salary_cad',
                         'median_salary_cad', 'p25_salary_cad', 'p75_salary_cad', 'max_salary_cad']
@@ -95,12 +82,8 @@ def create_city_experience_matrix(df: pd.DataFrame) -> pd.DataFrame:
     
     df['city'] = df['location'].apply(lambda x: x.split(',')[0].strip() if isinstance(x, str) else x)
     
-    matrix = df.pivot_table(
-        values='salary_median_cad',
-        index='city',
-        columns='exp_level',
-        aggfunc='median'
-    ).reset_index()
+    matrix = summarize(df, 'salary_median_cad', ['city', 'exp_level'], quantiles=())
+    matrix = matrix['median'].unstack('exp_level').reset_index()
     
     return matrix
 
@@ -110,10 +93,17 @@ def create_company_rankings(df: pd.DataFrame, min_submissions: int = 2) -> pd.Da
     if 'salary_median_cad' not in df.columns or 'company_name' not in df.columns:
         return pd.DataFrame()
     
-    company_stats = df.groupby('company_name').agg({
-        'salary_median_cad': ['count', 'median', 'mean', 'min', 'max'],
-        'location': lambda x: x.mode()[0] if len(x.mode()) > 0 else 'Unknown'
-    }).reset_index()
+    company_stats = summarize(df, 'salary_median_cad', 'company_name', quantiles=())
+    company_stats = company_stats[['count', 'median', 'mean', 'min', 'max']]
+    
+    # Most frequent location per company (ties: first alphabetically, like Series.mode)
+    location_counts = df.groupby(['company_name', 'location']).size().reset_index(name='n')
+    top_location = (location_counts
+                    .sort_values(['company_name', 'n', 'location'], ascending=[True, False, True])
+                    .drop_duplicates('company_name')
+                    .set_index('company_name')['location'])
+    company_stats['top_location'] = top_location.reindex(company_stats.index).fillna('Unknown')
+    company_stats = company_stats.reset_index()
     
     company_stats.columns = ['company_name', 'submissions', 'median_salary_cad', 
                             'avg_salary_cad', 'min_salary_cad', 'max_salary_cad', 'top_location']
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Vectorized group statistics for salary aggregations.
+
+Replaces groupby(...).agg([..., lambda x: x.quantile(q)]) passes, which call
+back into Python once per group and quantile. Here:
+- the value column is sorted once
+- each grouping (one dimension or a cross-product such as city × exp_level)
+  is a stable sort of integer group codes over that order, so every group's
+  values end up contiguous and already sorted
+- count/mean/std come from np.bincount, min/max/median/quantiles are read
+  straight off the sorted values by position (linear interpolation, like
+  pandas' quantile)
+
+    aggs = summarize_all(df, 'salary_median', {
+        'city': ['city'],
+        'city_experience': ['city', 'exp_level'],
+    }, quantiles=(0.25, 0.75))
+
+Output is one row per observed group, sorted by the group keys, with columns
+count, mean, median, min, max, p25, p75 (and std if asked).
+"""
+
+from typing import Dict, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+def quantile_label(q: float) -> str:
+    """0.25 -> 'p25', 0.975 -> 'p97.5'."""
+    return f"p{q * 100:g}"
+
+
+def _group_codes(df: pd.DataFrame, by: Sequence[str]):
+    """Integer group code per row (-1 where a key is missing) and the group index."""
+    codes, levels = [], []
+    for col in by:
+        col_codes, uniques = pd.factorize(df[col], sort=True)
+        codes.append(col_codes)
+        levels.append(uniques)
+
+    valid = np.logical_and.reduce([c >= 0 for c in codes])
+    shape = tuple(max(len(u), 1) for u in levels)
+    flat = np.full(len(df), -1, dtype=np.int64)
+    flat[valid] = np.ravel_multi_index([c[valid] for c in codes], shape)
+
+    n_cells = int(np.prod(shape))
+    if n_cells <= 4 * len(df) + 1024:
+        # Dense key space: number the observed cells with a bincount, no sort
+        present = np.bincount(flat[valid], minlength=n_cells) > 0
+        group_ids = np.flatnonzero(present)
+        inverse = (np.cumsum(present) - 1)[flat[valid]]
+    else:
+        group_ids, inverse = np.unique(flat[valid], return_inverse=True)
+    row_codes = np.full(len(df), -1, dtype=np.int64)
+    row_codes[valid] = inverse
+
+    positions = np.unravel_index(group_ids, shape)
+    keys = [levels[i].take(positions[i]) for i in range(len(by))]
+    if len(by) == 1:
+        index = pd.Index(keys[0], name=by[0])
+    else:
+        index = pd.MultiIndex.from_arrays(keys, names=list(by))
+    return row_codes, index
+
+
+def _summarize_sorted(values, order, codes, index, quantiles, std):
+    """Stats per group, given values sorted once (order) and group codes per row."""
+    n_groups = len(index)
+    # Rows with a value and a group, sorted by value, then stably by group
+    order = order[codes[order] >= 0]
+    # Small integer codes make the stable sort a radix sort
+    group_dtype = np.int16 if n_groups < 2 ** 15 else np.int64
+    order = order[np.argsort(codes[order].astype(group_dtype), kind='stable')]
+    v = values[order]
+    g = codes[order]
+
+    count = np.bincount(g, minlength=n_groups)
+    start = np.cumsum(count) - count
+    empty = count == 0
+    last = np.where(empty, 0, start + count - 1)
+
+    def at(pos):
+        out = v[np.clip(pos, 0, max(len(v) - 1, 0))] if len(v) else np.zeros(n_groups)
+        return np.where(empty, np.nan, out)
+
+    def quantile(q):
+        h = (np.maximum(count, 1) - 1) * q
+        lo = np.floor(h).astype(np.int64)
+        hi = np.minimum(lo + 1, np.maximum(count - 1, 0))
+        below, above = at(start + lo), at(start + hi)
+        return below + (h - lo) * (above - below)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        total = np.bincount(g, weights=v, minlength=n_groups)
+        mean = total / count
+        stats = {
+            'count': count,
+            'mean': mean,
+            'median': quantile(0.5),
+            'min': at(start),
+            'max': at(last),
+        }
+        for q in quantiles:
+            stats[quantile_label(q)] = quantile(q)
+        if std:
+            sq = np.bincount(g, weights=(v - mean[g]) ** 2, minlength=n_groups)
+            stats['std'] = np.where(count > 1, np.sqrt(sq / (count - 1)), np.nan)
+    return pd.DataFrame(stats, index=index)
+
+
+def _prepare_values(df: pd.DataFrame, value: str):
+    column = df[value]
+    values = column.to_numpy(dtype=float, na_value=np.nan)
+    has_value = ~np.isnan(values)
+    order = np.flatnonzero(has_value)
+    order = order[np.argsort(values[order])]
+    return values, order, column.dtype
+
+
+def _restore_dtype(stats: pd.DataFrame, dtype) -> pd.DataFrame:
+    """Keep integer min/max integer, like groupby().min() on an int column."""
+    if pd.api.types.is_integer_dtype(dtype) and (stats['count'] > 0).all():
+        stats['min'] = stats['min'].astype(dtype)
+        stats['max'] = stats['max'].astype(dtype)
+    return stats
+
+
+def summarize_all(df: pd.DataFrame, value: str, groupings: Dict[str, Sequence[str]],
+                  quantiles=(0.25, 0.75), std: bool = False) -> Dict[str, pd.DataFrame]:
+    """Group statistics of `value` for several groupings, sorting the values once.
+
+    groupings maps an output name to the list of columns to group by.
+    """
+    values, order, dtype = _prepare_values(df, value)
+    results = {}
+    for name, by in groupings.items():
+        by = [by] if isinstance(by, str) else list(by)
+        codes, index = _group_codes(df, by)
+        stats = _summarize_sorted(values, order, codes, index, quantiles, std)
+        results[name] = _restore_dtype(stats, dtype)
+    return results
+
+
+def summarize(df: pd.DataFrame, value: str, by, quantiles=(0.25, 0.75),
+              std: bool = False) -> pd.DataFrame:
+    """Group statistics of `value` for one grouping (a column or list of columns)."""
+    return summarize_all(df, value, {'_': by}, quantiles, std)['_']
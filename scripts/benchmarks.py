@@ -0,0 +1,799 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the data pipeline on synthetic data.
+
+Usage:
+    python scripts/benchmarks.py dedup --master 1000000 --new 100000
+    python scripts/benchmarks.py load --rows 1000000
+    python scripts/benchmarks.py aggregate --rows 2000000
+    python scripts/benchmarks.py salary --rows 1000000
+    python scripts/benchmarks.py levelsfyi-csv --rows 2000000
+    python scripts/benchmarks.py standardize --rows 1000000
+    python scripts/benchmarks.py jobbank --nocs 500 --dates 20
+    python scripts/benchmarks.py submissions --pages 20 --entries 2000
+    python scripts/benchmarks.py companies --lines 50000 --names 20 500 5000
+    python scripts/benchmarks.py handout --charts 20 --points 500
+    python scripts/benchmarks.py charts --rows 200000 --workers 4
+    python scripts/benchmarks.py scatter --rows 2000 50000 1000000
+    python scripts/benchmarks.py views --rows 1000000
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import plotly.io as pio
+from bs4 import BeautifulSoup
+
+from aggregation import summarize_all
+from chart_export import PLOTLY_BUNDLE, SPEC_MANIFEST, save_figure, spec_path
+from company_matcher import CompanyMatcher
+from generate_benchmark_charts import (CHARTS, MAX_SVG_POINTS, MAX_WEBGL_POINTS, ChartData, box_stats,
+                                       generate_role_evolution, generate_salary_vs_exp,
+                                       generate_total_comp, render_charts)
+from master_schema import EXPERIENCE_BUCKETS
+from master_store import load_master
+from master_views import VIEWS, FrameViews, MasterViews
+from merge_datasets import find_duplicate_pairs, standardize_levelsfyi_to_master
+from process_real_data import (EXPERIENCE_LEVELS, JOB_BANK_LOCATIONS, build_experience_table,
+                               build_geo_table, build_percentiles_table)
+from salary_parser import (CORPUS, check_corpus, parse_compensation, parse_compensation_column,
+                           parse_salary, parse_salary_column)
+from storage import BACKENDS, parquet_available, read_table, table_path, write_table
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'scrapers'))
+from extract_glassdoor_submissions import extract_submissions_from_html, scan_submissions_text
+from extract_levelsfyi_data import COLUMN_ALIASES, load_levelsfyi_csv
+
+CITIES = ['Montreal', 'Toronto', 'Vancouver', 'Ottawa', 'Calgary', 'Quebec City',
+          'San Francisco', 'Seattle', 'New York', 'Austin']
+
+
+def synthetic_records(n: int, n_companies: int = 5000, seed: int = 0) -> pd.DataFrame:
+    """Master-format records with realistic key skew (a few big companies)."""
+    rng = np.random.default_rng(seed)
+    company_ids = np.minimum(rng.zipf(1.3, n), n_companies) - 1
+    return pd.DataFrame({
+        'company': pd.Series(company_ids).map(lambda i: f"Company {i}"),
+        'city': rng.choice(CITIES, n),
+        'salary_median': rng.normal(140000, 45000, n).round(-2).clip(40000, 600000),
+    })
+
+
+def synthetic_master(n: int, seed: int = 0) -> pd.DataFrame:
+    """Full master-schema frame for storage benchmarks."""
+    rng = np.random.default_rng(seed)
+    df = synthetic_records(n, seed=seed)
+    years = rng.integers(0, 20, n)
+    return pd.DataFrame({
+        'source': rng.choice(['Glassdoor', 'Levels.fyi', 'Job Bank'], n),
+        'collection_date': '2026-01-15',
+        'location': df['city'] + ', Canada',
+        'job_title': rng.choice(['ML Engineer', 'AI Engineer', 'Data Scientist'], n),
+        'exp_years_min': years,
+        'exp_years_max': years + 3,
+        'salary_min': df['salary_median'] * 0.9,
+        'salary_max': df['salary_median'] * 1.1,
+        'salary_median': df['salary_median'],
+        'company': df['company'],
+        'level': rng.choice(['L3', 'L4', 'L5', 'Not Specified'], n),
+        'country': rng.choice(['Canada', 'USA'], n),
+        'city': df['city'],
+        'exp_level': rng.choice(['0-3 years', '4-6 years', '7-9 years'], n),
+    })
+
+
+def _best_of(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def bench_load(args):
+    print(f"🧪 Generating {args.rows:,} master records...")
+    df = synthetic_master(args.rows)
+    projection = ['city', 'exp_level', 'salary_median']
+    formats = ['csv'] + (['parquet'] if parquet_available() else [])
+    if len(formats) == 1:
+        print("   ⚠️  pyarrow not installed, only timing CSV")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"\n{'format':10s} {'size MB':>9s} {'write s':>9s} {'read s':>9s} {'3 cols s':>9s}")
+        for fmt in formats:
+            write_s, _ = _best_of(lambda: write_table(df, 'bench', fmt, data_dir=tmp), 1)
+            # Keep only this format on disk so read_table picks it
+            for other in BACKENDS:
+                if other != fmt:
+                    table_path('bench', other, tmp).unlink(missing_ok=True)
+            size_mb = table_path('bench', fmt, tmp).stat().st_size / 1e6
+            read_s, loaded = _best_of(lambda: read_table('bench', data_dir=tmp), args.repeat)
+            proj_s, _ = _best_of(lambda: read_table('bench', projection, data_dir=tmp), args.repeat)
+            print(f"{fmt:10s} {size_mb:9.1f} {write_s:9.2f} {read_s:9.2f} {proj_s:9.2f}")
+            assert len(loaded) == len(df)
+    return 0
+
+
+def bench_aggregate(args):
+    print(f"🧪 Generating {args.rows:,} master records...")
+    df = synthetic_master(args.rows)
+    dimensions = {
+        'city': ['city'],
+        'experience': ['exp_level'],
+        'source': ['source'],
+        'country': ['country'],
+        'city_experience': ['city', 'exp_level'],
+        'company': ['company'],
+    }
+
+    start = time.perf_counter()
+    aggs = summarize_all(df, 'salary_median', dimensions)
+    elapsed = time.perf_counter() - start
+    groups = sum(len(agg) for agg in aggs.values())
+    print(f"   ✓ summarize_all: {elapsed:.2f} s for {len(dimensions)} groupings ({groups:,} groups)")
+
+    start = time.perf_counter()
+    for name, by in dimensions.items():
+        expected = df.groupby(by)['salary_median'].agg([
+            'count', 'mean', 'median', 'min', 'max',
+            lambda x: x.quantile(0.25),
+            lambda x: x.quantile(0.75)
+        ])
+        expected.columns = aggs[name].columns
+        pd.testing.assert_frame_equal(aggs[name], expected, check_dtype=False, check_index_type=False)
+    elapsed = time.perf_counter() - start
+    print(f"   ✓ identical to groupby().agg with quantile lambdas, which took {elapsed:.2f} s")
+    return 0
+
+
+def _naive_duplicate_counts(df_master, df_new, window):
+    """The original per-row scan, used as a reference on a small sample."""
+    counts = {}
+    for idx, new_row in df_new.iterrows():
+        matches = df_master[
+            (df_master['company'] == new_row['company']) &
+            (df_master['city'] == new_row['city']) &
+            (abs(df_master['salary_median'] - new_row['salary_median']) < window)
+        ]
+        if len(matches) > 0:
+            counts[idx] = len(matches)
+    return counts
+
+
+def bench_dedup(args):
+    print(f"🧪 Generating {args.master:,} master × {args.new:,} incoming records...")
+    df_master = synthetic_records(args.master, seed=1)
+    df_new = synthetic_records(args.new, seed=2)
+
+    start = time.perf_counter()
+    pairs = find_duplicate_pairs(df_master, df_new, args.window)
+    elapsed = time.perf_counter() - start
+    print(f"   ✓ find_duplicate_pairs: {elapsed:.2f} s, {len(pairs):,} pairs, "
+          f"{pairs['new_index'].nunique():,} incoming records with a match")
+
+    # Check against the original row-by-row scan on a sample
+    sample = df_new.sample(min(args.check, len(df_new)), random_state=0)
+    start = time.perf_counter()
+    expected = _naive_duplicate_counts(df_master, sample, args.window)
+    naive_elapsed = time.perf_counter() - start
+    got = pairs[pairs['new_index'].isin(sample.index)].groupby('new_index').size().to_dict()
+    status = '✓ identical' if got == expected else '❌ MISMATCH'
+    per_row = naive_elapsed / len(sample)
+    print(f"   {status} to the row-by-row scan on {len(sample)} sampled records")
+    print(f"   Row-by-row scan: {per_row * 1000:.1f} ms/record "
+          f"(≈ {per_row * len(df_new):,.0f} s for all {len(df_new):,})")
+    return 0 if got == expected else 1
+
+
+def _legacy_extract_salary_number(text):
+    """The per-call .replace chain the extractors used to copy, as a baseline."""
+    if not text:
+        return None
+    clean = text.strip().replace('$', '').replace(',', '')
+    if 'K' in clean or 'k' in clean:
+        try:
+            return int(float(clean.replace('K', '').replace('k', '').strip()) * 1000)
+        except ValueError:
+            return None
+    try:
+        return int(float(clean))
+    except ValueError:
+        return None
+
+
+def bench_salary(args):
+    errors = check_corpus()
+    for error in errors:
+        print(f"   ❌ {error}")
+    print(f"   {'✓' if not errors else '❌'} {len(CORPUS)} corpus cases, scalar and vectorized")
+
+    # Mixed formats with many distinct values, like a real export
+    rng = np.random.default_rng(0)
+    formats = [lambda a, b: f"${a}K", lambda a, b: f"{a} {b:03d} $CA",
+               lambda a, b: f"{a},{b % 10} k", lambda a, b: f"${a},{b:03d}"]
+    texts = pd.Series([formats[f](a, b) for a, b, f in zip(rng.integers(40, 400, args.rows),
+                                                           rng.integers(0, 1000, args.rows),
+                                                           rng.integers(0, len(formats), args.rows))])
+    breakdowns = pd.Series([f"{a} k | {b} k | {c} k" if a % 5 else f"{a} k | N/A | N/A"
+                            for a, b, c in rng.integers(0, 400, (args.rows, 3))])
+    print(f"\n🧪 Parsing {args.rows:,} salary strings ({texts.nunique():,} distinct)")
+    print(f"{'parser':38s} {'s':>7s} {'M rows/s':>9s}")
+    runs = [
+        ('legacy extract_salary_number', lambda: [_legacy_extract_salary_number(t) for t in texts]),
+        ('parse_salary (scalar)', lambda: [parse_salary(t) for t in texts]),
+        ('parse_salary_column (vectorized)', lambda: parse_salary_column(texts)),
+        ('parse_compensation (scalar)', lambda: [parse_compensation(t) for t in breakdowns]),
+        ('parse_compensation_column (vectorized)', lambda: parse_compensation_column(breakdowns)),
+    ]
+    for name, fn in runs:
+        elapsed, _ = _best_of(fn, args.repeat)
+        print(f"{name:38s} {elapsed:7.2f} {args.rows / elapsed / 1e6:9.2f}")
+    return 0 if not errors else 1
+
+
+def _legacy_parse_levelsfyi_rows(df):
+    """The original iterrows() ingest (alias lookup per row and field), used as a reference."""
+    df = df.rename(columns=lambda col: col.lower().strip())
+    data = []
+    for _, row in df.iterrows():
+        record = {'source': 'Levels.fyi'}
+        for field, aliases in COLUMN_ALIASES.items():
+            value = None
+            for col in aliases:
+                if col in df.columns:
+                    value = row[col]
+                    break
+            if field.endswith('_cad'):
+                value = parse_salary(str(value))
+            record[field] = value
+        title = str(record['title']).lower()
+        if pd.isna(record['company']) or not ('ai' in title or 'ml' in title or 'machine' in title):
+            continue
+        data.append(record)
+    return data
+
+
+def bench_levelsfyi_csv(args):
+    print(f"🧪 Writing a {args.rows:,}-row Levels.fyi export...")
+    rng = np.random.default_rng(0)
+    comp = rng.integers(90, 600, args.rows)
+    export = pd.DataFrame({
+        'Company': rng.choice(['Google', 'Meta', 'Shopify', 'Cohere', 'Amazon'], args.rows),
+        'Title': rng.choice(['Machine Learning Engineer', 'AI Engineer', 'Software Engineer',
+                             'Data Scientist', 'ML Engineer'], args.rows),
+        'Level': rng.choice(['L3', 'L4', 'L5', 'L6'], args.rows),
+        'Location': rng.choice(['Toronto, ON', 'Vancouver, BC', 'Montreal, QC'], args.rows),
+        'Total Comp': [f"{c}K" for c in comp],
+        'Base Salary': [f"${c * 700:,}" for c in comp],
+        'Stock': rng.integers(0, 200, args.rows) * 1000,
+        'Bonus': [f"{b}K" for b in rng.integers(0, 60, args.rows)],
+        'Years of Experience': rng.integers(0, 20, args.rows),
+    })
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'levelsfyi_export.csv'
+        export.to_csv(path, index=False)
+        size_mb = path.stat().st_size / 1e6
+        elapsed, df = _best_of(lambda: load_levelsfyi_csv(path, args.chunksize), 1)
+    print(f"   ✓ load_levelsfyi_csv: {elapsed:.2f} s for {size_mb:.0f} MB, "
+          f"{len(df):,} AI/ML rows (chunks of {args.chunksize:,})")
+
+    # Check against the original row-by-row ingest on the first rows
+    sample = export.head(args.check)
+    start = time.perf_counter()
+    expected = pd.DataFrame(_legacy_parse_levelsfyi_rows(sample), columns=df.columns)
+    per_row = (time.perf_counter() - start) / len(sample)
+    got = df.head(len(expected))
+    try:
+        pd.testing.assert_frame_equal(got, expected, check_dtype=False)
+        status = '✓ identical'
+    except AssertionError:
+        status = '❌ MISMATCH'
+    print(f"   {status} to the iterrows() ingest on the first {len(sample):,} rows")
+    print(f"   iterrows() ingest: {per_row * 1e6:.0f} µs/row "
+          f"(≈ {per_row * args.rows:,.0f} s for all {args.rows:,})")
+    return 0 if status.startswith('✓') else 1
+
+
+def _legacy_standardize_levelsfyi(df_levelsfyi):
+    """The original iterrows() conversion to the master format, used as a reference."""
+    records = []
+    for _, row in df_levelsfyi.iterrows():
+        location = row['location'].strip()
+        if ',' in location:
+            city = location.split(',')[0].strip()
+            country = 'Canada' if 'Canada' in location else 'USA'
+        else:
+            city, country = location, 'Canada'
+        years = row['years_total'] if pd.notna(row['years_total']) else 0
+        for upper, exp_level, exp_min, exp_max in EXPERIENCE_BUCKETS:
+            if years <= upper:
+                break
+        salary = row['total_compensation_cad'] if pd.notna(row['total_compensation_cad']) else 0
+        records.append({
+            'source': 'Levels.fyi',
+            'collection_date': datetime.now().strftime('%Y-%m-%d'),
+            'location': location,
+            'job_title': 'ML / AI Engineer',
+            'exp_years_min': exp_min,
+            'exp_years_max': exp_max,
+            'salary_min': salary,
+            'salary_max': salary,
+            'salary_median': salary,
+            'company': row['company'],
+            'level': row['level'] if pd.notna(row['level']) and row['level'] != '-' else 'Not Specified',
+            'country': country,
+            'city': city,
+            'exp_level': exp_level
+        })
+    return pd.DataFrame(records)
+
+
+def bench_standardize(args):
+    print(f"🧪 Generating {args.rows:,} Levels.fyi records...")
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'company': rng.choice(['Google', 'Meta', 'Shopify', 'Cohere', 'Amazon'], args.rows),
+        'location': rng.choice([' Toronto, ON, Canada', 'Montreal, QC, Canada', 'Seattle, WA',
+                                'Remote', 'New York, NY '], args.rows),
+        'years_total': np.where(rng.random(args.rows) < 0.1, np.nan, rng.integers(0, 25, args.rows)),
+        'total_compensation_cad': np.where(rng.random(args.rows) < 0.05, np.nan,
+                                           rng.integers(80, 600, args.rows) * 1000.0),
+        'level': rng.choice(['L3', 'L4', 'L5', '-', None], args.rows),
+    })
+
+    elapsed, got = _best_of(lambda: standardize_levelsfyi_to_master(df), args.repeat)
+    print(f"   ✓ standardize_levelsfyi_to_master: {elapsed:.2f} s ({args.rows / elapsed / 1e6:.1f} M rows/s)")
+
+    sample = df.head(args.check)
+    legacy_elapsed, expected = _best_of(lambda: _legacy_standardize_levelsfyi(sample), 1)
+    try:
+        pd.testing.assert_frame_equal(got.head(len(sample)), expected, check_dtype=False)
+        status = '✓ identical'
+    except AssertionError:
+        status = '❌ MISMATCH'
+    print(f"   {status} to the iterrows() conversion on {len(sample):,} records, which took "
+          f"{legacy_elapsed:.2f} s (≈ {legacy_elapsed / len(sample) * args.rows:,.0f} s for all)")
+    return 0 if status.startswith('✓') else 1
+
+
+def _legacy_job_bank_tables(df):
+    """The original per-row json.loads and nested loops (geo, experience), used as a reference."""
+    geo_data = []
+    for _, row in df.iterrows():
+        if row['source'] == 'Job Bank Canada':
+            wage_dict = json.loads(row['wage_data'])
+            for city, province in JOB_BANK_LOCATIONS.items():
+                if province in wage_dict:
+                    annual = float(wage_dict[province]) * 2000
+                    geo_data.append({
+                        'location': city, 'source': 'Job Bank Canada', 'noc_code': row['job_title'],
+                        'min_cad': int(annual * 0.8), 'avg_cad': int(annual),
+                        'max_cad': int(annual * 1.5), 'p25_cad': int(annual * 0.85),
+                        'p50_cad': int(annual), 'p75_cad': int(annual * 1.25),
+                        'currency': 'CAD', 'date': row['scraped_date']
+                    })
+    geo_df = pd.DataFrame(geo_data)
+
+    exp_data = []
+    for _, geo_row in geo_df.iterrows():
+        for years, multiplier, level in EXPERIENCE_LEVELS.itertuples(index=False):
+            exp_data.append({
+                'location': geo_row['location'], 'years_of_experience': years,
+                'position_level': level, 'avg_salary_cad': int(geo_row['avg_cad'] * multiplier),
+                'source': 'Derived from Job Bank', 'date': geo_row['date']
+            })
+    return geo_df, pd.DataFrame(exp_data)
+
+
+def bench_jobbank(args):
+    rng = np.random.default_rng(0)
+    provinces = list(JOB_BANK_LOCATIONS.values()) + ['Alberta', 'Nova Scotia', 'Manitoba']
+    rows = []
+    for date in pd.date_range('2026-01-01', periods=args.dates).strftime('%Y-%m-%d'):
+        for noc in range(args.nocs):
+            # Not every NOC code has a wage for every province
+            wages = {p: f"{rng.uniform(20, 90):.2f}" for p in provinces if rng.random() < 0.85}
+            rows.append({'source': 'Job Bank Canada', 'job_title': f"NOC {21000 + noc}",
+                         'wage_data': json.dumps(wages), 'scraped_date': date})
+    df = pd.DataFrame(rows)
+    print(f"🧪 {len(df):,} Job Bank rows ({args.nocs} NOC codes × {args.dates} scrape dates)")
+
+    start = time.perf_counter()
+    geo_df = build_geo_table(df)
+    exp_df = build_experience_table(geo_df)
+    build_percentiles_table(geo_df)
+    elapsed = time.perf_counter() - start
+    print(f"   ✓ geo + experience + percentiles tables: {elapsed:.2f} s "
+          f"({len(geo_df):,} geo rows, {len(exp_df):,} experience rows)")
+
+    legacy_elapsed, (expected_geo, expected_exp) = _best_of(lambda: _legacy_job_bank_tables(df), 1)
+    try:
+        pd.testing.assert_frame_equal(geo_df, expected_geo, check_dtype=False)
+        pd.testing.assert_frame_equal(exp_df, expected_exp, check_dtype=False)
+        status = '✓ identical'
+    except AssertionError:
+        status = '❌ MISMATCH'
+    print(f"   {status} to the per-row loops, which took {legacy_elapsed:.2f} s")
+    return 0 if status.startswith('✓') else 1
+
+
+def _synthetic_submissions_page(n_entries, rng):
+    """A Glassdoor-like page: submission rows buried in markup and scripts."""
+    cities = ['Toronto, ON', 'Montreal, QC', 'Vancouver, BC', 'Ottawa, ON']
+    rows = []
+    for i in range(n_entries):
+        low = int(rng.integers(70, 150))
+        rows.append(
+            f'<div class="css-{i % 97}">AI Engineer | {rng.integers(0, 8)}-{rng.integers(8, 12)} Years '
+            f'{cities[i % len(cities)]} submitted on Jan {1 + i % 28}, 2026 '
+            f'${low}-{low + int(rng.integers(5, 60))}K /yr</div>'
+            f'<script>window.__state_{i}={{"k":"{"x" * 400}"}}</script>')
+    return '<html><body>' + '\n'.join(rows) + '</body></html>'
+
+
+def bench_submissions(args):
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i in range(args.pages):
+            path = Path(tmp) / f"page_{i}.html"
+            path.write_text(_synthetic_submissions_page(args.entries, rng), encoding='utf-8')
+            paths.append(path)
+        size_mb = sum(p.stat().st_size for p in paths) / 1e6
+        print(f"🧪 {args.pages} pages × {args.entries:,} submissions ({size_mb:.0f} MB)")
+
+        def with_soup(path):
+            # What every call used to do: read, build the soup, then run the regex
+            html = path.read_text(encoding='utf-8')
+            BeautifulSoup(html, 'lxml')
+            return scan_submissions_text(html)
+
+        runs = [
+            ('soup + regex (previous)', with_soup),
+            ('read + regex', lambda path: extract_submissions_from_html(path, use_mmap=False)),
+            ('mmap + regex', extract_submissions_from_html),
+        ]
+        results = {}
+        print(f"{'mode':26s} {'s':>7s} {'MB/s':>7s}")
+        for name, fn in runs:
+            elapsed, results[name] = _best_of(lambda: [fn(p) for p in paths], 1)
+            print(f"{name:26s} {elapsed:7.2f} {size_mb / elapsed:7.0f}")
+    same = all(r == results[runs[0][0]] for r in results.values())
+    print(f"   {'✓ identical' if same else '❌ MISMATCH'} submissions in every mode "
+          f"({sum(len(r) for r in results[runs[0][0]]):,})")
+    return 0 if same else 1
+
+
+def bench_companies(args):
+    rng = np.random.default_rng(0)
+    letters = np.array(list('abcdefghijklmnopqrstuvwxyz'))
+    names = sorted({''.join(rng.choice(letters, rng.integers(5, 13))).title()
+                    for _ in range(max(args.names) * 2)})
+    # No name inside another, where the loop's list order and leftmost-longest may differ
+    joined = '\n'.join(name.lower() for name in names)
+    names = [name for name in names if joined.count(name.lower()) == 1][:max(args.names)]
+    rng.shuffle(names)
+    print(f"🧪 {args.lines:,} text lines, a third of them naming a company")
+    print(f"{'names':>6s} {'per-name loop s':>16s} {'CompanyMatcher s':>17s} {'speedup':>8s}")
+    for n_names in args.names:
+        dictionary = names[:n_names]
+        # Digits-only filler, so each line holds at most one name and both agree exactly
+        lines = [f"{dictionary[i % n_names]} | {i % 9} yrs / 1 yr | {100 + i % 300} k | 5 k"
+                 if i % 3 == 0 else f"{i % 17} yrs | {100 + i % 300} 000 $CA" for i in range(args.lines)]
+
+        def per_name_loop():
+            found = []
+            for line in lines:
+                company_found = None
+                for company in dictionary:
+                    if company.lower() in line.lower():
+                        company_found = company
+                        break
+                found.append(company_found)
+            return found
+
+        matcher = CompanyMatcher(dictionary)
+        loop_s, expected = _best_of(per_name_loop, 1)
+        matcher_s, got = _best_of(lambda: [matcher.find(line) for line in lines], 3)
+        status = '' if got == expected else '  ❌ MISMATCH'
+        print(f"{n_names:6d} {loop_s:16.2f} {matcher_s:17.2f} {loop_s / matcher_s:7.0f}x{status}")
+    return 0
+
+
+# Reads {"scripts": [...], "specs": [...]} on stdin; compiles each script (a
+# trailing comment defeats V8's in-process cache, as separate iframes would)
+# and JSON.parses each spec; prints the milliseconds spent on each
+NODE_LOAD_SCRIPT = """
+const fs = require('fs'), vm = require('vm');
+const files = JSON.parse(fs.readFileSync(0, 'utf8'));
+const ms = (start) => Number(process.hrtime.bigint() - start) / 1e6;
+let start = process.hrtime.bigint();
+files.scripts.forEach((path, i) => new vm.Script(fs.readFileSync(path, 'utf8') + '\\n//' + i));
+const compile = ms(start);
+start = process.hrtime.bigint();
+files.specs.forEach((path) => JSON.parse(fs.readFileSync(path, 'utf8')));
+console.log(JSON.stringify({compile: compile, parse: ms(start)}));
+"""
+
+
+def _synthetic_figures(n_charts, points, rng):
+    figures = []
+    for i in range(n_charts):
+        x = np.arange(points)
+        y = rng.normal(140000, 45000, points).round(-2)
+        trace = [go.Bar(x=x, y=y), go.Scatter(x=x, y=y, mode='markers'), go.Box(y=y)][i % 3]
+        figures.append(go.Figure(trace, layout=dict(title=f'Chart {i}', height=420,
+                                                    template='plotly_white')))
+    return figures
+
+
+def _inline_scripts(html_paths, out_dir):
+    """Inline <script> bodies of the standalone pages, one .js file per page."""
+    paths = []
+    for html_path in html_paths:
+        bodies = re.findall(r'<script[^>]*>(.*?)</script>', html_path.read_text(), re.DOTALL)
+        path = out_dir / f'{html_path.stem}.js'
+        path.write_text(';\n'.join(body for body in bodies if body.strip()))
+        paths.append(path)
+    return paths
+
+
+def _node_load_ms(scripts, specs, repeat):
+    """Best (compile ms, JSON.parse ms) over `repeat` fresh node processes."""
+    files = json.dumps({'scripts': [str(p) for p in scripts], 'specs': [str(p) for p in specs]})
+    runs = []
+    for _ in range(repeat):
+        out = subprocess.run(['node', '-e', NODE_LOAD_SCRIPT], input=files, capture_output=True,
+                             text=True, check=True).stdout
+        runs.append(json.loads(out))
+    return min(r['compile'] for r in runs), min(r['parse'] for r in runs)
+
+
+def bench_handout(args):
+    rng = np.random.default_rng(0)
+    figures = _synthetic_figures(args.charts, args.points, rng)
+    print(f"🧪 {args.charts} charts of {args.points:,} points, as loaded by salary_handout_tabs.html")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        standalone, shared = tmp / 'standalone', tmp / 'shared'
+        for i, fig in enumerate(figures):
+            save_figure(fig, standalone / f'chart{i}.html', 'standalone')
+            save_figure(fig, shared / f'chart{i}.html', 'shared')
+        pages = sorted(standalone.glob('*.html'))
+        specs = sorted(shared.glob('chart*.json'))
+        bundle = shared / PLOTLY_BUNDLE
+        manifest = shared / SPEC_MANIFEST
+        
+        # Before: one iframe per chart, each page carrying plotly.js.
+        # After: the bundle and the spec list once, plus one spec per chart.
+        before_bytes = sum(p.stat().st_size for p in pages)
+        after_bytes = bundle.stat().st_size + manifest.stat().st_size + sum(p.stat().st_size for p in specs)
+        print(f"{'export':>11s} {'files':>6s} {'page weight MB':>15s}")
+        print(f"{'standalone':>11s} {len(pages):6d} {before_bytes / 1e6:15.1f}")
+        print(f"{'shared':>11s} {len(specs) + 2:6d} {after_bytes / 1e6:15.1f}   "
+              f"({before_bytes / after_bytes:.1f}x smaller)")
+        
+        same = all(pio.from_json(spec_path(shared / f'chart{i}.html').read_text()).to_json() == fig.to_json()
+                   for i, fig in enumerate(figures))
+        print(f"{'✓ specs round-trip to the same figures' if same else '❌ MISMATCH'}")
+        
+        if not shutil.which('node'):
+            print("⚠️  node not found: load-time comparison skipped")
+            return 0
+        scripts = _inline_scripts(pages, tmp)
+        before_ms = sum(_node_load_ms(scripts, [], args.repeat))
+        after_ms = sum(_node_load_ms([bundle], specs, args.repeat))
+        print(f"\nScript compile + spec parse (V8 via node, best of {args.repeat}):")
+        print(f"   standalone: {before_ms:8.0f} ms")
+        print(f"   shared:     {after_ms:8.0f} ms   ({before_ms / after_ms:.1f}x faster)")
+    return 0
+
+
+def bench_charts(args):
+    df = synthetic_master(args.rows)
+    print(f"🧪 {len(CHARTS)} benchmark charts from {args.rows:,} master records")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        outputs = {}
+        print(f"{'workers':>8s} {'wall s':>8s} {'slowest chart s':>16s}")
+        for workers in [1] + [w for w in args.workers if w > 1]:
+            out_dir = tmp / f'w{workers}'
+            out_dir.mkdir()
+            start = time.perf_counter()
+            timings = {chart.filename: seconds for chart, seconds in
+                       render_charts(ChartData(df), out_dir, workers=workers)}
+            wall = time.perf_counter() - start
+            slowest = max(timings, key=timings.get)
+            print(f"{workers:8d} {wall:8.2f} {timings[slowest]:9.2f} ({slowest})")
+            outputs[workers] = {p.name: p.read_bytes() for p in out_dir.iterdir()
+                                if p.suffix == '.json' or p.name == 'kpis.html'}
+        same = all(files == outputs[1] for files in outputs.values())
+        print(f"{'✓ identical' if same else '❌ MISMATCH'} chart specs across worker counts")
+    return 0
+
+
+def _plotly_interp(sorted_values, p):
+    """Lib.interp from plotly.js, behind the box trace's default 'linear' quartiles."""
+    n = len(sorted_values)
+    index = p * n - 0.5
+    if index < 0:
+        return sorted_values[0]
+    if index > n - 1:
+        return sorted_values[-1]
+    frac = index % 1
+    return frac * sorted_values[int(np.ceil(index))] + (1 - frac) * sorted_values[int(np.floor(index))]
+
+
+def bench_scatter(args):
+    print(f"🧪 Record-level charts by master size (SVG ≤ {MAX_SVG_POINTS:,} points, "
+          f"WebGL ≤ {MAX_WEBGL_POINTS:,}, then binned)")
+    print(f"{'rows':>10s} {'chart':>15s} {'trace':>10s} {'spec KB':>9s} {'build+write s':>14s}")
+    builders = [('salary_vs_exp', generate_salary_vs_exp), ('role_evolution', generate_role_evolution),
+                ('total_comp', generate_total_comp)]
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            df = synthetic_master(rows)
+            for name, build in builders:
+                path = Path(tmp) / f'{name}.html'
+                
+                def render():
+                    fig = build(df)
+                    save_figure(fig, path, 'shared')
+                    return fig
+                
+                seconds, fig = _best_of(render, 1)
+                size_kb = spec_path(path).stat().st_size / 1e3
+                print(f"{rows:10,d} {name:>15s} {fig.data[0].type:>10s} {size_kb:9.0f} {seconds:14.2f}")
+    
+    # Precomputed boxes against the numbers plotly.js would derive from the raw points
+    df = synthetic_master(50_000).dropna(subset=['salary_median'])
+    stats = box_stats(df, 'exp_level', 'salary_median')
+    same = True
+    for level, values in df.groupby('exp_level')['salary_median']:
+        q1, q3 = _plotly_interp(np.sort(values.to_numpy()), 0.25), _plotly_interp(np.sort(values.to_numpy()), 0.75)
+        inside = values[(values >= q1 - 1.5 * (q3 - q1)) & (values <= q3 + 1.5 * (q3 - q1))]
+        same &= np.allclose([q1, q3, inside.min(), inside.max()],
+                            stats.loc[level, ['q1', 'q3', 'lowerfence', 'upperfence']].to_numpy(float))
+    print(f"{'✓ identical' if same else '❌ MISMATCH'} box quartiles and whiskers vs plotly.js 'linear' quartiles")
+    return 0
+
+
+def bench_views(args):
+    print(f"🧪 Generating {args.rows:,} master records...")
+    df = synthetic_master(args.rows)
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        # MasterViews and load_master() resolve data/real_data from the working directory
+        os.chdir(tmp)
+        try:
+            write_table(df, 'stat_master_salaries')
+            
+            def regroup():
+                master = load_master()
+                return {view.name: view.build(master) for view in VIEWS}
+            
+            def serve():
+                views = MasterViews()
+                return {view.name: views.get(view.name) for view in VIEWS}
+            
+            regroup_s, expected = _best_of(regroup, args.repeat)
+            refresh_s, _ = _best_of(lambda: MasterViews().refresh(force=True), 1)
+            serve_s, served = _best_of(serve, args.repeat)
+            view_kb = sum(p.stat().st_size for p in Path('data/real_data/views').iterdir()) / 1e3
+        finally:
+            os.chdir(cwd)
+    
+    print(f"\n{len(VIEWS)} views, {view_kb:.0f} KB stored")
+    print(f"   load master + regroup: {regroup_s:8.3f} s   (every chart run, before)")
+    print(f"   refresh views:         {refresh_s:8.3f} s   (once per master version)")
+    print(f"   serve fresh views:     {serve_s:8.3f} s   ({regroup_s / serve_s:.0f}x faster)")
+    in_memory = FrameViews(df)
+    same = True
+    for name, table in expected.items():
+        for label, got in (('served', served[name]), ('in-memory', in_memory.get(name))):
+            try:
+                pd.testing.assert_frame_equal(got.reset_index(drop=True), table.reset_index(drop=True),
+                                              check_dtype=False, check_categorical=False)
+            except AssertionError:
+                print(f"   ❌ {label} {name} differs")
+                same = False
+    print(f"{'✓ identical' if same else '❌ MISMATCH'} served views vs regrouping the master")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Pipeline benchmarks on synthetic data')
+    sub = parser.add_subparsers(dest='benchmark', required=True)
+
+    dedup = sub.add_parser('dedup', help='merge_datasets duplicate detection')
+    dedup.add_argument('--master', type=int, default=1_000_000, help='Master rows')
+    dedup.add_argument('--new', type=int, default=100_000, help='Incoming rows')
+    dedup.add_argument('--window', type=float, default=5000, help='Salary window (CAD)')
+    dedup.add_argument('--check', type=int, default=200,
+                       help='Incoming rows checked against the row-by-row scan')
+    dedup.set_defaults(func=bench_dedup)
+
+    load = sub.add_parser('load', help='storage.read_table, CSV vs Parquet')
+    load.add_argument('--rows', type=int, default=1_000_000, help='Master rows')
+    load.add_argument('--repeat', type=int, default=3, help='Best of N reads')
+    load.set_defaults(func=bench_load)
+
+    aggregate = sub.add_parser('aggregate', help='aggregation.summarize_all vs groupby().agg')
+    aggregate.add_argument('--rows', type=int, default=2_000_000, help='Master rows')
+    aggregate.set_defaults(func=bench_aggregate)
+
+    salary = sub.add_parser('salary', help='salary_parser corpus check, scalar vs vectorized')
+    salary.add_argument('--rows', type=int, default=1_000_000, help='Strings to parse')
+    salary.add_argument('--repeat', type=int, default=1, help='Best of N runs')
+    salary.set_defaults(func=bench_salary)
+
+    levelsfyi = sub.add_parser('levelsfyi-csv', help='extract_levelsfyi_data CSV ingest')
+    levelsfyi.add_argument('--rows', type=int, default=2_000_000, help='Export rows')
+    levelsfyi.add_argument('--chunksize', type=int, default=250_000, help='CSV rows per chunk')
+    levelsfyi.add_argument('--check', type=int, default=20_000,
+                           help='Rows checked against the iterrows() ingest')
+    levelsfyi.set_defaults(func=bench_levelsfyi_csv)
+
+    standardize = sub.add_parser('standardize', help='merge_datasets.standardize_levelsfyi_to_master')
+    standardize.add_argument('--rows', type=int, default=1_000_000, help='Levels.fyi records')
+    standardize.add_argument('--repeat', type=int, default=3, help='Best of N runs')
+    standardize.add_argument('--check', type=int, default=1_000_000,
+                             help='Records also converted with the iterrows() reference')
+    standardize.set_defaults(func=bench_standardize)
+
+    jobbank = sub.add_parser('jobbank', help='process_real_data Job Bank expansion')
+    jobbank.add_argument('--nocs', type=int, default=500, help='NOC codes per scrape')
+    jobbank.add_argument('--dates', type=int, default=20, help='Scrape dates')
+    jobbank.set_defaults(func=bench_jobbank)
+
+    submissions = sub.add_parser('submissions', help='extract_glassdoor_submissions fast path')
+    submissions.add_argument('--pages', type=int, default=20, help='HTML pages')
+    submissions.add_argument('--entries', type=int, default=2000, help='Submissions per page')
+    submissions.set_defaults(func=bench_submissions)
+
+    companies = sub.add_parser('companies', help='company_matcher.CompanyMatcher vs the per-name loop')
+    companies.add_argument('--lines', type=int, default=50_000, help='Text lines')
+    companies.add_argument('--names', type=int, nargs='+', default=[20, 500, 5000],
+                           help='Dictionary sizes')
+    companies.set_defaults(func=bench_companies)
+    
+    handout = sub.add_parser('handout', help='chart_export shared bundle vs standalone chart pages')
+    handout.add_argument('--charts', type=int, default=20)
+    handout.add_argument('--points', type=int, default=500)
+    handout.add_argument('--repeat', type=int, default=3)
+    handout.set_defaults(func=bench_handout)
+    
+    charts = sub.add_parser('charts', help='generate_benchmark_charts registry, serial vs process pool')
+    charts.add_argument('--rows', type=int, default=200000)
+    charts.add_argument('--workers', type=int, nargs='+', default=[4])
+    charts.set_defaults(func=bench_charts)
+    
+    scatter = sub.add_parser('scatter', help='record-level charts: SVG vs WebGL vs binned')
+    scatter.add_argument('--rows', type=int, nargs='+', default=[2000, 50000, 1000000])
+    scatter.set_defaults(func=bench_scatter)
+    
+    views = sub.add_parser('views', help='master_views: served views vs regrouping the master')
+    views.add_argument('--rows', type=int, default=1_000_000)
+    views.add_argument('--repeat', type=int, default=3)
+    views.set_defaults(func=bench_views)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    exit(main())
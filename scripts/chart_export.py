@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Chart files for the dashboard: one shared plotly.js, compact per-chart specs.
+
+fig.write_html() embeds a full copy of plotly.js (~4.8 MB) in every file, and
+salary_handout_tabs.html loads each chart in its own iframe, so the browser
+downloads and parses the library once per chart. save_figure() writes, in
+the default 'shared' mode:
+
+    <dir>/plotly.min.js   the library, once per directory (rewritten only when it changes)
+    <dir>/<name>.json     the figure spec (data + layout), which the tabs page
+                          renders straight into its container div
+    <dir>/specs.json      the names of the charts that have a spec, so the page
+                          only fetches specs that exist
+    <dir>/<name>.html     a standalone page loading plotly.min.js by <script src>,
+                          for opening a chart on its own
+
+The 'standalone' mode (--export standalone, or CHART_EXPORT=standalone for
+scripts without options) writes the old self-contained HTML and removes the
+spec (and its specs.json entry), so the page falls back to the iframe.
+
+    save_figure(fig, Path('outputs/handout') / 'geo.html')
+
+ChartFingerprint skips charts whose inputs did not change: it hashes the
+exact data slice and parameters a chart is made from, plus the whole source
+of the module defining its builder (so helpers and constants count), and
+the chart is only rebuilt (and its files rewritten, keeping mtimes stable
+for the static deploy) when that hash differs from the one stored in
+<dir>/.fingerprints/<name>.sha256 by the last write:
+
+    stamp = ChartFingerprint(html_path, montreal_df, generate_chart)
+    if not stamp.unchanged():
+        save_figure(generate_chart(montreal_df), html_path)
+        stamp.save()
+"""
+
+import hashlib
+import inspect
+import json
+import os
+from pathlib import Path
+
+import pandas as pd
+import plotly
+import plotly.offline
+
+EXPORT_MODES = ('shared', 'standalone')
+PLOTLY_BUNDLE = 'plotly.min.js'
+SPEC_MANIFEST = 'specs.json'
+
+
+def default_mode() -> str:
+    mode = os.environ.get('CHART_EXPORT', 'shared')
+    return mode if mode in EXPORT_MODES else 'shared'
+
+
+def _write_if_changed(path: Path, text: str):
+    """Atomic write, skipped when the file already holds `text` (keeps its mtime for caches)."""
+    data = text.encode('utf-8')
+    if path.exists() and path.stat().st_size == len(data) and path.read_bytes() == data:
+        return
+    tmp = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def write_plotly_bundle(directory) -> Path:
+    """plotly.js next to the charts in `directory`."""
+    path = Path(directory) / PLOTLY_BUNDLE
+    _write_if_changed(path, plotly.offline.get_plotlyjs())
+    return path
+
+
+def spec_path(html_path) -> Path:
+    return Path(html_path).with_suffix('.json')
+
+
+def update_spec_manifest(html_path, has_spec: bool) -> Path:
+    """Add (or drop) the chart in its directory's specs.json; returns the manifest path."""
+    html_path = Path(html_path)
+    path = html_path.parent / SPEC_MANIFEST
+    try:
+        names = set(json.loads(path.read_text()))
+    except (OSError, ValueError):
+        names = set()
+    if has_spec:
+        names.add(html_path.name)
+    else:
+        names.discard(html_path.name)
+    _write_if_changed(path, json.dumps(sorted(names), indent=1))
+    return path
+
+
+def write_png(fig, html_path) -> list:
+    """PNG next to the chart (the tabs page's fallback); needs kaleido."""
+    png_path = Path(html_path).with_suffix('.png')
+    try:
+        fig.write_image(png_path, engine='kaleido')
+    except Exception as e:
+        print('Skipping PNG export:', e)
+        return []
+    return [png_path]
+
+
+def save_figure(fig, html_path, mode: str = None, png: bool = False) -> list:
+    """Write `fig` for the dashboard; returns the paths written."""
+    mode = mode or default_mode()
+    html_path = Path(html_path)
+    html_path.parent.mkdir(parents=True, exist_ok=True)
+    spec = spec_path(html_path)
+    written = write_png(fig, html_path) if png else []
+
+    if mode == 'standalone':
+        fig.write_html(html_path, include_plotlyjs=True)
+        spec.unlink(missing_ok=True)
+        update_spec_manifest(html_path, False)
+        return [html_path] + written
+
+    bundle = write_plotly_bundle(html_path.parent)
+    fig.write_html(html_path, include_plotlyjs=bundle.name)
+    _write_if_changed(spec, fig.to_json(pretty=False))
+    manifest = update_spec_manifest(html_path, True)
+    return [html_path, spec, manifest, bundle] + written
+
+
+def _update_digest(h, part):
+    if isinstance(part, pd.Series):
+        part = part.to_frame()
+    if isinstance(part, pd.DataFrame):
+        h.update(repr([(str(name), str(dtype)) for name, dtype in part.dtypes.items()]).encode())
+        h.update(pd.util.hash_pandas_object(part, index=True).to_numpy().tobytes())
+    elif callable(part):
+        # The defining module, not just the function: helpers it calls and
+        # module constants (bin sizes, thresholds) change the chart too
+        module = inspect.getmodule(part)
+        h.update(inspect.getsource(module if module is not None else part).encode())
+    elif isinstance(part, dict):
+        h.update(repr(sorted(part.items())).encode())
+    else:
+        h.update(repr(part).encode())
+    h.update(b'\0')
+
+
+def fingerprint(*parts) -> str:
+    """sha256 of chart inputs: frames by content, functions by their module's source, the rest by repr."""
+    h = hashlib.sha256()
+    for part in parts:
+        _update_digest(h, part)
+    return h.hexdigest()
+
+
+class ChartFingerprint:
+    """Fingerprint of what one chart file is built from, compared to the last write."""
+
+    def __init__(self, html_path, *inputs, mode: str = None, png: bool = False, figure: bool = True):
+        self.html_path = Path(html_path)
+        self.mode = mode or default_mode()
+        self.png = png
+        self.figure = figure
+        self.value = fingerprint(self.html_path.name, self.mode, png, plotly.__version__, *inputs)
+        self.path = self.html_path.parent / '.fingerprints' / f'{self.html_path.name}.sha256'
+
+    def outputs(self) -> list:
+        """Files save_figure() writes for the chart (just the page when figure=False)."""
+        paths = [self.html_path]
+        if self.figure and self.mode == 'shared':
+            paths += [spec_path(self.html_path), self.html_path.parent / PLOTLY_BUNDLE]
+        if self.figure and self.png:
+            paths.append(self.html_path.with_suffix('.png'))
+        return paths
+
+    def unchanged(self) -> bool:
+        """True when the stored fingerprint matches and the chart's files are all there."""
+        try:
+            stored = self.path.read_text().strip()
+        except OSError:
+            return False
+        return stored == self.value and all(path.exists() for path in self.outputs())
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        _write_if_changed(self.path, self.value + '\n')
+
+
+def add_force_args(parser):
+    """Add the standard --force switch (rebuild charts even when their fingerprint matches)."""
+    parser.add_argument('--force', action='store_true',
+                        help='Rebuild the chart even if its inputs did not change')
+    return parser
+
+
+def add_export_args(parser):
+    """Add the standard --export switch."""
+    parser.add_argument('--export', choices=EXPORT_MODES, default=default_mode(),
+                        help='shared: one plotly.min.js plus a JSON spec per chart; '
+                             'standalone: self-contained HTML per chart (default: %(default)s)')
+    return parser
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Company-name scanner for the Levels.fyi text extractors.
+
+The extractors used to test every text line against every known company
+with `company.lower() in line.lower()`: one lowercase copy per comparison
+and a cost that grows with the number of names. CompanyMatcher compiles the
+whole dictionary into one regex shaped like a trie of the lowercased names
+(shared prefixes are factored out), so each line is lowercased once and
+scanned once, however many names there are:
+
+    matcher = CompanyMatcher(['Google', 'Intact', 'Intact Financial'])
+    matcher.find('Intact Financial Toronto, ON')   # 'Intact Financial'
+
+Matching is by substring, as before, and leftmost-longest: the name that
+starts first in the line wins, the longest one if several start there.
+
+Extra names can be loaded from a file (one per line, '#' comments, or a CSV
+with a 'company' column) with load_companies() / --companies.
+"""
+
+import csv
+import hashlib
+import re
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+
+def _trie_pattern(node: dict) -> str:
+    """Regex for a trie node; '' marks the end of a name."""
+    terminal = '' in node
+    branches = [re.escape(char) + _trie_pattern(child)
+                for char, child in sorted(node.items()) if char != '']
+    if not branches:
+        return ''
+    body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+    if terminal:
+        # Greedy optional: prefer the longer name, fall back to the one ending here
+        return '(?:' + body + ')?' if len(branches) == 1 else body + '?'
+    return body
+
+
+def trie_regex(words: Iterable[str]) -> re.Pattern:
+    """One compiled alternation matching any of `words`, trie-factored."""
+    root: dict = {}
+    for word in words:
+        node = root
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+    return re.compile(_trie_pattern(root))
+
+
+class CompanyMatcher:
+    """Finds known company names in text lines (case-insensitive substring match)."""
+
+    def __init__(self, names: Iterable[str]):
+        self.names: List[str] = []
+        self._canonical = {}
+        for name in names:
+            name = name.strip()
+            key = name.lower()
+            if key and key not in self._canonical:
+                self._canonical[key] = name
+                self.names.append(name)
+        self._regex = trie_regex(self._canonical) if self._canonical else None
+
+    def __len__(self):
+        return len(self.names)
+
+    @property
+    def digest(self) -> str:
+        """Short hash of the dictionary, for cache keys."""
+        return hashlib.sha256('\n'.join(sorted(self._canonical)).encode()).hexdigest()[:12]
+
+    def find(self, line: str) -> Optional[str]:
+        """Canonical name of the leftmost-longest company in `line`, or None."""
+        if self._regex is None:
+            return None
+        match = self._regex.search(line.lower())
+        return self._canonical[match.group()] if match else None
+
+    def extended(self, names: Iterable[str]) -> 'CompanyMatcher':
+        """A matcher with `names` added after this one's."""
+        return CompanyMatcher(self.names + list(names))
+
+
+def load_companies(path) -> List[str]:
+    """Company names from a text file (one per line, '#' comments) or a CSV with a 'company' column."""
+    path = Path(path)
+    with open(path, newline='', encoding='utf-8') as f:
+        if path.suffix.lower() == '.csv':
+            return [row['company'] for row in csv.DictReader(f) if row.get('company')]
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith('#')]
+
+
+def add_company_args(parser):
+    """Add the standard --companies switch."""
+    parser.add_argument('--companies',
+                        help='Extra company names to recognise: a text file (one per line) '
+                             "or a CSV with a 'company' column")
+    return parser
+
+
+def matcher_from_args(args, default: CompanyMatcher) -> CompanyMatcher:
+    if getattr(args, 'companies', None):
+        return default.extended(load_companies(args.companies))
+    return default
@@ -8,10 +8,15 @@ Sources:
 3. Create unified format for charting
 """
 
+import argparse
 import pandas as pd
 import numpy as np
 from pathlib import Path
 
+from aggregation import summarize_all
+from master_store import MasterStore
+from storage import add_storage_args, write_table
+
 
 def load_and_standardize_glassdoor():
     """Load Glassdoor data and standardize columns."""
@@ -114,71 +119,63 @@ def create_master_dataset():
 def create_aggregations(master_df):
     """Create analysis-ready aggregations."""
     
-    aggs = {}
-    
-    # 1. By City
     print("\n📊 Creating aggregations...\n")
-    city_agg = master_df.groupby('city').agg({
-        'salary_median': ['count', 'mean', 'median', 'min', 'max',
-                          lambda x: x.quantile(0.25),
-                          lambda x: x.quantile(0.75)]
-    }).round(0)
-    city_agg.columns = ['count', 'avg', 'median', 'min', 'max', 'p25', 'p75']
-    city_agg = city_agg.sort_values('count', ascending=False)
-    aggs['city'] = city_agg
-    print(f"✓ City aggregation: {len(city_agg)} cities")
-    
-    # 2. By Experience Level
-    exp_agg = master_df.groupby('exp_level').agg({
-        'salary_median': ['count', 'mean', 'median', 'min', 'max',
-                          lambda x: x.quantile(0.25),
-                          lambda x: x.quantile(0.75)]
-    }).round(0)
-    exp_agg.columns = ['count', 'avg', 'median', 'min', 'max', 'p25', 'p75']
-    aggs['experience'] = exp_agg
-    print(f"✓ Experience aggregation: {len(exp_agg)} levels")
-    
-    # 3. By Source (Glassdoor vs Levels.fyi)
-    source_agg = master_df.groupby('source').agg({
-        'salary_median': ['count', 'mean', 'median', 'min', 'max',
-                          lambda x: x.quantile(0.25),
-                          lambda x: x.quantile(0.75)]
-    }).round(0)
-    source_agg.columns = ['count', 'avg', 'median', 'min', 'max', 'p25', 'p75']
-    aggs['source'] = source_agg
-    print(f"✓ Source aggregation: {len(source_agg)} sources")
-    
-    # 4. By Country
-    country_agg = master_df.groupby('country').agg({
-        'salary_median': ['count', 'mean', 'median', 'min', 'max',
-                          lambda x: x.quantile(0.25),
-                          lambda x: x.quantile(0.75)]
-    }).round(0)
-    country_agg.columns = ['count', 'avg', 'median', 'min', 'max', 'p25', 'p75']
-    aggs['country'] = country_agg
-    print(f"✓ Country aggregation: {len(country_agg)} countries")
+    
+    # All groupings in one pass over the sorted salaries
+    dimensions = {
+        'city': ['city'],
+        'experience': ['exp_level'],
+        'source': ['source'],
+        'country': ['country'],
+        'city_experience': ['city', 'exp_level'],
+    }
+    aggs = summarize_all(master_df, 'salary_median', dimensions, quantiles=(0.25, 0.75))
+    for name, agg in aggs.items():
+        agg = agg.rename(columns={'mean': 'avg'}).round(0)
+        aggs[name] = agg[['count', 'avg', 'median', 'min', 'max', 'p25', 'p75']]
+    aggs['city'] = aggs['city'].sort_values('count', ascending=False)
+    
+    print(f"✓ City aggregation: {len(aggs['city'])} cities")
+    print(f"✓ Experience aggregation: {len(aggs['experience'])} levels")
+    print(f"✓ Source aggregation: {len(aggs['source'])} sources")
+    print(f"✓ Country aggregation: {len(aggs['country'])} countries")
+    print(f"✓ City × experience aggregation: {len(aggs['city_experience'])} cells")
     
     return aggs
 
 
-def save_datasets(master_df, aggs):
-    """Save all datasets."""
+def save_datasets(master_df, aggs, incremental=False, fmt=None, csv_export=False):
+    """Save all datasets.
+    
+    Tables are written through storage.write_table (Parquet by default,
+    CSV with fmt='csv'). With incremental=True the master dataset goes to
+    the partitioned store instead: only new records are written and
+    records no longer produced are retired.
+    """
     
     output_dir = Path('data/real_data')
     
     # Master dataset
-    master_df.to_csv(
-        output_dir / 'stat_master_salaries.csv',
-        index=False
-    )
-    print(f"\n💾 Saved Master Dataset: {len(master_df)} records")
-    print(f"   → data/real_data/stat_master_salaries.csv")
+    if incremental:
+        store = MasterStore()
+        written = retired = 0
+        for source in master_df['source'].unique():
+            w, r = store.replace_source(master_df, source)
+            written += w
+            retired += r
+        print(f"\n💾 Updated Master Store: {len(master_df)} records "
+              f"({written} appended, {retired} retired)")
+        print(f"   → {store.root}")
+    else:
+        paths = write_table(master_df, 'stat_master_salaries', fmt, csv_export)
+        print(f"\n💾 Saved Master Dataset: {len(master_df)} records")
+        for path in paths:
+            print(f"   → {path}")
     
     # Aggregations
     for name, agg_df in aggs.items():
-        filename = output_dir / f'stat_agg_{name}.csv'
-        agg_df.to_csv(filename)
-        print(f"   → stat_agg_{name}.csv")
+        for path in write_table(agg_df, f'stat_agg_{name}', fmt, csv_export, index=True):
+            print(f"   → {path.name}")
     
     return output_dir
 
@@ -228,9 +225,17 @@ def print_summary(master_df):
 
 
 def main():
+    parser = argparse.ArgumentParser(description='Consolidate all salary sources into the master dataset')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Append only new records to the partitioned master store '
+                             'instead of rewriting stat_master_salaries')
+    add_storage_args(parser)
+    args = parser.parse_args()
+    
     master = create_master_dataset()
     aggs = create_aggregations(master)
-    save_datasets(master, aggs)
+    save_datasets(master, aggs, incremental=args.incremental,
+                  fmt=args.format, csv_export=args.csv_export)
     print_summary(master)
     
     print("\n✅ All datasets ready for dashboard!")
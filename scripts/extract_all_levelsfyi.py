@@ -6,55 +6,17 @@ Parses the Material-UI table structure to get all 67 records
 
 import os
 import re
+import argparse
 from bs4 import BeautifulSoup
 import pandas as pd
 from pathlib import Path
 
-def parse_salary_amount(text):
-    """Extract numeric salary from text like '120 000 $CA' or '120,000 CAD'"""
-    if not text:
-        return None
-    # Remove common currency symbols and text
-    clean = re.sub(r'[\$,\s]', '', text)
-    clean = re.sub(r'(CA|CAD|USD|k)', '', clean, flags=re.IGNORECASE)
-    # Extract first number
-    match = re.search(r'(\d+)', clean)
-    return int(match.group(1)) if match else None
+from levelsfyi_stream import iter_soup_elements
+from parse_cache import add_cache_args, cache_from_args
+from salary_parser import parse_compensation, parse_salary
 
-def parse_compensation_breakdown(text):
-    """Parse base | stock | bonus from text like '100 k | 20 k | N/A'"""
-    if not text or 'N/A' in text:
-        parts = text.split('|') if text else []
-    else:
-        parts = text.split('|')
-    
-    result = {'base': None, 'stock': None, 'bonus': None}
-    
-    for i, part in enumerate(parts):
-        part = part.strip()
-        if part and part != 'N/A':
-            # Remove currency symbols and extract number
-            clean = re.sub(r'[\$,\s]', '', part)
-            # Handle 'k' suffix (thousands)
-            if 'k' in clean.lower():
-                clean = re.sub(r'k', '', clean, flags=re.IGNORECASE)
-                match = re.search(r'(\d+\.?\d*)', clean)
-                if match:
-                    value = int(float(match.group(1)) * 1000)
-                else:
-                    value = None
-            else:
-                match = re.search(r'(\d+)', clean)
-                value = int(match.group(1)) if match else None
-            
-            if i == 0:
-                result['base'] = value
-            elif i == 1:
-                result['stock'] = value
-            elif i == 2:
-                result['bonus'] = value
-    
-    return result
+# Bump when extraction output changes so cached results are invalidated
+CACHE_KEY = 'levelsfyi_salary_rows:2'
 
 def parse_years_experience(text):
     """Parse years from text like '4 yrs' or '2-4 yrs'"""
@@ -69,9 +31,88 @@ def parse_years_experience(text):
         return int(match.group(1))
     return None
 
-def extract_from_html(html_path):
-    """Extract salary records from a single HTML file"""
-    print(f"\n📄 Processing: {os.path.basename(html_path)}")
+SALARY_ROW_RE = re.compile('salary-row_collapsedSalaryRow')
+
+def parse_salary_row(row):
+    """Parse one salary-row <tr> (BeautifulSoup Tag) into a record, or None."""
+    # Extract company name
+    company_link = row.find('a', class_=re.compile('salary-row_companyName'))
+    company_text = row.find('p', class_=re.compile('salary-row_companyName'))
+    company = (company_link.text.strip() if company_link else 
+              company_text.text.strip() if company_text else None)
+    
+    if not company:
+        return None
+    
+    # Extract location and date
+    location_date = row.find('span', class_=re.compile('css-xlmjpr'))
+    loc_date_text = location_date.text.strip() if location_date else ""
+    
+    # Split location and date by |
+    if '|' in loc_date_text:
+        location, date = loc_date_text.split('|', 1)
+        location = location.strip()
+        date = date.strip()
+    else:
+        location = loc_date_text
+        date = None
+    
+    # Extract level
+    level_elem = row.find('p', class_=re.compile('salary-row_levelName'))
+    level = level_elem.text.strip() if level_elem else None
+    
+    # Extract years of experience
+    exp_cells = row.find_all('td', class_=re.compile('css-w3va9g'))
+    total_yrs = None
+    company_yrs = None
+    
+    if exp_cells:
+        exp_cell = exp_cells[0]
+        # Total years
+        total_p = exp_cell.find('p', class_='MuiTypography-body1')
+        total_yrs = parse_years_experience(total_p.text) if total_p else None
+        
+        # Years at company
+        company_span = exp_cell.find('span', class_='MuiTypography-caption')
+        company_yrs = parse_years_experience(company_span.text) if company_span else None
+    
+    # Extract total compensation
+    comp_cell = row.find('td', class_=re.compile('salary-row_totalCompCell'))
+    total_comp = None
+    base = None
+    stock = None
+    bonus = None
+    
+    if comp_cell:
+        # Total compensation
+        total_p = comp_cell.find('p', class_='MuiTypography-body1')
+        if total_p:
+            total_comp = parse_salary(total_p.text)
+        
+        # Breakdown (base | stock | bonus)
+        breakdown_span = comp_cell.find('span', class_='MuiTypography-caption')
+        if breakdown_span:
+            _, base, stock, bonus = parse_compensation(breakdown_span.text)
+    
+    return {
+        'company': company,
+        'location': location,
+        'date': date,
+        'level': level,
+        'years_total': total_yrs,
+        'years_at_company': company_yrs,
+        'total_compensation_cad': total_comp,
+        'base_salary_cad': base,
+        'stock_yearly_cad': stock,
+        'bonus_cad': bonus,
+        'source': 'Levels.fyi'
+    }
+
+def iter_salary_rows(html_path, stream=False):
+    """Yield salary-row Tags, from a full soup or streamed one row at a time."""
+    if stream:
+        yield from iter_soup_elements(html_path, 'tr', SALARY_ROW_RE)
+        return
     
     with open(html_path, 'r', encoding='utf-8') as f:
         html_content = f.read()
@@ -79,90 +120,24 @@ def extract_from_html(html_path):
     soup = BeautifulSoup(html_content, 'html.parser')
     
     # Find all salary rows in the table
-    salary_rows = soup.find_all('tr', class_=re.compile('salary-row_collapsedSalaryRow'))
+    yield from soup.find_all('tr', class_=SALARY_ROW_RE)
+
+def extract_from_html(html_path, stream=False):
+    """Extract salary records from a single HTML file"""
+    print(f"\n📄 Processing: {os.path.basename(html_path)}")
     
     records = []
     
-    for row in salary_rows:
+    for row in iter_salary_rows(html_path, stream):
         try:
-            # Extract company name
-            company_link = row.find('a', class_=re.compile('salary-row_companyName'))
-            company_text = row.find('p', class_=re.compile('salary-row_companyName'))
-            company = (company_link.text.strip() if company_link else 
-                      company_text.text.strip() if company_text else None)
-            
-            if not company:
+            record = parse_salary_row(row)
+            if record is None:
                 continue
             
-            # Extract location and date
-            location_date = row.find('span', class_=re.compile('css-xlmjpr'))
-            loc_date_text = location_date.text.strip() if location_date else ""
-            
-            # Split location and date by |
-            if '|' in loc_date_text:
-                location, date = loc_date_text.split('|', 1)
-                location = location.strip()
-                date = date.strip()
-            else:
-                location = loc_date_text
-                date = None
-            
-            # Extract level
-            level_elem = row.find('p', class_=re.compile('salary-row_levelName'))
-            level = level_elem.text.strip() if level_elem else None
-            
-            # Extract years of experience
-            exp_cells = row.find_all('td', class_=re.compile('css-w3va9g'))
-            total_yrs = None
-            company_yrs = None
-            
-            if exp_cells:
-                exp_cell = exp_cells[0]
-                # Total years
-                total_p = exp_cell.find('p', class_='MuiTypography-body1')
-                total_yrs = parse_years_experience(total_p.text) if total_p else None
-                
-                # Years at company
-                company_span = exp_cell.find('span', class_='MuiTypography-caption')
-                company_yrs = parse_years_experience(company_span.text) if company_span else None
-            
-            # Extract total compensation
-            comp_cell = row.find('td', class_=re.compile('salary-row_totalCompCell'))
-            total_comp = None
-            base = None
-            stock = None
-            bonus = None
-            
-            if comp_cell:
-                # Total compensation
-                total_p = comp_cell.find('p', class_='MuiTypography-body1')
-                if total_p:
-                    total_comp = parse_salary_amount(total_p.text)
-                
-                # Breakdown (base | stock | bonus)
-                breakdown_span = comp_cell.find('span', class_='MuiTypography-caption')
-                if breakdown_span:
-                    breakdown = parse_compensation_breakdown(breakdown_span.text)
-                    base = breakdown['base']
-                    stock = breakdown['stock']
-                    bonus = breakdown['bonus']
-            
-            # Create record
-            record = {
-                'company': company,
-                'location': location,
-                'date': date,
-                'level': level,
-                'years_total': total_yrs,
-                'years_at_company': company_yrs,
-                'total_compensation_cad': total_comp,
-                'base_salary_cad': base,
-                'stock_yearly_cad': stock,
-                'bonus_cad': bonus,
-                'source': 'Levels.fyi'
-            }
-            
             records.append(record)
+            company = record['company']
+            location = record['location']
+            total_comp = record['total_compensation_cad']
             print(f"   ✓ {company:30s} | {location:25s} | ${total_comp:,}" if total_comp else f"   ✓ {company}")
             
         except Exception as e:
@@ -173,6 +148,13 @@ def extract_from_html(html_path):
 
 def main():
     """Extract all salary data from all Levels.fyi HTML files"""
+    parser = argparse.ArgumentParser(description='Extract salary rows from Levels.fyi HTML pages')
+    parser.add_argument('--stream', action='store_true',
+                        help='Stream rows with lxml instead of building a full soup (flat memory on huge saves)')
+    add_cache_args(parser)
+    args = parser.parse_args()
+    cache = cache_from_args(args)
+    
     html_dir = Path('data/levels.fyi_pages')
     
     if not html_dir.exists():
@@ -188,10 +170,12 @@ def main():
     all_records = []
     
     for html_file in html_files:
-        records = extract_from_html(html_file)
+        records = cache.load_or_parse(html_file, CACHE_KEY,
+                                      lambda path: extract_from_html(path, stream=args.stream))
         all_records.extend(records)
         print(f"   📊 Extracted {len(records)} records from {html_file.name}")
     
+    print(f"\n{cache.summary()}")
     print("\n" + "=" * 80)
     print(f"✅ TOTAL EXTRACTED: {len(all_records)} records")
     
@@ -3,56 +3,75 @@
 
 import os
 import re
+import argparse
 import pandas as pd
 from pathlib import Path
 from bs4 import BeautifulSoup
 
+from levelsfyi_stream import iter_text_matches
+from parse_cache import add_cache_args, cache_from_args
+
+parser = argparse.ArgumentParser(description='Extract all salary values from Levels.fyi HTML pages')
+parser.add_argument('--stream', action='store_true',
+                    help='Stream page text with lxml instead of building a full soup (flat memory on huge saves)')
+add_cache_args(parser)
+args = parser.parse_args()
+cache = cache_from_args(args)
+
+# Bump when extraction output changes so cached results are invalidated
+CACHE_KEY = 'levelsfyi_all_salaries:1'
+
 levels_dir = Path('data/levels.fyi_pages')
 all_records = []
 
-def extract_salaries_from_html(filepath):
+SALARY_RE = re.compile(r'\$(\d+,?\d*)')
+
+def extract_salaries_from_html(filepath, stream=False):
     """Extract individual salary records from Levels.fyi HTML file."""
     records = []
     
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
-        soup = BeautifulSoup(content, 'html.parser')
-        text = soup.get_text()
-        
-        # Extract all salary values (looking for $XXX,XXX patterns)
-        salary_matches = re.findall(r'\$(\d+,?\d*)', text)
-        
-        # Clean and convert to integers
-        salaries = []
-        for match in salary_matches:
-            try:
-                salary = int(match.replace(',', ''))
-                # Filter for reasonable AI engineer salaries ($40K - $500K)
-                if 40000 <= salary <= 500000:
-                    salaries.append(salary)
-            except ValueError:
-                pass
-        
-        # Remove duplicates but keep order
-        seen = set()
-        unique_salaries = []
-        for sal in salaries:
-            if sal not in seen:
-                seen.add(sal)
-                unique_salaries.append(sal)
-        
-        # Create records
-        for salary in unique_salaries:
-            records.append({
-                'company': 'Unknown',  # Would need more parsing for this
-                'salary_median_cad': salary,
-                'salary_min': int(salary * 0.85),  # Estimate
-                'salary_max': int(salary * 1.15),  # Estimate
-                'country': 'Canada',
-                'city': 'Canada',
-                'experience': 'Mid-Level',
-                'source': 'Levels.fyi'
-            })
+    if stream:
+        salary_matches = (m.group(1) for m in iter_text_matches(filepath, SALARY_RE))
+    else:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            content = f.read()
+            soup = BeautifulSoup(content, 'html.parser')
+            text = soup.get_text()
+            
+            # Extract all salary values (looking for $XXX,XXX patterns)
+            salary_matches = SALARY_RE.findall(text)
+    
+    # Clean and convert to integers
+    salaries = []
+    for match in salary_matches:
+        try:
+            salary = int(match.replace(',', ''))
+            # Filter for reasonable AI engineer salaries ($40K - $500K)
+            if 40000 <= salary <= 500000:
+                salaries.append(salary)
+        except ValueError:
+            pass
+    
+    # Remove duplicates but keep order
+    seen = set()
+    unique_salaries = []
+    for sal in salaries:
+        if sal not in seen:
+            seen.add(sal)
+            unique_salaries.append(sal)
+    
+    # Create records
+    for salary in unique_salaries:
+        records.append({
+            'company': 'Unknown',  # Would need more parsing for this
+            'salary_median_cad': salary,
+            'salary_min': int(salary * 0.85),  # Estimate
+            'salary_max': int(salary * 1.15),  # Estimate
+            'country': 'Canada',
+            'city': 'Canada',
+            'experience': 'Mid-Level',
+            'source': 'Levels.fyi'
+        })
     
     return records
 
@@ -63,7 +82,8 @@ total_count = 0
 for file in sorted(os.listdir(levels_dir)):
     if file.endswith('.html'):
         filepath = levels_dir / file
-        records = extract_salaries_from_html(filepath)
+        records = cache.load_or_parse(filepath, CACHE_KEY,
+                                      lambda path: extract_salaries_from_html(path, stream=args.stream))
         
         # Expected counts
         if '6' in file or 'LEVELS6' in file:
@@ -79,6 +99,7 @@ for file in sorted(os.listdir(levels_dir)):
         total_count += len(records)
         all_records.extend(records)
 
+print(f"\n{cache.summary()}")
 print(f"\n{'='*50}")
 print(f"✅ TOTAL RECORDS EXTRACTED: {len(all_records)}")
 print(f"   Expected: 67 (11×6 + 1)")
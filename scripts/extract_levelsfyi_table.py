@@ -3,51 +3,76 @@
 
 import os
 import re
+import argparse
 from pathlib import Path
 from bs4 import BeautifulSoup
 import pandas as pd
 
+from levelsfyi_stream import iter_soup_elements
+from parse_cache import add_cache_args, cache_from_args
+
+parser = argparse.ArgumentParser(description='Extract salary records from Levels.fyi HTML tables')
+parser.add_argument('--stream', action='store_true',
+                    help='Stream table rows with lxml instead of building a full soup (flat memory on huge saves)')
+add_cache_args(parser)
+args = parser.parse_args()
+cache = cache_from_args(args)
+
+# Bump when extraction output changes so cached results are invalidated
+CACHE_KEY = 'levelsfyi_table_rows:1'
+
 levels_dir = Path('data/levels.fyi_pages')
 all_records = []
 
-def extract_from_table(filepath):
-    """Extract salary data from MuiTable component."""
-    records = []
+TABLE_RE = re.compile('MuiTable-root')
+
+def iter_table_rows(filepath, stream=False):
+    """Yield the <tr> Tags of the first MuiTable, from a full soup or streamed."""
+    if stream:
+        # Outer rows are streamed; nested rows come along like find_all('tr')
+        for outer_row in iter_soup_elements(filepath, 'tr', within=('div', TABLE_RE)):
+            yield outer_row
+            yield from outer_row.find_all('tr')
+        return
     
     with open(filepath, 'r', encoding='utf-8') as f:
         soup = BeautifulSoup(f, 'html.parser')
+    
+    # Find the table with the specific class
+    table = soup.find('div', class_=TABLE_RE)
+    
+    if table:
+        # Find all table rows
+        yield from table.find_all('tr')
+
+def extract_from_table(filepath, stream=False):
+    """Extract salary data from MuiTable component."""
+    records = []
+    
+    for row in iter_table_rows(filepath, stream):
+        cells = row.find_all('td')
         
-        # Find the table with the specific class
-        table = soup.find('div', class_=re.compile('MuiTable-root'))
-        
-        if table:
-            # Find all table rows
-            rows = table.find_all('tr')
+        if len(cells) >= 3:  # Typical salary table has: Company, Title, Salary, etc.
+            row_text = [cell.get_text(strip=True) for cell in cells]
             
-            for row in rows:
-                cells = row.find_all('td')
-                
-                if len(cells) >= 3:  # Typical salary table has: Company, Title, Salary, etc.
-                    row_text = [cell.get_text(strip=True) for cell in cells]
-                    
-                    # Look for salary values in the row
-                    for cell_text in row_text:
-                        # Check if this cell contains a salary ($XXX,XXX)
-                        salary_match = re.search(r'\$?([\d,]+)', cell_text)
-                        if salary_match:
-                            try:
-                                salary = int(salary_match.group(1).replace(',', ''))
-                                if 40000 <= salary <= 500000:
-                                    records.append({
-                                        'raw_row': ' | '.join(row_text),
-                                        'salary_median_cad': salary,
-                                        'source': 'Levels.fyi',
-                                        'country': 'Canada',
-                                        'city': 'Canada'
-                                    })
-                                    break  # Move to next row
-                            except ValueError:
-                                pass
+            # Look for salary values in the row
+            for cell_text in row_text:
+                # Check if this cell contains a salary ($XXX,XXX)
+                salary_match = re.search(r'\$?([\d,]+)', cell_text)
+                if salary_match:
+                    try:
+                        salary = int(salary_match.group(1).replace(',', ''))
+                        if 40000 <= salary <= 500000:
+                            records.append({
+                                'raw_row': ' | '.join(row_text),
+                                'salary_median_cad': salary,
+                                'source': 'Levels.fyi',
+                                'country': 'Canada',
+                                'city': 'Canada'
+                            })
+                            break  # Move to next row
+                    except ValueError:
+                        pass
     
     return records
 
@@ -60,11 +85,13 @@ total = 0
 for file in file_list:
     if file.endswith('.html'):
         filepath = levels_dir / file
-        records = extract_from_table(filepath)
+        records = cache.load_or_parse(filepath, CACHE_KEY,
+                                      lambda path: extract_from_table(path, stream=args.stream))
         print(f"✅ {file:<40} → {len(records):2d} records")
         all_records.extend(records)
         total += len(records)
 
+print(f"\n{cache.summary()}")
 print(f"\n{'='*60}")
 print(f"✅ TOTAL EXTRACTED: {total} records")
 print(f"   Expected: 67 (11×6 + 1)")
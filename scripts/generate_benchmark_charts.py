@@ -10,31 +10,177 @@ Updates:
 - Percentiles
 - Total Compensation
 - Role Evolution (generic career progression)
+
+Charts are declared in CHARTS with the ChartData slices they take. Each
+slice (city means, experience stats, salary quantiles...) is computed once
+however many charts use it, then figures are built and written on a
+process pool (--workers).
+
+Aggregate slices (city stats, experience stats, quantiles, totals) are read
+from the precomputed master views (master_views.py), refreshed only when
+the master changes; only the record-level charts load master columns.
+
+Record-level charts stay bounded as the master grows: scatters switch to
+WebGL above MAX_SVG_POINTS and to a server-side density heatmap above
+MAX_WEBGL_POINTS, and the box plot is drawn from precomputed quartiles.
 """
 
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import cached_property
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
 from pathlib import Path
-import json
+
+from chart_export import ChartFingerprint, add_export_args, save_figure, write_plotly_bundle
+from master_store import MasterStore, load_master
+from master_views import FrameViews, MasterViews
+from quantile_sketch import SketchStore
+
+# Master columns the record-level charts and the run summary use
+RECORD_COLUMNS = ['source', 'country', 'city', 'exp_years_min', 'exp_level', 'salary_median']
 
 
 def load_data():
-    """Load master salary dataset."""
-    return pd.read_csv('data/real_data/stat_master_salaries.csv')
+    """Load master salary dataset (the columns in RECORD_COLUMNS)."""
+    return load_master(RECORD_COLUMNS)
 
 
-def generate_kpis(df):
-    """Generate professional KPI strip with key statistics."""
-    
+def salary_quantiles(df, quantiles, sketches=None):
+    """Salary quantiles from the full column, or from the partition sketches."""
+    if sketches is not None:
+        merged = sketches.query()
+        return [merged.quantile(q) for q in quantiles]
     salary = df['salary_median'].dropna()
-    canada_df = df[df['country'] == 'Canada']
+    return salary.quantile(list(quantiles)).tolist()
+
+
+PERCENTILES = {'P10': 0.10, 'P25': 0.25, 'P50': 0.50, 'P75': 0.75, 'P90': 0.90}
+
+# One marker per record up to MAX_SVG_POINTS (SVG), then WebGL; above
+# MAX_WEBGL_POINTS records are binned into DENSITY_BINS cells instead
+MAX_SVG_POINTS = 5_000
+MAX_WEBGL_POINTS = 100_000
+DENSITY_BINS = (40, 60)  # (experience, salary)
+
+
+def scatter_type(n_points):
+    """go.Scatter for small charts, go.Scattergl (WebGL) for large ones."""
+    return go.Scatter if n_points <= MAX_SVG_POINTS else go.Scattergl
+
+
+def _bin_edges(values, bins):
+    """One bin per whole year when values are integral and span few enough, else `bins` even bins."""
+    low, high = values.min(), values.max()
+    if np.all(np.mod(values, 1) == 0) and high - low + 1 <= bins:
+        return np.arange(low - 0.5, high + 1.5)
+    return np.linspace(low, high, bins + 1) if high > low else np.array([low - 0.5, low + 0.5])
+
+
+def density_heatmap(x, y, bins=DENSITY_BINS, **kwargs):
+    """Record counts on an (x, y) grid, as a heatmap of at most bins[0] × bins[1] cells."""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    keep = ~(np.isnan(x) | np.isnan(y))
+    x, y = x[keep], y[keep]
+    if len(x) == 0:
+        return go.Heatmap(**kwargs)
+    x_edges, y_edges = _bin_edges(x, bins[0]), _bin_edges(y, bins[1])
+    counts, _, _ = np.histogram2d(x, y, bins=[x_edges, y_edges])
+    kwargs.setdefault('colorscale', 'Greens')
+    kwargs.setdefault('colorbar', dict(title='Records'))
+    return go.Heatmap(
+        x=(x_edges[:-1] + x_edges[1:]) / 2,
+        y=(y_edges[:-1] + y_edges[1:]) / 2,
+        z=np.where(counts > 0, counts, np.nan).T,
+        **kwargs
+    )
+
+
+def box_stats(df, x, y):
+    """Per-group quartiles and 1.5 IQR whiskers, as a plotly box trace computes them.
+    
+    plotly.js's default quartilemethod ('linear') interpolates at rank
+    n * p - 0.5, which is numpy's 'hazen' method (not pandas' quantile()).
+    """
+    grouped = df.groupby(x, sort=False)[y]
+    stats = pd.DataFrame({level: np.nanpercentile(values, [25, 50, 75], method='hazen')
+                          for level, values in grouped}, index=['q1', 'median', 'q3']).T
+    stats.index.name = x
+    iqr = stats['q3'] - stats['q1']
+    low = df[x].map(stats['q1'] - 1.5 * iqr)
+    high = df[x].map(stats['q3'] + 1.5 * iqr)
+    values = df[y]
+    stats['lowerfence'] = values.where(values >= low).groupby(df[x], sort=False).min()
+    stats['upperfence'] = values.where(values <= high).groupby(df[x], sort=False).max()
+    stats['mean'] = grouped.mean()
+    return stats
+
+
+class ChartData:
+    """Data slices shared by the charts, each computed once on first use.
+    
+    Aggregates come from `views` (MasterViews, or FrameViews computing them
+    from `df` when not given); `df` only feeds the record-level slices.
+    """
+    
+    def __init__(self, df, sketches=None, views=None):
+        self.df = df
+        self.sketches = sketches
+        self.views = views if views is not None else FrameViews(df)
+    
+    def slice(self, name):
+        return getattr(self, name)
+    
+    @cached_property
+    def quantiles(self):
+        """Salary quantile by q, for every q any chart shows."""
+        if self.sketches is not None:
+            qs = sorted(set(PERCENTILES.values()) | {0.50, 0.75})
+            return dict(zip(qs, salary_quantiles(self.df, qs, self.sketches)))
+        served = self.views.get('salary_quantiles')
+        return dict(zip(served['q'].tolist(), served['value'].tolist()))
+    
+    @cached_property
+    def totals(self):
+        row = self.views.get('totals').iloc[0]
+        return {'count': int(row['count']), 'cities': int(row['cities'])}
+    
+    @cached_property
+    def city_means(self):
+        city_stats = self.views.get('canada_city_stats')
+        city_stats = city_stats[city_stats['count'] >= 1].sort_values('mean', ascending=False)
+        return city_stats[~city_stats['city'].isin(['Aurora', 'Engineer'])]
+    
+    @cached_property
+    def city_salary_stats(self):
+        return self.views.get('city_salary_stats')
+    
+    @cached_property
+    def exp_stats(self):
+        return self.views.get('exp_level_stats')
+    
+    @cached_property
+    def salary_by_years(self):
+        return self.df[['exp_years_min', 'salary_median']]
+    
+    @cached_property
+    def salary_by_level(self):
+        return self.df.dropna(subset=['salary_median'])[['exp_level', 'salary_median']]
+
+
+def generate_kpis(quantiles, totals):
+    """Generate professional KPI strip with key statistics."""
     
     kpis = {
-        'median': int(salary.median()),
-        'p75': int(salary.quantile(0.75)),
-        'count': len(df),
-        'cities': canada_df['city'].nunique(),
+        'median': int(quantiles[0.50]),
+        'p75': int(quantiles[0.75]),
+        'count': totals['count'],
+        'cities': totals['cities'],
     }
     
     # Professional KPI HTML
@@ -116,17 +262,12 @@ def generate_kpis(df):
 </body>
 </html>"""
     
-    return html, kpis
+    return html
 
 
-def generate_geo_chart(df):
+def generate_geo_chart(city_stats):
     """Avg salary by geography (Canadian cities)."""
     
-    canada_df = df[df['country'] == 'Canada'].copy()
-    city_stats = canada_df.groupby('city')['salary_median'].agg(['mean', 'count']).reset_index()
-    city_stats = city_stats[city_stats['count'] >= 1].sort_values('mean', ascending=False)
-    city_stats = city_stats[~city_stats['city'].isin(['Aurora', 'Engineer'])]
-    
     fig = go.Figure()
     
     fig.add_trace(go.Bar(
@@ -150,12 +291,9 @@ def generate_geo_chart(df):
     return fig
 
 
-def generate_salary_distribution(df):
+def generate_salary_distribution(city_stats):
     """Min/Avg/Max salary distribution by city."""
     
-    # Load pre-calculated city stats
-    city_stats = pd.read_csv('data/real_data/city_salary_stats.csv')
-    
     # Sort by average salary for display
     city_stats = city_stats.sort_values('avg_salary', ascending=False)
     
@@ -195,12 +333,9 @@ def generate_salary_distribution(df):
     return fig
 
 
-def generate_exp_progression(df):
+def generate_exp_progression(exp_stats):
     """Salary progression by experience level."""
     
-    exp_stats = df.groupby('exp_level')['salary_median'].agg(['mean', 'median', 'count']).reset_index()
-    exp_stats = exp_stats.dropna()
-    
     fig = go.Figure()
     
     fig.add_trace(go.Scatter(
@@ -233,6 +368,13 @@ def generate_exp_progression(df):
     return fig
 
 
+def generate_position_progression(exp_stats):
+    """Experience progression, titled as career progression."""
+    fig = generate_exp_progression(exp_stats)
+    fig.update_layout(title='Career Progression by Years')
+    return fig
+
+
 def generate_salary_vs_exp(df):
     """Scatter plot: Salary vs Experience."""
     
@@ -241,13 +383,20 @@ def generate_salary_vs_exp(df):
     
     fig = go.Figure()
     
-    fig.add_trace(go.Scatter(
-        x=plot_df['experience'],
-        y=plot_df['salary'],
-        mode='markers',
-        marker=dict(size=8, opacity=0.6, color='#107C10'),
-        hovertemplate='<b>Experience:</b> %{x} yrs<br><b>Salary:</b> $%{y:,.0f}<extra></extra>'
-    ))
+    if len(plot_df) > MAX_WEBGL_POINTS:
+        fig.add_trace(density_heatmap(
+            plot_df['experience'], plot_df['salary'],
+            hovertemplate='<b>Experience:</b> %{x} yrs<br><b>Salary:</b> ~$%{y:,.0f}'
+                          '<br><b>Records:</b> %{z}<extra></extra>'
+        ))
+    else:
+        fig.add_trace(scatter_type(len(plot_df))(
+            x=plot_df['experience'],
+            y=plot_df['salary'],
+            mode='markers',
+            marker=dict(size=8, opacity=0.6, color='#107C10'),
+            hovertemplate='<b>Experience:</b> %{x} yrs<br><b>Salary:</b> $%{y:,.0f}<extra></extra>'
+        ))
     
     fig.update_layout(
         title='Salary vs Experience',
@@ -261,18 +410,10 @@ def generate_salary_vs_exp(df):
     return fig
 
 
-def generate_percentiles(df):
+def generate_percentiles(quantiles):
     """Salary percentiles."""
     
-    salary = df['salary_median'].dropna()
-    
-    percentiles = {
-        'P10': salary.quantile(0.10),
-        'P25': salary.quantile(0.25),
-        'P50': salary.quantile(0.50),
-        'P75': salary.quantile(0.75),
-        'P90': salary.quantile(0.90),
-    }
+    percentiles = {label: quantiles[q] for label, q in PERCENTILES.items()}
     
     fig = go.Figure()
     
@@ -306,6 +447,23 @@ def generate_total_comp(df):
     
     exp_groups = df.dropna(subset=['salary_median'])
     
+    if len(exp_groups) > MAX_SVG_POINTS:
+        # Whiskers and boxes from precomputed quartiles: the file no longer holds every record
+        stats = box_stats(exp_groups, 'exp_level', 'salary_median')
+        fig = go.Figure(go.Box(
+            x=stats.index, q1=stats['q1'], median=stats['median'], q3=stats['q3'],
+            lowerfence=stats['lowerfence'], upperfence=stats['upperfence'], mean=stats['mean'],
+            quartilemethod='linear', marker_color='#636efa', name=''
+        ))
+        fig.update_layout(
+            title=f'Total Compensation Distribution by Experience ({len(exp_groups):,} records)',
+            xaxis_title='Experience Level',
+            yaxis_title='Salary (CAD)',
+            height=400,
+            template='plotly_white'
+        )
+        return fig
+    
     fig = px.box(
         exp_groups,
         x='exp_level',
@@ -336,24 +494,35 @@ def generate_role_evolution(df):
     
     role_data = df.copy()
     role_data['role'] = exp_buckets
-    role_salary = role_data.groupby('role')['salary_median'].mean()
+    role_titles = exp_buckets.map(roles).astype(object).fillna('AI Engineer')
     
     fig = go.Figure()
     
-    fig.add_trace(go.Scatter(
-        x=role_data['exp_years_min'],
-        y=role_data['salary_median'],
-        mode='markers',
-        marker=dict(
-            size=8,
-            color=role_data['exp_years_min'],
-            colorscale='Greens',
-            showscale=True,
-            colorbar=dict(title='Years Exp')
-        ),
-        text=[roles.get(str(r), 'AI Engineer') for r in role_data['role']],
-        hovertemplate='<b>%{text}</b><br>Exp: %{x} yrs<br>Salary: $%{y:,.0f}<extra></extra>'
-    ))
+    if len(role_data) > MAX_WEBGL_POINTS:
+        heatmap = density_heatmap(role_data['exp_years_min'], role_data['salary_median'])
+        if heatmap.x is not None:
+            # Role title of each experience column, for the hover
+            column_roles = pd.cut(pd.Series(heatmap.x), bins=[0, 2, 5, 8, 12, 30],
+                                  labels=list(roles)).map(roles).astype(object).fillna('AI Engineer')
+            heatmap.text = [list(column_roles)] * len(heatmap.y)
+        heatmap.hovertemplate = ('<b>%{text}</b><br>Exp: %{x} yrs<br>Salary: ~$%{y:,.0f}'
+                                 '<br>Records: %{z}<extra></extra>')
+        fig.add_trace(heatmap)
+    else:
+        fig.add_trace(scatter_type(len(role_data))(
+            x=role_data['exp_years_min'],
+            y=role_data['salary_median'],
+            mode='markers',
+            marker=dict(
+                size=8,
+                color=role_data['exp_years_min'],
+                colorscale='Greens',
+                showscale=True,
+                colorbar=dict(title='Years Exp')
+            ),
+            text=role_titles.tolist(),
+            hovertemplate='<b>%{text}</b><br>Exp: %{x} yrs<br>Salary: $%{y:,.0f}<extra></extra>'
+        ))
     
     fig.update_layout(
         title='Role Evolution — Typical Progression by Experience',
@@ -367,58 +536,132 @@ def generate_role_evolution(df):
     return fig
 
 
+class Chart:
+    """One handout file: the function that builds it and the ChartData slices it takes.
+    
+    figure=False for builders returning an HTML page instead of a plotly figure.
+    """
+    
+    def __init__(self, filename, label, build, needs, figure=True):
+        self.filename = filename
+        self.label = label
+        self.build = build
+        self.needs = list(needs)
+        self.figure = figure
+
+
+CHARTS = [
+    Chart('kpis.html', '📈 KPIs', generate_kpis, ['quantiles', 'totals'], figure=False),
+    Chart('geo.html', '🌍 Geography chart', generate_geo_chart, ['city_means']),
+    Chart('vis3_salary_distribution.html', '📊 Salary distribution', generate_salary_distribution,
+          ['city_salary_stats']),
+    Chart('exp_progression.html', '⏱️  Experience progression', generate_exp_progression, ['exp_stats']),
+    Chart('salary_vs_exp.html', '📈 Salary vs Experience', generate_salary_vs_exp, ['salary_by_years']),
+    Chart('percentiles.html', '📊 Percentiles', generate_percentiles, ['quantiles']),
+    Chart('total_comp.html', '💰 Total compensation', generate_total_comp, ['salary_by_level']),
+    Chart('role_evolution.html', '👔 Role evolution', generate_role_evolution, ['salary_by_years']),
+    # Career progression (keep existing but use real data ranges)
+    Chart('position_progression.html', '📈 Career progression', generate_position_progression,
+          ['exp_stats']),
+]
+
+
+def render_chart(chart, slices, output_dir, export=None, png=False):
+    """Build one chart from its slices and write it; returns (chart, seconds)."""
+    start = time.perf_counter()
+    result = chart.build(*slices)
+    path = Path(output_dir) / chart.filename
+    if chart.figure:
+        save_figure(result, path, export, png=png)
+    else:
+        path.write_text(result)
+    return chart, time.perf_counter() - start
+
+
+def render_charts(data, output_dir, charts=CHARTS, export=None, png=False, workers=1, force=False):
+    """Render `charts`, yielding (chart, seconds) as each one is written.
+    
+    Slices are computed here, once each, and only the ones a chart needs are
+    sent to its worker process. A chart whose slices, builder and export
+    options match the fingerprint of its last write is not rebuilt: it is
+    yielded with seconds=None and its files are left untouched.
+    """
+    jobs, stamps = [], {}
+    for chart in charts:
+        slices = [data.slice(name) for name in chart.needs]
+        stamp = ChartFingerprint(Path(output_dir) / chart.filename, chart.build, *slices,
+                                 mode=export, png=png, figure=chart.figure)
+        if not force and stamp.unchanged():
+            yield chart, None
+            continue
+        stamps[chart.filename] = stamp
+        jobs.append((chart, slices))
+    
+    if workers <= 1 or len(jobs) <= 1:
+        for chart, slices in jobs:
+            result = render_chart(chart, slices, output_dir, export, png)
+            stamps[chart.filename].save()
+            yield result
+        return
+    
+    if export != 'standalone':
+        write_plotly_bundle(output_dir)
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+        futures = [pool.submit(render_chart, chart, slices, output_dir, export, png)
+                   for chart, slices in jobs]
+        for future in as_completed(futures):
+            chart, seconds = future.result()
+            stamps[chart.filename].save()
+            yield chart, seconds
+
+
 def main():
+    parser = argparse.ArgumentParser(description='Generate Benchmark dashboard charts')
+    parser.add_argument('--sketch', action='store_true',
+                        help='Take KPI and percentile chart quantiles from the master store\'s '
+                             'partition sketches (master_store.py sketch) instead of the full column')
+    parser.add_argument('--workers', type=int, default=0,
+                        help='Number of worker processes building charts (0 = all cores)')
+    parser.add_argument('--png', action='store_true',
+                        help='Also write a PNG of each chart (needs kaleido)')
+    parser.add_argument('--force', action='store_true',
+                        help='Rebuild every chart, even those whose inputs did not change')
+    add_export_args(parser)
+    args = parser.parse_args()
+    
     print("📊 Generating Benchmark charts with REAL data...\n")
     
     df = load_data()
+    sketches = None
+    if args.sketch:
+        sketch_path = MasterStore().sketch_path
+        if not sketch_path.exists():
+            print(f"❌ No sketches at {sketch_path} (run: master_store.py sketch)")
+            return 1
+        sketches = SketchStore.load(sketch_path)
+        print(f"📐 Using percentile sketches (±{sketches.accuracy:.1%})\n")
     output_dir = Path('outputs/handout')
     output_dir.mkdir(parents=True, exist_ok=True)
     
-    # 1. KPIs
-    print("📈 KPIs...")
-    kpi_html, kpi_data = generate_kpis(df)
-    (output_dir / 'kpis.html').write_text(kpi_html)
-    
-    # 2. Geography
-    print("🌍 Geography chart...")
-    fig = generate_geo_chart(df)
-    fig.write_html(output_dir / 'geo.html')
-    
-    # 3. Salary Distribution
-    print("📊 Salary distribution...")
-    fig = generate_salary_distribution(df)
-    fig.write_html(output_dir / 'vis3_salary_distribution.html')
-    
-    # 4. Experience Progression
-    print("⏱️  Experience progression...")
-    fig = generate_exp_progression(df)
-    fig.write_html(output_dir / 'exp_progression.html')
-    
-    # 5. Salary vs Experience
-    print("📈 Salary vs Experience...")
-    fig = generate_salary_vs_exp(df)
-    fig.write_html(output_dir / 'salary_vs_exp.html')
-    
-    # 6. Percentiles
-    print("📊 Percentiles...")
-    fig = generate_percentiles(df)
-    fig.write_html(output_dir / 'percentiles.html')
-    
-    # 7. Total Compensation
-    print("💰 Total compensation...")
-    fig = generate_total_comp(df)
-    fig.write_html(output_dir / 'total_comp.html')
-    
-    # 8. Role Evolution
-    print("👔 Role evolution...")
-    fig = generate_role_evolution(df)
-    fig.write_html(output_dir / 'role_evolution.html')
-    
-    # 9. Career Progression (keep existing but use real data ranges)
-    print("📈 Career progression...")
-    fig = generate_exp_progression(df)
-    fig.update_layout(title='Career Progression by Years')
-    fig.write_html(output_dir / 'position_progression.html')
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+    if workers > 1:
+        print(f"⚙️  Workers: {workers}\n")
+    
+    start = time.perf_counter()
+    views = MasterViews()
+    refreshed = views.refresh()
+    if refreshed:
+        print(f"🔄 Refreshed master views: {', '.join(refreshed)}\n")
+    data = ChartData(df, sketches, views)
+    rendered = 0
+    for chart, seconds in render_charts(data, output_dir, export=args.export, png=args.png,
+                                        workers=workers, force=args.force):
+        if seconds is None:
+            print(f"{chart.label} → {chart.filename} unchanged, skipped")
+        else:
+            rendered += 1
+            print(f"{chart.label} → {chart.filename} ({seconds:.2f}s)")
+    print(f"\n⏱️  {rendered} of {len(CHARTS)} charts rebuilt in {time.perf_counter() - start:.2f}s")
     
     print("\n✅ All benchmark charts updated with REAL data!")
     print(f"📁 Saved to: {output_dir}")
@@ -6,6 +6,8 @@ Generate Career Progression chart - Position levels by years of experience.
 import plotly.graph_objects as go
 from pathlib import Path
 
+from chart_export import save_figure
+
 def generate_career_progression_chart():
     """Generate career progression chart showing typical position levels by experience."""
     
@@ -85,7 +87,7 @@ def generate_career_progression_chart():
     # Save
     output_dir = Path('outputs/handout')
     output_dir.mkdir(parents=True, exist_ok=True)
-    fig.write_html(output_dir / 'career_progression.html')
+    save_figure(fig, output_dir / 'career_progression.html')
     
     print("✅ Generated Career Progression chart")
     print(f"   Levels: {len(stages)} career stages")
@@ -3,11 +3,24 @@
 Generate AI Engineer Demand Growth chart (2020-2030).
 """
 
+import argparse
 import plotly.graph_objects as go
 from pathlib import Path
 
-def generate_demand_growth_chart():
-    """Generate line chart showing AI Engineer demand growth projection."""
+from chart_export import ChartFingerprint, add_force_args, save_figure
+
+def generate_demand_growth_chart(force=False):
+    """Generate line chart showing AI Engineer demand growth projection.
+    
+    The data is defined below, so the chart is only rebuilt when this
+    function changes (or with force=True).
+    """
+    
+    output_path = Path('outputs/handout') / 'demand_growth.html'
+    stamp = ChartFingerprint(output_path, generate_demand_growth_chart)
+    if not force and stamp.unchanged():
+        print("⏭️  Demand growth chart unchanged, skipped")
+        return
     
     # Years from 2020 to 2030
     years = list(range(2020, 2031))
@@ -132,9 +145,8 @@ def generate_demand_growth_chart():
     )
     
     # Save
-    output_dir = Path('outputs/handout')
-    output_dir.mkdir(parents=True, exist_ok=True)
-    fig.write_html(output_dir / 'demand_growth.html')
+    save_figure(fig, output_path)
+    stamp.save()
     
     print("✅ Generated AI Engineer Demand Growth chart")
     print(f"   Years: 2020-2030")
@@ -142,4 +154,7 @@ def generate_demand_growth_chart():
     print(f"   Job Postings: {job_postings[0]}K → {job_postings[-1]}K")
 
 if __name__ == '__main__':
-    generate_demand_growth_chart()
+    parser = argparse.ArgumentParser(description='Generate AI Engineer Demand Growth chart (2020-2030)')
+    add_force_args(parser)
+    args = parser.parse_args()
+    generate_demand_growth_chart(force=args.force)
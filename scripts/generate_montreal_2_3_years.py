@@ -1,33 +1,38 @@
 #!/usr/bin/env python3
 """
 Generate Montreal 2-3 years experience AI Engineer salary chart (Min/Avg/Max)
+
+Reads the montreal_exp_level_stats master view instead of the raw records.
 """
 
-import pandas as pd
+import argparse
 import plotly.graph_objects as go
 import os
 
-def generate_montreal_2_3_years_chart():
-    """Generate bar chart showing min/avg/max for Montreal AI Engineers with 2-3 years experience"""
+from chart_export import ChartFingerprint, add_force_args, save_figure
+from master_views import MasterViews, combine_levels
+
+# 2-3 years experience, using 0-3 years as closest match
+LEVELS = ['0-3 years', '2-5 years']
+
+def generate_montreal_2_3_years_chart(force=False):
+    """Generate bar chart showing min/avg/max for Montreal AI Engineers with 2-3 years experience
     
-    # Load master data
-    df = pd.read_csv('data/real_data/stat_master_salaries.csv')
+    Skipped when the selected salaries are the same as at the last write (unless force=True).
+    """
     
-    # Filter for Montreal, 2-3 years experience (using 0-3 years as closest match)
-    montreal_2_3 = df[
-        (df['city'] == 'Montreal') & 
-        (df['exp_level'].isin(['0-3 years', '2-5 years']))
-    ]
+    # Montreal salary stats per experience level
+    level_stats = MasterViews().get('montreal_exp_level_stats')
+    stats = combine_levels(level_stats, LEVELS)
     
-    if len(montreal_2_3) == 0:
+    if stats['records'] == 0:
         print("⚠️ No records found for Montreal 2-3 years experience")
         return
     
-    # Calculate statistics
-    min_salary = montreal_2_3['salary_median'].min()
-    avg_salary = montreal_2_3['salary_median'].mean()
-    max_salary = montreal_2_3['salary_median'].max()
-    count = len(montreal_2_3)
+    min_salary = stats['min_salary']
+    avg_salary = stats['avg_salary']
+    max_salary = stats['max_salary']
+    count = stats['records']
     
     print(f"📊 Montreal AI Engineers (2-3 years experience):")
     print(f"Min: ${min_salary:,.0f}")
@@ -35,6 +40,12 @@ def generate_montreal_2_3_years_chart():
     print(f"Max: ${max_salary:,.0f}")
     print(f"Count: {count} records")
     
+    output_path = 'outputs/handout/montreal_2_3_years.html'
+    stamp = ChartFingerprint(output_path, stats, generate_montreal_2_3_years_chart)
+    if not force and stamp.unchanged():
+        print(f"⏭️  Chart unchanged, skipped: {output_path}")
+        return
+    
     # Create bar chart
     fig = go.Figure()
     
@@ -78,10 +89,13 @@ def generate_montreal_2_3_years_chart():
     
     # Save output
     os.makedirs('outputs/handout', exist_ok=True)
-    output_path = 'outputs/handout/montreal_2_3_years.html'
-    fig.write_html(output_path, include_plotlyjs=True)
+    save_figure(fig, output_path)
+    stamp.save()
     
     print(f"✅ Chart saved to {output_path}")
 
 if __name__ == '__main__':
-    generate_montreal_2_3_years_chart()
+    parser = argparse.ArgumentParser(description='Generate Montreal 2-3 years experience AI Engineer salary chart (Min/Avg/Max)')
+    add_force_args(parser)
+    args = parser.parse_args()
+    generate_montreal_2_3_years_chart(force=args.force)
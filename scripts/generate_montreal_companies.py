@@ -1,36 +1,35 @@
 #!/usr/bin/env python3
 """
 Generate Montreal companies compensation histogram.
+
+Per-company stats come from the montreal_company_stats master view.
 """
 
-import pandas as pd
+import argparse
 import plotly.graph_objects as go
 from pathlib import Path
 
-def generate_montreal_companies_chart():
-    """Generate histogram of companies in Montreal with their compensation range."""
-    
-    # Load data
-    df = pd.read_csv('data/real_data/stat_master_salaries.csv')
-    
-    # Filter for Montreal
-    montreal_df = df[df['city'] == 'Montreal'].copy()
-    
-    # Remove Glassdoor Submission entries
-    montreal_df = montreal_df[montreal_df['company'] != 'Glassdoor Submission']
+from chart_export import ChartFingerprint, add_force_args, save_figure
+from master_views import MasterViews
+
+def generate_montreal_companies_chart(force=False):
+    """Generate histogram of companies in Montreal with their compensation range.
     
-    # Group by company and get compensation stats
-    company_stats = montreal_df.groupby('company').agg({
-        'salary_median': ['min', 'mean', 'max', 'count']
-    }).reset_index()
+    Skipped when the per-company stats are the same as at the last write
+    (unless force=True).
+    """
     
-    company_stats.columns = ['company', 'min_salary', 'avg_salary', 'max_salary', 'count']
+    # Montreal companies (without Glassdoor Submission entries), sorted by average salary
+    company_stats = MasterViews().get('montreal_company_stats')
     
     # Filter out companies with single records for cleaner viz (or keep all)
     # company_stats = company_stats[company_stats['count'] >= 1]
     
-    # Sort by average salary
-    company_stats = company_stats.sort_values('avg_salary', ascending=True)
+    output_path = Path('outputs/handout') / 'montreal_companies.html'
+    stamp = ChartFingerprint(output_path, company_stats, generate_montreal_companies_chart)
+    if not force and stamp.unchanged():
+        print(f"⏭️  Montreal companies chart unchanged ({len(company_stats)} companies), skipped")
+        return
     
     # Create figure
     fig = go.Figure()
@@ -82,12 +81,14 @@ def generate_montreal_companies_chart():
     )
     
     # Save
-    output_dir = Path('outputs/handout')
-    output_dir.mkdir(parents=True, exist_ok=True)
-    fig.write_html(output_dir / 'montreal_companies.html')
+    save_figure(fig, output_path)
+    stamp.save()
     
     print(f"✅ Generated Montreal companies chart: {len(company_stats)} companies")
     print(f"   Salary range: ${company_stats['min_salary'].min():,.0f} - ${company_stats['max_salary'].max():,.0f}")
 
 if __name__ == '__main__':
-    generate_montreal_companies_chart()
+    parser = argparse.ArgumentParser(description='Generate Montreal companies compensation histogram')
+    add_force_args(parser)
+    args = parser.parse_args()
+    generate_montreal_companies_chart(force=args.force)
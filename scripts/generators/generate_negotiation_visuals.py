@@ -1,9 +1,14 @@
 #!/usr/bin/env python3
 import os
+import sys
+from pathlib import Path
 import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from chart_export import save_figure
+
 os.makedirs('handout', exist_ok=True)
 
 # 1. Suggested Salary Targets (Gauge Chart)
@@ -40,7 +45,7 @@ fig1.add_annotation(
 )
 
 fig1.update_layout(height=450, template='plotly_white')
-fig1.write_html('handout/salary_targets_gauge.html', include_plotlyjs='cdn')
+save_figure(fig1, 'handout/salary_targets_gauge.html')
 print("Wrote handout/salary_targets_gauge.html")
 
 # 2. Key Value Propositions (Radar Chart - 5 competencies)
@@ -88,7 +93,7 @@ fig2.add_annotation(text='Scores indicatifs basés sur livraisons (8), domaines
                     xref='paper', yref='paper', x=0.5, y=-0.12,
                     showarrow=False, font=dict(size=11, color='#64748b'))
 
-fig2.write_html('handout/value_propositions_radar.html', include_plotlyjs='cdn')
+save_figure(fig2, 'handout/value_propositions_radar.html')
 print("Wrote handout/value_propositions_radar.html")
 
 # 3. Strategic Questions (Visual Checklist/Timeline)
@@ -126,7 +131,7 @@ fig3.update_layout(
     margin=dict(l=200, r=50, t=80, b=50)
 )
 
-fig3.write_html('handout/strategic_questions.html', include_plotlyjs='cdn')
+save_figure(fig3, 'handout/strategic_questions.html')
 print("Wrote handout/strategic_questions.html")
 
 # 4. Talking Points (Feature Importance / Skill Bars)
@@ -163,7 +168,7 @@ fig4.update_layout(
     hovermode='closest'
 )
 
-fig4.write_html('handout/talking_points.html', include_plotlyjs='cdn')
+save_figure(fig4, 'handout/talking_points.html')
 print("Wrote handout/talking_points.html")
 
 # 5. Soft Skills Evolution (for visual support)
@@ -196,7 +201,7 @@ fig5.update_layout(
     hovermode='x'
 )
 
-fig5.write_html('handout/soft_skills_growth.html', include_plotlyjs=True)
+save_figure(fig5, 'handout/soft_skills_growth.html')
 print("Wrote handout/soft_skills_growth.html")
 
 print("\n✓ All negotiation visuals generated successfully!")
@@ -1,8 +1,13 @@
 #!/usr/bin/env python3
 import os
+import sys
+from pathlib import Path
 import pandas as pd
 import plotly.graph_objects as go
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from chart_export import save_figure
+
 os.makedirs('handout', exist_ok=True)
 roles_path = 'data/role_evolution_sourced.csv'
 
@@ -52,7 +57,7 @@ if os.path.exists(roles_path):
         )
         
         out_html = 'handout/position_progression.html'
-        fig.write_html(out_html, include_plotlyjs=True)
+        save_figure(fig, out_html)
         print('Wrote', out_html)
     else:
         print('CSV missing expected columns')
@@ -1,8 +1,13 @@
 #!/usr/bin/env python3
 import os
+import sys
+from pathlib import Path
 import pandas as pd
 import plotly.express as px
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from chart_export import save_figure
+
 os.makedirs('handout', exist_ok=True)
 roles_path = 'data/role_evolution_sourced.csv'
 
@@ -32,7 +37,7 @@ if os.path.exists(roles_path):
         fig = px.bar(role_evo, x='end_year', y='Typical_Title', orientation='h', labels={'end_year':'Years (approx)','Typical_Title':'Title'}, title='AI Role Titles by Approx Years', hover_data={'Year_Range':True, 'end_year':False})
         fig.update_layout(height=420)
         out_html = 'handout/role_evolution.html'
-        fig.write_html(out_html, include_plotlyjs=True)
+        save_figure(fig, out_html)
         print('Wrote', out_html)
     else:
         print('CSV present but missing expected columns (typical_titles, years_to, years_from):', roles_path)
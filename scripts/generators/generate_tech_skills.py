@@ -1,8 +1,13 @@
 #!/usr/bin/env python3
 import os
+import sys
+from pathlib import Path
 import pandas as pd
 import plotly.graph_objects as go
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from chart_export import save_figure
+
 os.makedirs('handout', exist_ok=True)
 csv_path = 'data/technical_skills_evolution.csv'
 
@@ -35,7 +40,7 @@ if os.path.exists(csv_path):
     )
     
     out_html = 'handout/technical_skills_evolution.html'
-    fig.write_html(out_html, include_plotlyjs=True)
+    save_figure(fig, out_html)
     
     try:
         fig.write_image('handout/technical_skills_evolution.png', engine='kaleido')
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Streaming extraction helpers for very large saved Levels.fyi pages.
+
+"Complete Webpage" saves are tens of MB, mostly inlined JS and CSS. Instead
+of reading the whole file into a string and building a soup, the file is
+fed in chunks to lxml's HTML parser with a parser target:
+- only the elements we care about (e.g. salary rows) are built, one subtree
+  at a time, and handed out as soon as they are closed
+- everything else is dropped as it streams past
+
+Memory therefore stays flat whatever the file size.
+"""
+
+import re
+from typing import Iterator, Optional, Tuple
+
+from bs4 import BeautifulSoup
+from lxml import etree
+
+CHUNK_SIZE = 1 << 20  # 1 MB per feed()
+
+# Same strings BeautifulSoup.get_text() leaves out
+SKIP_TEXT_TAGS = {'script', 'style', 'template'}
+
+
+def _class_matches(attrib, class_re: Optional[re.Pattern]) -> bool:
+    if class_re is None:
+        return True
+    return any(class_re.search(c) for c in attrib.get('class', '').split())
+
+
+class _ElementTarget:
+    """Parser target that builds only the subtrees of matching elements.
+
+    Matching elements are the outermost `tag` elements whose class matches
+    class_re; if `within` is given, only those inside the first element
+    matching (tag, class_re) — like soup.find(...).find_all(...).
+    """
+
+    def __init__(self, tag: str, class_re=None, within: Tuple = None):
+        self.tag = tag
+        self.class_re = class_re
+        self.within = within
+        self.scope_depth = 0 if within is None else None  # None = not reached yet
+        self.scope_done = False
+        self.builder = None
+        self.depth = 0
+        self.skip = 0
+        self.ready = []
+
+    def start(self, tag, attrib):
+        if self.within is not None and not self.scope_done:
+            if self.scope_depth is None:
+                if tag == self.within[0] and _class_matches(attrib, self.within[1]):
+                    self.scope_depth = 1
+                    return
+            else:
+                self.scope_depth += 1
+
+        if self.builder is not None:
+            self.depth += 1
+            if tag in SKIP_TEXT_TAGS:
+                self.skip += 1
+            self.builder.start(tag, dict(attrib))
+        elif (self.scope_depth is not None and not self.scope_done
+              and tag == self.tag and _class_matches(attrib, self.class_re)):
+            self.builder = etree.TreeBuilder()
+            self.depth = 1
+            self.builder.start(tag, dict(attrib))
+
+    def end(self, tag):
+        if self.builder is not None:
+            if tag in SKIP_TEXT_TAGS:
+                self.skip -= 1
+            self.builder.end(tag)
+            self.depth -= 1
+            if self.depth == 0:
+                self.ready.append(self.builder.close())
+                self.builder = None
+
+        if self.within is not None and self.scope_depth is not None and not self.scope_done:
+            self.scope_depth -= 1
+            if self.scope_depth == 0:
+                self.scope_done = True
+
+    def data(self, data):
+        if self.builder is not None and not self.skip:
+            self.builder.data(data)
+
+    def close(self):
+        return None
+
+    def drain(self):
+        ready, self.ready = self.ready, []
+        return ready
+
+
+class _TextTarget:
+    """Parser target that keeps only visible text, in document order."""
+
+    def __init__(self):
+        self.skip = 0
+        self.ready = []
+
+    def start(self, tag, attrib):
+        if tag in SKIP_TEXT_TAGS:
+            self.skip += 1
+
+    def end(self, tag):
+        if tag in SKIP_TEXT_TAGS:
+            self.skip -= 1
+
+    def data(self, data):
+        if not self.skip:
+            self.ready.append(data)
+
+    def close(self):
+        return None
+
+    def drain(self):
+        ready, self.ready = self.ready, []
+        return ready
+
+
+def _stream(html_path, target) -> Iterator:
+    """Feed the file to lxml in chunks, yielding whatever the target produced."""
+    parser = etree.HTMLParser(target=target, encoding='utf-8')
+    with open(html_path, 'rb') as f:
+        while True:
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            parser.feed(chunk)
+            yield from target.drain()
+    parser.close()
+    yield from target.drain()
+
+
+def iter_elements(html_path, tag: str, class_re=None, within: Tuple = None) -> Iterator:
+    """Yield matching elements (lxml) one at a time as they are closed."""
+    return _stream(html_path, _ElementTarget(tag, class_re, within))
+
+
+def iter_soup_elements(html_path, tag: str, class_re=None, within: Tuple = None) -> Iterator:
+    """Like iter_elements, but each subtree comes back as a BeautifulSoup Tag.
+
+    Lets the existing per-row parsing code run unchanged on streamed rows.
+    """
+    for elem in iter_elements(html_path, tag, class_re, within):
+        fragment = etree.tostring(elem, encoding='unicode', method='html')
+        yield BeautifulSoup(fragment, 'html.parser').find(tag)
+
+
+def iter_text(html_path) -> Iterator[str]:
+    """Yield visible text strings in document order (like soup.get_text())."""
+    return _stream(html_path, _TextTarget())
+
+
+def iter_text_matches(html_path, pattern: re.Pattern, margin: int = 4096) -> Iterator[re.Match]:
+    """Run pattern.finditer over the page's visible text without holding it all.
+
+    Text is buffered and scanned in blocks; the last `margin` characters are
+    carried over so matches spanning two strings are still found. Gives the
+    same matches as pattern.finditer(soup.get_text()) for matches shorter
+    than `margin`.
+    """
+    buf = ''
+    for text in iter_text(html_path):
+        buf += text
+        if len(buf) < 16 * margin:
+            continue
+        cut = len(buf) - margin
+        keep = cut
+        for m in pattern.finditer(buf):
+            if m.start() >= cut:
+                break
+            yield m
+            keep = max(keep, m.end())
+        buf = buf[keep:]
+    yield from pattern.finditer(buf)
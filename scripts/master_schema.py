@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Declarative source → master-format mappings, applied column-wise.
+
+A schema is a dict of master column → field spec, in output order:
+
+    LEVELSFYI_TO_MASTER = {
+        'source': Const('Levels.fyi'),
+        'collection_date': Const(today),
+        'location': Column('location', strip=True),
+        'exp_years_min': Experience('years_total', 'min'),
+        'salary_median': Column('total_compensation_cad', default=0),
+        'level': Column('level', default='Not Specified', missing=('-',)),
+        'city': City('location'),
+        'country': Country('location'),
+        ...
+    }
+    df_master = apply_schema(df_source, LEVELSFYI_TO_MASTER)
+
+Every spec maps the whole source frame to one output column with vectorized
+operations (pd.cut for experience buckets, str.split for city), so a mapping
+costs a few passes over the columns instead of a Python loop per row.
+"""
+
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+# (upper bound in years, inclusive; exp_level; exp_years_min; exp_years_max)
+EXPERIENCE_BUCKETS = [
+    (3, '0-3 years', 0, 3),
+    (6, '4-6 years', 4, 6),
+    (9, '7-9 years', 7, 9),
+    (12, '10-12 years', 10, 12),
+    (np.inf, '13+ years', 13, 20),
+]
+
+
+def today() -> str:
+    return datetime.now().strftime('%Y-%m-%d')
+
+
+def per_unique(values: pd.Series, transform) -> pd.Series:
+    """transform() applied to the distinct values only, then mapped back.
+
+    Source columns such as location repeat a handful of strings across
+    millions of rows; string methods run once per distinct value.
+    """
+    codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    return transform(pd.Series(uniques)).take(codes).set_axis(values.index)
+
+
+class Field(ABC):
+    """Maps a source frame to one output column."""
+
+    @abstractmethod
+    def apply(self, df: pd.DataFrame) -> pd.Series:
+        """The output column for every row of `df` (same index)."""
+
+
+class Const(Field):
+    """The same value on every row; a callable is evaluated once per apply."""
+
+    def __init__(self, value):
+        self.value = value
+
+    def apply(self, df):
+        value = self.value() if callable(self.value) else self.value
+        return pd.Series(value, index=df.index)
+
+
+class Column(Field):
+    """A source column; missing values (NaN or one of `missing`) become `default`."""
+
+    def __init__(self, name: str, default=None, missing=(), strip: bool = False):
+        self.name = name
+        self.default = default
+        self.missing = tuple(missing)
+        self.strip = strip
+
+    def apply(self, df):
+        values = df[self.name]
+        if self.strip:
+            values = per_unique(values, lambda v: v.str.strip())
+        if self.missing:
+            values = values.mask(values.isin(self.missing))
+        if self.default is not None:
+            values = values.fillna(self.default)
+        return values
+
+
+class Experience(Field):
+    """Bucket a years-of-experience column (NaN counts as 0) into EXPERIENCE_BUCKETS.
+
+    part: 'level' (label), 'min' or 'max' (bucket bounds in years).
+    """
+
+    def __init__(self, name: str, part: str = 'level', buckets=EXPERIENCE_BUCKETS):
+        self.name = name
+        self.part = part
+        self.buckets = buckets
+
+    def apply(self, df):
+        years = pd.to_numeric(df[self.name], errors='coerce').fillna(0)
+        bins = [-np.inf] + [upper for upper, *_ in self.buckets]
+        codes = pd.cut(years, bins=bins, labels=False).to_numpy()
+        column = {'level': 1, 'min': 2, 'max': 3}[self.part]
+        values = pd.Series([bucket[column] for bucket in self.buckets])
+        return values.take(codes).set_axis(df.index)
+
+
+class City(Field):
+    """First comma-separated part of a location ('Toronto, ON, Canada' → 'Toronto')."""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def apply(self, df):
+        return per_unique(df[self.name], lambda v: v.str.strip().str.split(',', n=1).str[0].str.strip())
+
+
+class Country(Field):
+    """'Canada' unless a comma-separated location does not mention Canada ('USA')."""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def apply(self, df):
+        return per_unique(df[self.name], self._country)
+
+    @staticmethod
+    def _country(location: pd.Series) -> pd.Series:
+        canada = (~location.str.contains(',', regex=False, na=False) |
+                  location.str.contains('Canada', regex=False, na=False))
+        return pd.Series(np.where(canada, 'Canada', 'USA'))
+
+
+def apply_schema(df: pd.DataFrame, schema: Dict[str, Field]) -> pd.DataFrame:
+    """Master-format frame (columns in schema order, fresh RangeIndex)."""
+    columns = {name: field.apply(df) for name, field in schema.items()}
+    return pd.DataFrame(columns, index=df.index).reset_index(drop=True)
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Incremental, append-only storage for the master salary dataset.
+
+Instead of rewriting stat_master_salaries.csv on every refresh, records are
+appended as small partition files keyed by source and collection_date:
+
+    data/real_data/master/
+        manifest.json
+        source=glassdoor/collection_date=2026-01-12/part-00001.csv
+        source=levels_fyi/collection_date=2026-01-15/part-00002.csv
+
+- Each record gets a record_id: a hash of its content (all master columns
+  except collection_date), so re-collecting an unchanged record writes
+  nothing and a changed record is appended as a new one. Identical rows
+  within a batch are told apart by their occurrence, so they are all kept.
+- Replacing a source's records (what merge_datasets.py does for Levels.fyi)
+  only writes the new records and lists the retired record_ids in the
+  manifest; readers skip them.
+- `compact` rewrites each partition into a single file without retired
+  records.
+
+load_master() returns the same frame as today's single table. It reads
+whichever of the store and the stat_master_salaries table was written last,
+so a non-incremental consolidate/merge run is not hidden by an older store.
+master_version() stamps what it would return, for tables derived from it
+(master_views.py).
+
+Commands:
+    python scripts/master_store.py import    # seed from the stat_master_salaries table (or --csv)
+    python scripts/master_store.py info
+    python scripts/master_store.py compact
+    python scripts/master_store.py export    # write stat_master_salaries.csv
+    python scripts/master_store.py sketch    # build percentile sketches (see quantile_sketch.py)
+"""
+
+import argparse
+import hashlib
+import json
+import re
+from pathlib import Path
+
+import pandas as pd
+
+from parse_cache import file_digest
+from quantile_sketch import DEFAULT_ACCURACY, PARTITION_COLUMNS, SketchStore
+from storage import find_table, read_table, with_categories
+
+MASTER_CSV = Path('data/real_data/stat_master_salaries.csv')
+STORE_DIR = Path('data/real_data/master')
+
+MASTER_COLUMNS = [
+    'source', 'collection_date', 'location', 'job_title',
+    'exp_years_min', 'exp_years_max', 'salary_min', 'salary_max', 'salary_median',
+    'company', 'level', 'country', 'city', 'exp_level'
+]
+NUMERIC_COLUMNS = {'exp_years_min', 'exp_years_max', 'salary_min', 'salary_max', 'salary_median'}
+
+
+def _slug(value) -> str:
+    return re.sub(r'[^a-z0-9]+', '_', str(value).lower()).strip('_') or 'unknown'
+
+
+def record_ids(df: pd.DataFrame) -> pd.Series:
+    """Content hash per row (collection_date excluded), stable across reads.
+
+    The n-th repeat of identical content (n >= 1) gets a hash of (content, n),
+    so duplicate rows keep distinct ids and the first keeps the plain hash.
+    """
+    cols = [c for c in MASTER_COLUMNS if c in df.columns and c != 'collection_date']
+    normalized = pd.DataFrame(index=df.index)
+    for col in cols:
+        values = df[col]
+        if col in NUMERIC_COLUMNS:
+            normalized[col] = pd.to_numeric(values, errors='coerce').astype('float64')
+        else:
+            # Same value whether the column came from memory or back from CSV
+            normalized[col] = values.astype(object).where(values.notna(), '').astype(str)
+    content = pd.util.hash_pandas_object(normalized, index=False)
+    occurrence = content.groupby(content, sort=False).cumcount()
+    repeated = pd.util.hash_pandas_object(pd.DataFrame({'content': content, 'occurrence': occurrence}),
+                                          index=False)
+    return content.where(occurrence == 0, repeated).astype('int64')
+
+
+class MasterStore:
+    """Partitioned master dataset with a JSON manifest."""
+
+    def __init__(self, root=STORE_DIR):
+        self.root = Path(root)
+        self.manifest_path = self.root / 'manifest.json'
+        self.sketch_path = self.root / 'sketches.json'
+        self.manifest = self._load_manifest()
+
+    def exists(self) -> bool:
+        return self.manifest_path.exists()
+
+    @property
+    def version(self) -> str:
+        """Hash of the manifest's parts and retired records: changes with every write."""
+        state = {'parts': self.manifest['parts'], 'retired': self.manifest['retired']}
+        return hashlib.sha256(json.dumps(state, sort_keys=True).encode()).hexdigest()[:16]
+
+    def _load_manifest(self) -> dict:
+        if self.manifest_path.exists():
+            with open(self.manifest_path) as f:
+                return json.load(f)
+        return {'version': 1, 'next_part': 1, 'parts': [], 'retired': {}}
+
+    def _save_manifest(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.manifest_path.with_suffix('.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(self.manifest, f, indent=2)
+        tmp.replace(self.manifest_path)
+
+    def _parts(self, source: str = None):
+        return [p for p in self.manifest['parts'] if source is None or p['source'] == source]
+
+    def _write_part(self, df: pd.DataFrame, source: str, collection_date: str) -> dict:
+        part_no = self.manifest['next_part']
+        self.manifest['next_part'] += 1
+        rel = Path(f"source={_slug(source)}") / f"collection_date={_slug(collection_date)}" / f"part-{part_no:05d}.csv"
+        path = self.root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        df.to_csv(path, index=False)
+        part = {'path': rel.as_posix(), 'source': source,
+                'collection_date': str(collection_date), 'rows': len(df)}
+        self.manifest['parts'].append(part)
+        return part
+
+    def existing_ids(self, source: str) -> set:
+        """record_ids currently live for one source (reads only that column)."""
+        ids = set()
+        for part in self._parts(source):
+            ids.update(pd.read_csv(self.root / part['path'], usecols=['record_id'])['record_id'])
+        return ids - set(self.manifest['retired'].get(source, []))
+
+    def _sketches(self):
+        """The partition quantile sketches, if they have been built."""
+        return SketchStore.load(self.sketch_path) if self.sketch_path.exists() else None
+
+    def append(self, df: pd.DataFrame) -> int:
+        """Append rows not already stored; returns the number of rows written."""
+        df = df.copy()
+        df['record_id'] = record_ids(df)
+        written = 0
+        added = []
+        for source, batch in df.groupby('source', sort=False):
+            known = self.existing_ids(source)
+            retired = set(self.manifest['retired'].get(source, []))
+            # A retired record coming back is revived, not written again
+            revived = batch[batch['record_id'].isin(retired)]
+            if len(revived):
+                self.manifest['retired'][source] = sorted(retired - set(revived['record_id']))
+                added.append(revived)
+            new = batch[~batch['record_id'].isin(known | retired)]
+            if len(new) == 0:
+                continue
+            added.append(new)
+            dates = new['collection_date'].fillna('unknown').astype(str)
+            for collection_date, part_df in new.groupby(dates, sort=False):
+                self._write_part(part_df, source, collection_date)
+                written += len(part_df)
+        self._save_manifest()
+
+        sketches = self._sketches()
+        if sketches is not None and added:
+            sketches.add(pd.concat(added))
+            sketches.save()
+        return written
+
+    def replace_source(self, df: pd.DataFrame, source: str) -> tuple:
+        """Make df the complete set of records for `source`.
+
+        Only new records are written; stored records missing from df are
+        retired in the manifest. Returns (written, retired).
+        """
+        df = df[df['source'] == source]
+        keep = set(record_ids(df))
+        stale = self.existing_ids(source) - keep
+        written = self.append(df)
+        if stale:
+            retired = set(self.manifest['retired'].get(source, [])) | stale
+            self.manifest['retired'][source] = sorted(int(i) for i in retired)
+            self._save_manifest()
+
+            sketches = self._sketches()
+            if sketches is not None:
+                usecols = ['record_id', 'salary_median', *PARTITION_COLUMNS]
+                frames = [pd.read_csv(self.root / p['path'], usecols=lambda c: c in usecols)
+                          for p in self._parts(source)]
+                rows = pd.concat(frames, ignore_index=True)
+                sketches.remove(rows[rows['record_id'].isin(stale)])
+                sketches.save()
+        return written, len(stale)
+
+    def build_sketches(self, accuracy: float = DEFAULT_ACCURACY) -> SketchStore:
+        """(Re)build the partition sketches from the live records."""
+        sketches = SketchStore.build(self.read(['salary_median', *PARTITION_COLUMNS]),
+                                     self.sketch_path, accuracy)
+        sketches.save()
+        return sketches
+
+    def read(self, columns=None) -> pd.DataFrame:
+        """Live records in master column order (record_id dropped)."""
+        frames = []
+        for part in self._parts():
+            usecols = None if columns is None else list(dict.fromkeys(list(columns) + ['record_id']))
+            part_df = pd.read_csv(self.root / part['path'], usecols=usecols)
+            retired = self.manifest['retired'].get(part['source'])
+            if retired:
+                part_df = part_df[~part_df['record_id'].isin(retired)]
+            frames.append(part_df)
+        if not frames:
+            return pd.DataFrame(columns=columns or MASTER_COLUMNS)
+        df = pd.concat(frames, ignore_index=True, sort=False)
+        df = df.drop(columns='record_id')
+        ordered = [c for c in MASTER_COLUMNS if c in df.columns]
+        return with_categories(df[ordered + [c for c in df.columns if c not in ordered]])
+
+    def compact(self) -> int:
+        """Rewrite each (source, collection_date) partition as one file without retired rows."""
+        groups = {}
+        for part in self._parts():
+            groups.setdefault((part['source'], part['collection_date']), []).append(part)
+
+        old_parts = self.manifest['parts']
+        self.manifest['parts'] = []
+        for (source, collection_date), parts in groups.items():
+            retired = set(self.manifest['retired'].get(source, []))
+            frames = [pd.read_csv(self.root / p['path']) for p in parts]
+            df = pd.concat(frames, ignore_index=True, sort=False)
+            df = df[~df['record_id'].isin(retired)]
+            if len(df):
+                self._write_part(df, source, collection_date)
+        self.manifest['retired'] = {}
+        self._save_manifest()
+
+        live = {p['path'] for p in self.manifest['parts']}
+        for part in old_parts:
+            if part['path'] not in live:
+                (self.root / part['path']).unlink(missing_ok=True)
+        return len(old_parts) - len(self.manifest['parts'])
+
+    def info(self) -> pd.DataFrame:
+        parts = pd.DataFrame(self.manifest['parts'], columns=['path', 'source', 'collection_date', 'rows'])
+        return parts.groupby(['source', 'collection_date'])['rows'].agg(['count', 'sum']).rename(
+            columns={'count': 'parts', 'sum': 'rows'})
+
+
+def _current_master():
+    """The MasterStore if it was written after the stat_master_salaries table
+    (or there is no table), else None."""
+    store = MasterStore()
+    if not store.exists():
+        return None
+    try:
+        _, path = find_table('stat_master_salaries')
+    except FileNotFoundError:
+        return store
+    return store if store.manifest_path.stat().st_mtime >= path.stat().st_mtime else None
+
+
+def load_master(columns=None) -> pd.DataFrame:
+    """Load the master dataset: the partitioned store or the stat_master_salaries
+    table (Parquet or CSV, see storage.py), whichever was written last."""
+    store = _current_master()
+    if store is not None:
+        return store.read(columns)
+    return read_table('stat_master_salaries', columns)
+
+
+def master_version() -> str:
+    """Version stamp of the dataset load_master() returns (store manifest or table content)."""
+    store = _current_master()
+    if store is not None:
+        return f"store:{store.version}"
+    fmt, path = find_table('stat_master_salaries')
+    return f"{fmt}:{file_digest(path)[:16]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Manage the incremental master salary store')
+    parser.add_argument('command', choices=['import', 'info', 'compact', 'export', 'sketch'])
+    parser.add_argument('--csv', help='Master CSV to import from (default: the stat_master_salaries '
+                                      f'table, Parquet or CSV) / export to (default: {MASTER_CSV})')
+    parser.add_argument('--accuracy', type=float, default=DEFAULT_ACCURACY,
+                        help='Relative error of the percentile sketches (sketch command)')
+    args = parser.parse_args()
+
+    store = MasterStore()
+
+    if args.command == 'import':
+        if args.csv:
+            df, origin = pd.read_csv(args.csv), args.csv
+        else:
+            df, origin = read_table('stat_master_salaries'), find_table('stat_master_salaries')[1]
+        written = store.append(df)
+        print(f"📥 Imported {written} of {len(df)} records from {origin} → {store.root}")
+
+    elif args.command == 'info':
+        if not store.exists():
+            print(f"❌ No store at {store.root} (run: master_store.py import)")
+            return 1
+        print(store.info().to_string())
+        retired = sum(len(v) for v in store.manifest['retired'].values())
+        print(f"\nRetired records pending compaction: {retired}")
+
+    elif args.command == 'compact':
+        removed = store.compact()
+        print(f"🗜️  Compacted store: {removed} part files merged away, "
+              f"{len(store.manifest['parts'])} remaining")
+
+    elif args.command == 'sketch':
+        sketches = store.build_sketches(args.accuracy)
+        print(f"📐 Built {len(sketches.partitions)} partition sketches "
+              f"(±{args.accuracy:.1%}) → {store.sketch_path}")
+
+    elif args.command == 'export':
+        csv_path = args.csv or MASTER_CSV
+        df = store.read()
+        df.to_csv(csv_path, index=False)
+        print(f"💾 Exported {len(df)} records → {csv_path}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
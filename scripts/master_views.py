@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Materialized views of the master dataset for the chart scripts.
+
+Charts used to re-group the raw master on every run (per-city means,
+per-level stats, Montreal companies...), and the salary distribution chart
+read a pre-baked city_salary_stats.csv that nothing in the pipeline wrote.
+Each aggregate is now a View: a small table derived from the master,
+stored in data/real_data/views/ and stamped with the master_version() it
+was built from (plus a hash of its definition) in views/manifest.json.
+
+    views = MasterViews()
+    city_stats = views.get('city_salary_stats')   # refreshed first if stale
+
+refresh() rebuilds only the views whose stamp no longer matches, reading
+just the master columns those views need; a chart run against an
+unchanged master reads a few tiny tables and no raw records. Medians and
+quantiles do not merge across master parts, so a stale view is recomputed
+whole, from its columns, rather than patched.
+
+    python scripts/master_views.py refresh [--force]
+    python scripts/master_views.py info
+"""
+
+import argparse
+import hashlib
+import inspect
+import json
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from master_store import load_master, master_version
+from storage import DATA_DIR, find_table, read_table, write_table
+
+VIEW_DIR = DATA_DIR / 'views'
+MANIFEST = 'manifest.json'
+QUANTILES = (0.10, 0.25, 0.50, 0.75, 0.90)
+
+
+def city_salary_stats(df):
+    """min / avg / max salary per city (all countries)."""
+    stats = df.groupby('city', observed=True)['salary_median'].agg(['count', 'min', 'mean', 'max']).reset_index()
+    stats.columns = ['city', 'count', 'min_salary', 'avg_salary', 'max_salary']
+    return stats
+
+
+def canada_city_stats(df):
+    """Mean salary and record count per Canadian city."""
+    canada = df[df['country'] == 'Canada']
+    return canada.groupby('city', observed=True)['salary_median'].agg(['mean', 'count']).reset_index()
+
+
+def exp_level_stats(df):
+    """Mean, median and count of salaries per experience level."""
+    stats = df.groupby('exp_level')['salary_median'].agg(['mean', 'median', 'count']).reset_index()
+    return stats.dropna()
+
+
+def salary_quantiles(df):
+    """Salary quantiles over the whole master, one row per q in QUANTILES."""
+    salary = df['salary_median'].dropna()
+    return pd.DataFrame({'q': list(QUANTILES), 'value': salary.quantile(list(QUANTILES)).tolist()})
+
+
+def totals(df):
+    """Record count and number of Canadian cities."""
+    cities = df.loc[df['country'] == 'Canada', 'city'].nunique()
+    return pd.DataFrame({'count': [len(df)], 'cities': [cities]})
+
+
+def montreal_company_stats(df):
+    """min / avg / max salary per Montreal company, by ascending average."""
+    montreal = df[(df['city'] == 'Montreal') & (df['company'] != 'Glassdoor Submission')]
+    stats = montreal.groupby('company')['salary_median'].agg(['min', 'mean', 'max', 'count']).reset_index()
+    stats.columns = ['company', 'min_salary', 'avg_salary', 'max_salary', 'count']
+    return stats.sort_values('avg_salary', ascending=True)
+
+
+def montreal_exp_level_stats(df):
+    """Records, salary count / sum / min / max per Montreal experience level.
+
+    Sums and counts rather than means, so levels can be combined exactly
+    (see combine_levels).
+    """
+    montreal = df[df['city'] == 'Montreal']
+    stats = montreal.groupby('exp_level')['salary_median'].agg(['size', 'count', 'sum', 'min', 'max']).reset_index()
+    stats.columns = ['exp_level', 'records', 'count', 'total', 'min_salary', 'max_salary']
+    return stats
+
+
+def combine_levels(level_stats, levels):
+    """min / avg / max salary and record count over several rows of montreal_exp_level_stats."""
+    rows = level_stats[level_stats['exp_level'].isin(levels)]
+    count = rows['count'].sum()
+    return {
+        'min_salary': rows['min_salary'].min(),
+        'avg_salary': rows['total'].sum() / count if count else float('nan'),
+        'max_salary': rows['max_salary'].max(),
+        'records': int(rows['records'].sum()),
+    }
+
+
+class View:
+    """A table derived from the master: its builder and the master columns it reads."""
+
+    def __init__(self, name, build, columns):
+        self.name = name
+        self.build = build
+        self.columns = list(columns)
+
+    @property
+    def definition(self) -> str:
+        """Hash of the builder's source, so editing a view rebuilds it."""
+        return hashlib.sha256(inspect.getsource(self.build).encode()).hexdigest()[:12]
+
+
+VIEWS = [
+    View('city_salary_stats', city_salary_stats, ['city', 'salary_median']),
+    View('canada_city_stats', canada_city_stats, ['country', 'city', 'salary_median']),
+    View('exp_level_stats', exp_level_stats, ['exp_level', 'salary_median']),
+    View('salary_quantiles', salary_quantiles, ['salary_median']),
+    View('totals', totals, ['country', 'city']),
+    View('montreal_company_stats', montreal_company_stats, ['city', 'company', 'salary_median']),
+    View('montreal_exp_level_stats', montreal_exp_level_stats, ['city', 'exp_level', 'salary_median']),
+]
+
+
+class MasterViews:
+    """The stored views, refreshed against the current master version."""
+
+    def __init__(self, root=VIEW_DIR, views=VIEWS):
+        self.root = Path(root)
+        self.views = {view.name: view for view in views}
+        self.manifest_path = self.root / MANIFEST
+        self.manifest = self._load_manifest()
+        self._version = None
+
+    def _load_manifest(self) -> dict:
+        try:
+            return json.loads(self.manifest_path.read_text())
+        except (OSError, ValueError):
+            return {'views': {}}
+
+    def _save_manifest(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.manifest_path.with_name(f'.{MANIFEST}.{os.getpid()}.tmp')
+        tmp.write_text(json.dumps(self.manifest, indent=1, sort_keys=True))
+        os.replace(tmp, self.manifest_path)
+
+    @property
+    def master_version(self) -> str:
+        """The master's version stamp, read once per MasterViews."""
+        if self._version is None:
+            self._version = master_version()
+        return self._version
+
+    def stamp(self, name) -> dict:
+        return {'master': self.master_version, 'definition': self.views[name].definition}
+
+    def is_fresh(self, name) -> bool:
+        entry = self.manifest['views'].get(name)
+        if entry is None or {k: entry.get(k) for k in ('master', 'definition')} != self.stamp(name):
+            return False
+        try:
+            find_table(name, self.root)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def refresh(self, names=None, force=False) -> list:
+        """Rebuild the stale views among `names` (all by default); returns the names rebuilt.
+
+        The master is read once, limited to the columns the rebuilt views need.
+        """
+        names = list(names or self.views)
+        todo = names if force else [name for name in names if not self.is_fresh(name)]
+        if not todo:
+            return []
+        columns = sorted({column for name in todo for column in self.views[name].columns})
+        df = load_master(columns)
+        for name in todo:
+            table = self.views[name].build(df)
+            write_table(table, name, data_dir=self.root)
+            self.manifest['views'][name] = dict(self.stamp(name), rows=len(table))
+        self._save_manifest()
+        return todo
+
+    def get(self, name) -> pd.DataFrame:
+        """A view's table, rebuilt first if the master changed since it was stored."""
+        if not self.is_fresh(name):
+            self.refresh([name])
+        return read_table(name, data_dir=self.root)
+
+    def info(self) -> pd.DataFrame:
+        rows = []
+        for name in self.views:
+            entry = self.manifest['views'].get(name, {})
+            rows.append({'view': name, 'rows': entry.get('rows'), 'master': entry.get('master'),
+                         'fresh': self.is_fresh(name)})
+        return pd.DataFrame(rows).set_index('view')
+
+
+class FrameViews:
+    """The same views computed from an in-memory master frame (nothing stored)."""
+
+    def __init__(self, df, views=VIEWS):
+        self.df = df
+        self.views = {view.name: view for view in views}
+        self._tables = {}
+
+    def get(self, name) -> pd.DataFrame:
+        if name not in self._tables:
+            self._tables[name] = self.views[name].build(self.df)
+        return self._tables[name]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Refresh the precomputed master views used by the charts')
+    parser.add_argument('command', choices=['refresh', 'info'])
+    parser.add_argument('views', nargs='*', help='Views to refresh (default: all)')
+    parser.add_argument('--force', action='store_true', help='Rebuild even views that are up to date')
+    args = parser.parse_args()
+
+    views = MasterViews()
+    unknown = [name for name in args.views if name not in views.views]
+    if unknown:
+        print(f"❌ Unknown view(s): {', '.join(unknown)} (available: {', '.join(views.views)})")
+        return 1
+
+    if args.command == 'refresh':
+        rebuilt = views.refresh(args.views, force=args.force)
+        if rebuilt:
+            print(f"🔄 Rebuilt {len(rebuilt)} view(s) for master {views.master_version}: {', '.join(rebuilt)}")
+        else:
+            print(f"⏭️  Views up to date for master {views.master_version}")
+        # The manifest is the pipeline stage's output: touch it even when nothing changed
+        views._save_manifest()
+
+    elif args.command == 'info':
+        print(f"Master version: {views.master_version}\n")
+        print(views.info().to_string())
+
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -1,96 +1,123 @@
 #!/usr/bin/env python3
 """
 Merge new Levels.fyi data (53 records) with existing master dataset.
-Updates stat_master_salaries.csv with complete data.
+Updates the stat_master_salaries table (or the master store, --incremental) with complete data.
 """
 
+import argparse
+import numpy as np
 import pandas as pd
-from datetime import datetime
+
+from master_schema import City, Column, Const, Country, Experience, apply_schema, today
+from master_store import MasterStore, load_master
+from storage import add_storage_args, read_table, write_table
+
+LEVELSFYI_TO_MASTER = {
+    'source': Const('Levels.fyi'),
+    'collection_date': Const(today),
+    'location': Column('location', strip=True),
+    'job_title': Const('ML / AI Engineer'),
+    'exp_years_min': Experience('years_total', 'min'),
+    'exp_years_max': Experience('years_total', 'max'),
+    # Total compensation stands in for the whole range
+    'salary_min': Column('total_compensation_cad', default=0),
+    'salary_max': Column('total_compensation_cad', default=0),
+    'salary_median': Column('total_compensation_cad', default=0),
+    'company': Column('company'),
+    'level': Column('level', default='Not Specified', missing=('-',)),
+    'country': Country('location'),
+    'city': City('location'),
+    'exp_level': Experience('years_total', 'level'),
+}
 
 def standardize_levelsfyi_to_master(df_levelsfyi):
     """Convert Levels.fyi format to master dataset format"""
+    return apply_schema(df_levelsfyi, LEVELSFYI_TO_MASTER)
+
+def find_duplicate_pairs(df_master, df_new, window=5000):
+    """Find (new, existing) record pairs with same company and city and
+    salary_median less than `window` apart.
+    
+    Sort-merge interval join instead of a per-row scan of the master:
+    (company, city) keys are mapped to integer codes, the master is sorted
+    by (code, salary) and both folded into one monotonic key, so each new
+    record's salary window is located with two binary searches.
+    
+    Returns a DataFrame of new_index, master_index, salary_distance.
+    """
+    cols = ['company', 'city', 'salary_median']
+    master = df_master[cols].dropna()
+    new = df_new[cols].dropna()
+    if len(master) == 0 or len(new) == 0:
+        return pd.DataFrame({'new_index': [], 'master_index': [], 'salary_distance': []})
+    
+    keys = pd.concat([master[['company', 'city']], new[['company', 'city']]], ignore_index=True)
+    codes = keys.groupby(['company', 'city'], sort=False).ngroup().to_numpy()
+    m_code, n_code = codes[:len(master)], codes[len(master):]
+    m_sal = master['salary_median'].to_numpy(dtype=float)
+    n_sal = new['salary_median'].to_numpy(dtype=float)
+    
+    # Fold (code, salary) into one sorted key; the stride keeps windows of
+    # different keys from overlapping
+    low = min(m_sal.min(), n_sal.min())
+    stride = np.ceil(max(m_sal.max(), n_sal.max()) - low + 2 * window + 2)
+    order = np.lexsort((m_sal, m_code))
+    m_key = m_code[order] * stride + (m_sal[order] - low)
+    n_key = n_code * stride + (n_sal - low)
     
-    records = []
-    for _, row in df_levelsfyi.iterrows():
-        # Parse location to extract city and country
-        location = row['location'].strip()
-        if ',' in location:
-            parts = location.split(',')
-            city = parts[0].strip()
-            country = 'Canada' if 'Canada' in location else 'USA'
-        else:
-            city = location
-            country = 'Canada'
-        
-        # Calculate experience level
-        years = row['years_total'] if pd.notna(row['years_total']) else 0
-        if years <= 3:
-            exp_level = '0-3 years'
-            exp_min, exp_max = 0, 3
-        elif years <= 6:
-            exp_level = '4-6 years'
-            exp_min, exp_max = 4, 6
-        elif years <= 9:
-            exp_level = '7-9 years'
-            exp_min, exp_max = 7, 9
-        elif years <= 12:
-            exp_level = '10-12 years'
-            exp_min, exp_max = 10, 12
-        else:
-            exp_level = '13+ years'
-            exp_min, exp_max = 13, 20
-        
-        # Get salary - use total compensation as median
-        salary = row['total_compensation_cad'] if pd.notna(row['total_compensation_cad']) else 0
-        
-        record = {
-            'source': 'Levels.fyi',
-            'collection_date': datetime.now().strftime('%Y-%m-%d'),
-            'location': location,
-            'job_title': 'ML / AI Engineer',
-            'exp_years_min': exp_min,
-            'exp_years_max': exp_max,
-            'salary_min': salary,
-            'salary_max': salary,
-            'salary_median': salary,
-            'company': row['company'],
-            'level': row['level'] if pd.notna(row['level']) and row['level'] != '-' else 'Not Specified',
-            'country': country,
-            'city': city,
-            'exp_level': exp_level
-        }
-        records.append(record)
-    
-    return pd.DataFrame(records)
+    # Search a slightly wider window, then filter on the exact distance
+    start = np.searchsorted(m_key, n_key - window - 1, side='left')
+    end = np.searchsorted(m_key, n_key + window + 1, side='right')
+    counts = end - start
+    
+    new_pos = np.repeat(np.arange(len(new)), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    master_pos = order[np.repeat(start, counts) + offsets]
+    distance = np.abs(m_sal[master_pos] - n_sal[new_pos])
+    keep = (distance < window) & (m_code[master_pos] == n_code[new_pos])
+    
+    return pd.DataFrame({
+        'new_index': new.index.to_numpy()[new_pos[keep]],
+        'master_index': master.index.to_numpy()[master_pos[keep]],
+        'salary_distance': distance[keep]
+    })
 
-def check_duplicates(df_master, df_new):
+def check_duplicates(df_master, df_new, window=5000):
     """Check for potential duplicate records"""
-    duplicates = []
+    pairs = find_duplicate_pairs(df_master, df_new, window)
+    per_record = pairs.groupby('new_index', sort=False)['salary_distance'].agg(['size', 'min'])
     
-    for idx, new_row in df_new.iterrows():
-        # Check if a similar record exists (same company, city, similar salary)
-        potential_dups = df_master[
-            (df_master['company'] == new_row['company']) &
-            (df_master['city'] == new_row['city']) &
-            (abs(df_master['salary_median'] - new_row['salary_median']) < 5000)
-        ]
-        
-        if len(potential_dups) > 0:
-            duplicates.append({
-                'new_record': f"{new_row['company']} - {new_row['city']} - ${new_row['salary_median']:,.0f}",
-                'existing_count': len(potential_dups)
-            })
+    duplicates = []
+    for idx, (count, min_distance) in per_record.iterrows():
+        new_row = df_new.loc[idx]
+        duplicates.append({
+            'new_record': f"{new_row['company']} - {new_row['city']} - ${new_row['salary_median']:,.0f}",
+            'existing_count': int(count),
+            'min_distance': min_distance
+        })
     
     return duplicates
 
 def main():
+    parser = argparse.ArgumentParser(description='Merge Levels.fyi records into the master dataset')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Append only new records to the partitioned master store '
+                             'instead of rewriting stat_master_salaries')
+    add_storage_args(parser)
+    args = parser.parse_args()
+    
     print("=" * 80)
     print("📊 MERGING DATASETS")
     print("=" * 80)
     
+    store = MasterStore()
+    if args.incremental and not store.exists():
+        print("\n📥 Seeding master store from stat_master_salaries...")
+        print(f"   ✓ Imported {store.append(read_table('stat_master_salaries'))} records → {store.root}")
+    
     # Load existing master dataset
     print("\n📂 Loading existing master dataset...")
-    df_master = pd.read_csv('data/real_data/stat_master_salaries.csv')
+    df_master = load_master()
     print(f"   ✓ Loaded {len(df_master)} existing records")
     print(f"   ✓ Sources: {df_master['source'].value_counts().to_dict()}")
     
@@ -110,7 +137,7 @@ def main():
     if duplicates:
         print(f"   ⚠️  Found {len(duplicates)} potential duplicates:")
         for dup in duplicates[:5]:  # Show first 5
-            print(f"      - {dup['new_record']}")
+            print(f"      - {dup['new_record']} ({dup['existing_count']} existing, closest ${dup['min_distance']:,.0f} away)")
     else:
         print("   ✓ No duplicates found")
     
@@ -131,9 +158,12 @@ def main():
     
     # Save updated master dataset
     print("\n💾 Saving updated master dataset...")
-    output_path = 'data/real_data/stat_master_salaries.csv'
-    df_merged.to_csv(output_path, index=False)
-    print(f"   ✓ Saved to: {output_path}")
+    if args.incremental:
+        written, retired = store.replace_source(df_new, 'Levels.fyi')
+        print(f"   ✓ Appended {written} new records, retired {retired} → {store.root}")
+    else:
+        for path in write_table(df_merged, 'stat_master_salaries', args.format, args.csv_export):
+            print(f"   ✓ Saved to: {path}")
     
     # Show statistics
     print("\n📈 UPDATED STATISTICS:")
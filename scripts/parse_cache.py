@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+On-disk parse cache for saved HTML snapshots.
+
+Extracted records are stored as pickled row batches keyed by
+sha256(file content) + extractor name + extractor version, so:
+- an unchanged page is never re-parsed (a renamed copy is still a hit)
+- bumping an extractor's version invalidates only that extractor's entries
+- the cache is bounded in size, evicting least recently used entries
+
+Usage in an extractor:
+
+    cache = cache_from_args(args)
+    records = cache.load_or_parse(html_path, 'glassdoor_submissions:1',
+                                  extract_submissions_from_html)
+    ...
+    print(cache.summary())
+"""
+
+import hashlib
+import os
+import pickle
+from pathlib import Path
+
+DEFAULT_CACHE_DIR = 'data/.parse_cache'
+DEFAULT_MAX_MB = 512
+
+
+def file_digest(path, chunk_size: int = 1 << 20) -> str:
+    """sha256 of the file content, read in chunks."""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class ParseCache:
+    """Content-addressed cache of extractor results with LRU eviction by size."""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_mb: float = DEFAULT_MAX_MB,
+                 enabled: bool = True, rebuild: bool = False):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.enabled = enabled
+        self.rebuild = rebuild
+        self.hits = 0
+        self.misses = 0
+        self._size = None  # bytes on disk, computed on first store()
+        if self.enabled:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _entry_path(self, html_path, extractor: str) -> Path:
+        key = hashlib.sha256(f"{file_digest(html_path)}|{extractor}".encode()).hexdigest()
+        return self.cache_dir / f"{key}.pkl"
+
+    def lookup(self, html_path, extractor: str):
+        """Return (entry, cached value or None). Pass entry back to store() on a miss."""
+        if not self.enabled:
+            self.misses += 1
+            return None, None
+        entry = self._entry_path(html_path, extractor)
+        if not self.rebuild:
+            try:
+                with open(entry, 'rb') as f:
+                    value = pickle.load(f)
+                os.utime(entry)  # mark as recently used
+                self.hits += 1
+                return entry, value
+            except (OSError, pickle.UnpicklingError, EOFError):
+                pass
+        self.misses += 1
+        return entry, None
+
+    def store(self, entry: Path, value):
+        if entry is None:
+            return
+        tmp = entry.with_suffix(f'.tmp{os.getpid()}')
+        with open(tmp, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, entry)
+        if self._size is None:
+            self._size = sum(e.stat().st_size for e in self.cache_dir.glob('*.pkl'))
+        else:
+            self._size += entry.stat().st_size
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def load_or_parse(self, html_path, extractor: str, parse_fn):
+        """Return the cached result, or run parse_fn(html_path) and cache it."""
+        entry, value = self.lookup(html_path, extractor)
+        if value is None:
+            value = parse_fn(html_path)
+            self.store(entry, value)
+        return value
+
+    def evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes."""
+        entries = []
+        for entry in self.cache_dir.glob('*.pkl'):
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            entry.unlink(missing_ok=True)
+            total -= size
+        self._size = total
+
+    def summary(self) -> str:
+        if not self.enabled:
+            return "Parse cache: disabled"
+        return f"Parse cache: {self.hits} hits, {self.misses} misses ({self.cache_dir})"
+
+
+def add_cache_args(parser):
+    """Add the standard --no-cache / --rebuild-cache / --cache-dir switches."""
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Parse every file, without reading or writing the parse cache')
+    parser.add_argument('--rebuild-cache', action='store_true',
+                        help='Ignore cached results, re-parse and overwrite the cache')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                        help='Parse cache directory')
+    parser.add_argument('--cache-max-mb', type=float, default=DEFAULT_MAX_MB,
+                        help='Evict least recently used entries above this size')
+    return parser
+
+
+def cache_from_args(args) -> ParseCache:
+    return ParseCache(args.cache_dir, args.cache_max_mb,
+                      enabled=not args.no_cache, rebuild=args.rebuild_cache)
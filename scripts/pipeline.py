@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""
+Rebuild the dashboard data, charts and PDFs in dependency order.
+
+Every stage declares the files it reads and the files it writes (glob
+patterns relative to the repository root). A stage that reads a pattern
+another stage writes runs after it; stages with no path between them run in
+parallel. A stage is skipped when its outputs exist and none of its inputs
+(its own script included) changed since its last successful run, compared
+by size and mtime, or by content with --check hash. Run state is kept in
+data/.pipeline_state.json, stage logs in data/.pipeline_logs/.
+
+Usage:
+    python scripts/pipeline.py                    # rebuild what is out of date
+    python scripts/pipeline.py charts montreal_companies
+    python scripts/pipeline.py --dry-run          # show what would run
+    python scripts/pipeline.py --check hash       # touched-but-unchanged files don't count
+    python scripts/pipeline.py --force --jobs 4
+    python scripts/pipeline.py --list
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, List
+
+from parse_cache import file_digest
+
+ROOT = Path(__file__).resolve().parent.parent
+STATE_FILE = 'data/.pipeline_state.json'
+LOG_DIR = 'data/.pipeline_logs'
+
+# Shared paths: a stage depends on the stages that write one of its inputs
+GLASSDOOR_PAGES = 'data/glassdoor_pages/*.html'
+LEVELSFYI_PAGES = 'data/levels.fyi_pages/*.html'
+SUBMISSIONS = 'data/real_data/stat_real_data_submissions_all.csv'
+LEVELSFYI_RECORDS = 'data/real_data/levelsfyi_67_complete.csv'
+MASTER = 'data/real_data/stat_master_salaries.*'
+MASTER_STORE = 'data/real_data/master/**/*'
+VIEWS = 'data/real_data/views/manifest.json'
+HANDOUT = 'outputs/handout'
+
+
+class Stage:
+    """One script run: the files it reads and the files it writes."""
+
+    def __init__(self, name: str, script: str, inputs=(), outputs=(), args=()):
+        self.name = name
+        self.script = script
+        self.args = list(args)
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.deps = set()
+
+    @property
+    def command(self) -> List[str]:
+        return [self.script] + self.args
+
+    @property
+    def sources(self) -> List[str]:
+        """Input patterns, the stage's own script included."""
+        return self.inputs + [self.script]
+
+
+STAGES = [
+    Stage('glassdoor_pages', 'scripts/scrapers/process_all_glassdoor_pages.py',
+          inputs=[GLASSDOOR_PAGES],
+          outputs=['data/real_data/stat_real_data_all_companies.csv',
+                   'data/real_data/stat_real_data_location_stats.csv'],
+          args=['--consolidated']),
+    Stage('glassdoor_submissions', 'scripts/scrapers/extract_glassdoor_submissions.py',
+          inputs=[GLASSDOOR_PAGES],
+          outputs=[SUBMISSIONS],
+          args=['--html-dir', 'data/glassdoor_pages']),
+    Stage('levelsfyi', 'scripts/extract_all_levelsfyi.py',
+          inputs=[LEVELSFYI_PAGES],
+          outputs=[LEVELSFYI_RECORDS]),
+    Stage('consolidate', 'scripts/consolidate_all_data.py',
+          inputs=[SUBMISSIONS],
+          outputs=[MASTER] + [f'data/real_data/stat_agg_{name}.*' for name in
+                              ('city', 'experience', 'source', 'country', 'city_experience')]),
+    Stage('aggregate', 'scripts/aggregate_salary_data.py',
+          inputs=[SUBMISSIONS],
+          outputs=['data/real_data/stat_agg_by_city.csv',
+                   'data/real_data/stat_agg_by_experience.csv',
+                   'data/real_data/stat_matrix_city_experience.csv',
+                   'data/real_data/stat_top_employers.csv']),
+    # Reads the master written by consolidate and rewrites it with Levels.fyi merged in
+    Stage('merge', 'scripts/merge_datasets.py',
+          inputs=[MASTER, LEVELSFYI_RECORDS],
+          outputs=[MASTER]),
+    # Aggregates the charts read (master_views.py), rebuilt when the master changes
+    Stage('views', 'scripts/master_views.py',
+          inputs=[MASTER, MASTER_STORE],
+          outputs=[VIEWS],
+          args=['refresh']),
+    Stage('charts', 'scripts/generate_benchmark_charts.py',
+          inputs=[MASTER, MASTER_STORE, VIEWS],
+          outputs=[f'{HANDOUT}/{name}.html' for name in
+                   ('kpis', 'geo', 'vis3_salary_distribution', 'exp_progression', 'salary_vs_exp',
+                    'percentiles', 'total_comp', 'role_evolution', 'position_progression')]),
+    Stage('montreal_companies', 'scripts/generate_montreal_companies.py',
+          inputs=[VIEWS],
+          outputs=[f'{HANDOUT}/montreal_companies.html']),
+    Stage('montreal_2_3_years', 'scripts/generate_montreal_2_3_years.py',
+          inputs=[VIEWS],
+          outputs=[f'{HANDOUT}/montreal_2_3_years.html']),
+    Stage('career_progression', 'scripts/generate_career_progression.py',
+          outputs=[f'{HANDOUT}/career_progression.html']),
+    Stage('demand_growth', 'scripts/generate_demand_growth.py',
+          outputs=[f'{HANDOUT}/demand_growth.html']),
+    Stage('negotiation_pdf', 'scripts/generators/generate_negotiation_pdf.py',
+          outputs=['negotiation.pdf']),
+    Stage('negotiation_soft_pdf', 'scripts/generators/generate_negotiation_pdf_fr_soft.py',
+          outputs=['negotiation_soft.pdf']),
+]
+
+
+def build_graph(stages: List[Stage]) -> Dict[str, Stage]:
+    """Stages by name in dependency order, with deps filled in from inputs/outputs."""
+    writers = {}
+    for stage in stages:
+        for pattern in stage.outputs:
+            writers.setdefault(pattern, []).append(stage.name)
+    by_name = {stage.name: stage for stage in stages}
+    for stage in stages:
+        stage.deps = {writer for pattern in stage.inputs
+                      for writer in writers.get(pattern, []) if writer != stage.name}
+
+    ordered, visiting = {}, set()
+
+    def visit(name):
+        if name in ordered:
+            return
+        if name in visiting:
+            raise ValueError(f"Dependency cycle through stage '{name}'")
+        visiting.add(name)
+        for dep in sorted(by_name[name].deps):
+            visit(dep)
+        visiting.discard(name)
+        ordered[name] = by_name[name]
+
+    for stage in stages:
+        visit(stage.name)
+    return ordered
+
+
+def with_upstream(graph: Dict[str, Stage], names) -> List[str]:
+    """`names` plus every stage they (transitively) depend on, in graph order."""
+    wanted, todo = set(), list(names)
+    while todo:
+        name = todo.pop()
+        if name not in wanted:
+            wanted.add(name)
+            todo.extend(graph[name].deps)
+    return [name for name in graph if name in wanted]
+
+
+def expand(pattern: str) -> List[Path]:
+    return sorted(path for path in ROOT.glob(pattern) if path.is_file())
+
+
+def file_signature(path: Path, check: str, previous: dict = None) -> dict:
+    """Size and mtime; sha256 too with check='hash' (reused while size and mtime hold)."""
+    stat = path.stat()
+    signature = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+    unchanged = previous is not None and all(previous.get(k) == v for k, v in signature.items())
+    if unchanged and 'sha256' in previous:
+        signature['sha256'] = previous['sha256']
+    elif check == 'hash':
+        signature['sha256'] = file_digest(path)
+    return signature
+
+
+def same_file(a: dict, b: dict, check: str) -> bool:
+    if a is None or b is None:
+        return False
+    if check == 'hash' and 'sha256' in a and 'sha256' in b:
+        return a['sha256'] == b['sha256']
+    return a['size'] == b['size'] and a['mtime_ns'] == b['mtime_ns']
+
+
+def input_signatures(patterns, check: str, previous: dict) -> dict:
+    signatures = {}
+    for pattern in patterns:
+        for path in expand(pattern):
+            key = str(path.relative_to(ROOT))
+            signatures[key] = file_signature(path, check, previous.get(key))
+    return signatures
+
+
+def stale_reason(stage: Stage, record: dict, current: dict, check: str):
+    """Why `stage` must run, or None when it is up to date."""
+    if not record:
+        return 'never run'
+    if record.get('command') != stage.command:
+        return 'command changed'
+    missing = [pattern for pattern in stage.outputs if not expand(pattern)]
+    if missing:
+        return f'missing {missing[0]}'
+    previous = record.get('inputs', {})
+    for key, signature in current.items():
+        if not same_file(signature, previous.get(key), check):
+            return f'{key} changed' if key in previous else f'{key} added'
+    for key in previous:
+        if key not in current:
+            return f'{key} removed'
+    return None
+
+
+def run_stage(stage: Stage) -> tuple:
+    """Run the stage's script from the repository root; (exit code, seconds)."""
+    log_path = ROOT / LOG_DIR / f'{stage.name}.log'
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    env = dict(os.environ, PYTHONUNBUFFERED='1')
+    start = time.perf_counter()
+    with open(log_path, 'w', encoding='utf-8') as log:
+        code = subprocess.call([sys.executable] + stage.command, cwd=ROOT, env=env,
+                               stdout=log, stderr=subprocess.STDOUT)
+    return code, time.perf_counter() - start
+
+
+def tail(path: Path, lines: int = 15) -> str:
+    try:
+        with open(path, encoding='utf-8', errors='replace') as f:
+            return ''.join(f.readlines()[-lines:])
+    except OSError:
+        return ''
+
+
+class Pipeline:
+    """Runs the selected stages, each once its dependencies are done."""
+
+    def __init__(self, graph: Dict[str, Stage], selected: List[str], check: str = 'mtime',
+                 force: bool = False, dry_run: bool = False, jobs: int = 1):
+        self.graph = graph
+        self.selected = selected
+        self.check = check
+        self.force = force
+        self.dry_run = dry_run
+        self.jobs = max(1, jobs)
+        self.state_path = ROOT / STATE_FILE
+        self.state = self._load_state()
+        self.status = {}
+        self.seconds = {}
+        self.reasons = {}
+
+    def _load_state(self) -> dict:
+        try:
+            with open(self.state_path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_state(self):
+        if self.dry_run:
+            return
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_path.with_suffix('.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.state_path)
+
+    def _record(self, stage: Stage, signatures: dict):
+        self.state[stage.name] = {'command': stage.command, 'inputs': signatures,
+                                  'finished': time.strftime('%Y-%m-%d %H:%M:%S')}
+        self._save_state()
+
+    def _signatures(self, stage: Stage) -> dict:
+        previous = self.state.get(stage.name, {}).get('inputs', {})
+        return input_signatures(stage.sources, self.check, previous)
+
+    def _start(self, stage: Stage, pool, running) -> bool:
+        """Settle `stage` without running it if possible; else submit it. True if submitted."""
+        failed = [dep for dep in stage.deps if self.status.get(dep) in ('failed', 'blocked')]
+        if failed:
+            self.status[stage.name] = 'blocked'
+            print(f"⛔ {stage.name}: blocked by {', '.join(sorted(failed))}")
+            return False
+
+        signatures = self._signatures(stage)
+        reason = 'forced' if self.force else stale_reason(stage, self.state.get(stage.name),
+                                                          signatures, self.check)
+        if reason is None and self.dry_run:
+            rerun = [dep for dep in stage.deps if self.status.get(dep) == 'would run']
+            reason = f'{rerun[0]} would run' if rerun else None
+
+        if reason is None:
+            self.status[stage.name] = 'up to date'
+            self._record(stage, signatures)
+            print(f"⏭️  {stage.name}: up to date")
+            return False
+
+        self.reasons[stage.name] = reason
+        if self.dry_run:
+            self.status[stage.name] = 'would run'
+            print(f"🔸 {stage.name}: would run ({reason})")
+            return False
+
+        print(f"▶️  {stage.name}: running ({reason})")
+        running[pool.submit(run_stage, stage)] = (stage, signatures)
+        return True
+
+    def _finish(self, stage: Stage, signatures: dict, code: int, seconds: float):
+        self.seconds[stage.name] = seconds
+        missing = [pattern for pattern in stage.outputs if not expand(pattern)]
+        if code != 0 or missing:
+            self.status[stage.name] = 'failed'
+            log_path = ROOT / LOG_DIR / f'{stage.name}.log'
+            problem = f"exit code {code}" if code != 0 else f"did not write {missing[0]}"
+            print(f"❌ {stage.name}: {problem} after {seconds:.1f}s (log: {log_path.relative_to(ROOT)})")
+            print('   ' + tail(log_path).rstrip().replace('\n', '\n   '))
+            return
+        self.status[stage.name] = 'ran'
+        print(f"✅ {stage.name}: {seconds:.1f}s")
+        # Inputs the stage rewrites itself (merge reads and writes the master) are
+        # recorded as it left them; the rest as they were when it started
+        own = [pattern for pattern in stage.inputs if pattern in stage.outputs]
+        signatures = {key: sig for key, sig in signatures.items()
+                      if not any(ROOT.joinpath(key).match(pattern) for pattern in own)}
+        signatures.update(input_signatures(own, self.check, {}))
+        self._record(stage, signatures)
+
+    def run(self) -> bool:
+        pending = list(self.selected)
+        running = {}
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            while pending or running:
+                progress = True
+                while progress:
+                    progress = False
+                    for name in list(pending):
+                        if len(running) >= self.jobs:
+                            break
+                        stage = self.graph[name]
+                        if all(dep in self.status for dep in stage.deps if dep in self.selected):
+                            pending.remove(name)
+                            progress = True
+                            self._start(stage, pool, running)
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage, signatures = running.pop(future)
+                    code, seconds = future.result()
+                    self._finish(stage, signatures, code, seconds)
+        return all(self.status[name] not in ('failed', 'blocked') for name in self.selected)
+
+    def report(self, wall_seconds: float):
+        print("\n" + "=" * 80)
+        print("⏱️  PIPELINE REPORT")
+        print("=" * 80)
+        width = max(len(name) for name in self.selected)
+        for name in self.selected:
+            seconds = f"{self.seconds[name]:8.1f}s" if name in self.seconds else ' ' * 9
+            reason = f"  ({self.reasons[name]})" if name in self.reasons else ''
+            print(f"   {name:<{width}}  {self.status[name]:<10} {seconds}{reason}")
+        total = sum(self.seconds.values())
+        print("-" * 80)
+        print(f"   Ran {len(self.seconds)} of {len(self.selected)} stages: "
+              f"{total:.1f}s of stage time in {wall_seconds:.1f}s wall time ({self.jobs} jobs)")
+
+
+def print_stages(graph: Dict[str, Stage]):
+    for stage in graph.values():
+        after = f" (after {', '.join(sorted(stage.deps))})" if stage.deps else ''
+        print(f"{stage.name}{after}")
+        print(f"   run:    {' '.join(stage.command)}")
+        for pattern in stage.inputs:
+            print(f"   reads:  {pattern}")
+        for pattern in stage.outputs:
+            print(f"   writes: {pattern}")
+
+
+def main():
+    graph = build_graph(STAGES)
+    parser = argparse.ArgumentParser(description='Rebuild out-of-date dashboard data, charts and PDFs')
+    parser.add_argument('stages', nargs='*',
+                        help='Stages to bring up to date, with everything they depend on (default: all)')
+    parser.add_argument('--check', choices=['mtime', 'hash'], default='mtime',
+                        help='Detect changed inputs by size and mtime, or by content hash')
+    parser.add_argument('--force', action='store_true', help='Run the selected stages even if up to date')
+    parser.add_argument('--dry-run', action='store_true', help='Only show which stages would run')
+    parser.add_argument('--jobs', '-j', type=int, default=os.cpu_count() or 1,
+                        help='Stages to run at the same time (default: CPU count)')
+    parser.add_argument('--list', action='store_true', help='List stages with their inputs and outputs')
+    args = parser.parse_args()
+
+    if args.list:
+        print_stages(graph)
+        return 0
+
+    unknown = [name for name in args.stages if name not in graph]
+    if unknown:
+        print(f"❌ Unknown stage(s): {', '.join(unknown)}. Known: {', '.join(graph)}")
+        return 1
+
+    selected = with_upstream(graph, args.stages or list(graph))
+    pipeline = Pipeline(graph, selected, check=args.check, force=args.force,
+                        dry_run=args.dry_run, jobs=args.jobs)
+
+    print(f"🔧 Pipeline: {len(selected)} stages, up to {pipeline.jobs} at a time, "
+          f"{args.check} check{' (dry run)' if args.dry_run else ''}\n")
+    start = time.perf_counter()
+    ok = pipeline.run()
+    pipeline.report(time.perf_counter() - start)
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -3,52 +3,107 @@
 Process scraped real data and transform it into dashboard-ready formats.
 Converts Job Bank, Glassdoor, and other sources into standardized CSVs.
 """
+import numpy as np
 import pandas as pd
 import json
 from pathlib import Path
 import re
 
+# Key provinces for the AI market: city → province key in the Job Bank wage JSON
+JOB_BANK_LOCATIONS = {
+    'Montreal': 'Quebec',
+    'Toronto': 'Ontario',
+    'Vancouver': 'British Columbia',
+    'Canada': 'Canada'
+}
+HOURS_PER_YEAR = 2000
+
+# Geo columns as multiples of the annualized median wage (estimates)
+WAGE_ESTIMATES = {
+    'min_cad': 0.8,
+    'avg_cad': 1.0,
+    'max_cad': 1.5,
+    'p25_cad': 0.85,
+    'p50_cad': 1.0,
+    'p75_cad': 1.25,
+}
+
+# Experience levels (years), multipliers of avg_cad and position labels
+EXPERIENCE_LEVELS = pd.DataFrame([
+    (0.5, 0.65, 'Intern'),
+    (1, 0.75, 'Junior'),
+    (2, 0.90, 'Entry'),
+    (3, 1.00, 'Entry'),
+    (4, 1.15, 'Mid'),
+    (5, 1.30, 'Mid'),
+    (6, 1.50, 'Senior'),
+    (8, 1.80, 'Senior'),
+    (10, 2.20, 'Lead'),
+    (12, 2.50, 'Principal')
+], columns=['years_of_experience', 'multiplier', 'position_level'])
+
+def wage_table(wage_data: pd.Series) -> pd.DataFrame:
+    """Hourly wage per province, one row per entry of `wage_data` (JSON objects).
+    
+    Each distinct JSON string is parsed once; missing provinces are NaN, and
+    so is every province of a row without wage data.
+    """
+    codes, uniques = pd.factorize(wage_data)
+    parsed = pd.DataFrame([json.loads(text) for text in uniques])
+    parsed = parsed.apply(pd.to_numeric, errors='coerce')
+    parsed = parsed.reindex(range(len(uniques) + 1))  # code -1 (missing) -> all-NaN last row
+    return parsed.take(codes).set_axis(wage_data.index)
+
+def build_geo_table(df: pd.DataFrame) -> pd.DataFrame:
+    """Job Bank rows × JOB_BANK_LOCATIONS → geo salary rows (vectorized cross-join)."""
+    jobs = df[df['source'] == 'Job Bank Canada']
+    wages = wage_table(jobs['wage_data']).reindex(columns=list(JOB_BANK_LOCATIONS.values()))
+    
+    # Row-major over (job, city) keeps the original order; drop absent provinces
+    annual = wages.to_numpy(dtype=float).ravel() * HOURS_PER_YEAR
+    present = ~np.isnan(annual)
+    job_pos = np.repeat(np.arange(len(jobs)), len(JOB_BANK_LOCATIONS))[present]
+    annual = annual[present]
+    
+    geo_df = pd.DataFrame({
+        'location': np.tile(list(JOB_BANK_LOCATIONS), len(jobs))[present],
+        'source': 'Job Bank Canada',
+        'noc_code': jobs['job_title'].to_numpy()[job_pos],
+    })
+    for column, factor in WAGE_ESTIMATES.items():
+        geo_df[column] = (annual * factor).astype('int64')
+    geo_df['currency'] = 'CAD'
+    geo_df['date'] = jobs['scraped_date'].to_numpy()[job_pos]
+    return geo_df
+
+def build_experience_table(base_geo_df: pd.DataFrame) -> pd.DataFrame:
+    """Geo rows × EXPERIENCE_LEVELS, salaries broadcast through the multipliers."""
+    n_levels = len(EXPERIENCE_LEVELS)
+    geo_pos = np.repeat(np.arange(len(base_geo_df)), n_levels)
+    multiplier = np.tile(EXPERIENCE_LEVELS['multiplier'].to_numpy(), len(base_geo_df))
+    base_salary = base_geo_df['avg_cad'].to_numpy(dtype=float)[geo_pos]
+    return pd.DataFrame({
+        'location': base_geo_df['location'].to_numpy()[geo_pos],
+        'years_of_experience': np.tile(EXPERIENCE_LEVELS['years_of_experience'].to_numpy(), len(base_geo_df)),
+        'position_level': np.tile(EXPERIENCE_LEVELS['position_level'].to_numpy(), len(base_geo_df)),
+        'avg_salary_cad': (base_salary * multiplier).astype('int64'),
+        'source': 'Derived from Job Bank',
+        'date': base_geo_df['date'].to_numpy()[geo_pos],
+    })
+
+def build_percentiles_table(geo_df: pd.DataFrame) -> pd.DataFrame:
+    """Percentile columns of the geo rows (min/max stand in for p10/p90)."""
+    perc_df = geo_df[['location', 'min_cad', 'p25_cad', 'p50_cad', 'p75_cad', 'max_cad',
+                      'source', 'date']]
+    return perc_df.rename(columns={'min_cad': 'p10_cad', 'max_cad': 'p90_cad'}).reset_index(drop=True)
+
 def process_job_bank_data(input_file='data/real_data/stat_real_data_scraped_jobs.csv'):
     """Transform Job Bank wage data into geo salary format"""
     print("\n📊 Processing Job Bank Canada data...")
     
     df = pd.read_csv(input_file)
+    geo_df = build_geo_table(df)
     
-    geo_data = []
-    
-    for _, row in df.iterrows():
-        if row['source'] == 'Job Bank Canada':
-            wage_dict = json.loads(row['wage_data'])
-            
-            # Extract key provinces for AI market
-            locations = {
-                'Montreal': 'Quebec',
-                'Toronto': 'Ontario',
-                'Vancouver': 'British Columbia',
-                'Canada': 'Canada'
-            }
-            
-            for city, province in locations.items():
-                if province in wage_dict:
-                    hourly = float(wage_dict[province])
-                    # Convert hourly to annual (assuming 2000 hours/year)
-                    annual = hourly * 2000
-                    
-                    geo_data.append({
-                        'location': city,
-                        'source': 'Job Bank Canada',
-                        'noc_code': row['job_title'],
-                        'min_cad': int(annual * 0.8),  # Estimate
-                        'avg_cad': int(annual),
-                        'max_cad': int(annual * 1.5),  # Estimate
-                        'p25_cad': int(annual * 0.85),
-                        'p50_cad': int(annual),
-                        'p75_cad': int(annual * 1.25),
-                        'currency': 'CAD',
-                        'date': row['scraped_date']
-                    })
-    
-    geo_df = pd.DataFrame(geo_data)
     output_path = Path('data/real_data/stat_real_data_geo.csv')
     geo_df.to_csv(output_path, index=False)
     print(f"✅ Created {output_path}")
@@ -75,37 +130,7 @@ def create_experience_data(base_geo_df):
     """Generate experience-based salary progression from base data"""
     print("\n📊 Creating experience progression data...")
     
-    exp_data = []
-    
-    # Experience levels (years) and multipliers
-    exp_levels = [
-        (0.5, 0.65, 'Intern'),
-        (1, 0.75, 'Junior'),
-        (2, 0.90, 'Entry'),
-        (3, 1.00, 'Entry'),
-        (4, 1.15, 'Mid'),
-        (5, 1.30, 'Mid'),
-        (6, 1.50, 'Senior'),
-        (8, 1.80, 'Senior'),
-        (10, 2.20, 'Lead'),
-        (12, 2.50, 'Principal')
-    ]
-    
-    for _, geo_row in base_geo_df.iterrows():
-        base_salary = geo_row['avg_cad']
-        location = geo_row['location']
-        
-        for years, multiplier, level in exp_levels:
-            exp_data.append({
-                'location': location,
-                'years_of_experience': years,
-                'position_level': level,
-                'avg_salary_cad': int(base_salary * multiplier),
-                'source': 'Derived from Job Bank',
-                'date': geo_row['date']
-            })
-    
-    exp_df = pd.DataFrame(exp_data)
+    exp_df = build_experience_table(base_geo_df)
     output_path = Path('data/real_data/stat_real_data_exp_progression.csv')
     exp_df.to_csv(output_path, index=False)
     print(f"✅ Created {output_path}")
@@ -116,21 +141,7 @@ def create_percentiles_from_geo(geo_df):
     """Create percentiles data from geographic salary data"""
     print("\n📊 Creating percentiles data...")
     
-    percentiles_data = []
-    
-    for _, row in geo_df.iterrows():
-        percentiles_data.append({
-            'location': row['location'],
-            'p10_cad': row['min_cad'],
-            'p25_cad': row['p25_cad'],
-            'p50_cad': row['p50_cad'],
-            'p75_cad': row['p75_cad'],
-            'p90_cad': row['max_cad'],
-            'source': row['source'],
-            'date': row['date']
-        })
-    
-    perc_df = pd.DataFrame(percentiles_data)
+    perc_df = build_percentiles_table(geo_df)
     output_path = Path('data/real_data/stat_real_data_percentiles.csv')
     perc_df.to_csv(output_path, index=False)
     print(f"✅ Created {output_path}")
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Mergeable quantile sketches for salary percentiles.
+
+Each (city, exp_level, source) partition of the master dataset keeps a
+small relative-error sketch (DDSketch-style log buckets) instead of its raw
+salaries:
+- any quantile comes back within ±accuracy of a true value (1% by default)
+- sketches merge by adding bucket counts, so global, per-city or per-source
+  percentiles come from the partitions without touching the records
+- records can be added and removed, so master_store keeps the sketches in
+  step with appended and retired records
+
+    sketches = SketchStore.load()
+    p = sketches.query(city='Montreal').quantile(0.75)
+
+Build or rebuild the sketches with:
+    python scripts/master_store.py sketch --accuracy 0.01
+"""
+
+import json
+import math
+from pathlib import Path
+from typing import Dict, Iterable
+
+import numpy as np
+import pandas as pd
+
+SKETCH_PATH = Path('data/real_data/master/sketches.json')  # next to the master store manifest
+PARTITION_COLUMNS = ('city', 'exp_level', 'source')
+DEFAULT_ACCURACY = 0.01
+
+
+class QuantileSketch:
+    """Relative-error quantile sketch over positive values (zeros counted apart)."""
+
+    def __init__(self, accuracy: float = DEFAULT_ACCURACY):
+        self.accuracy = accuracy
+        self.gamma = (1 + accuracy) / (1 - accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.bins: Dict[int, int] = {}
+        self.zero_count = 0
+
+    @property
+    def count(self) -> int:
+        return self.zero_count + sum(self.bins.values())
+
+    def _update(self, values, sign: int):
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        self.zero_count += sign * int((values <= 0).sum())
+        positive = values[values > 0]
+        if len(positive) == 0:
+            return
+        keys, counts = np.unique(np.ceil(np.log(positive) / self._log_gamma).astype(np.int64),
+                                 return_counts=True)
+        for key, n in zip(keys.tolist(), counts.tolist()):
+            total = self.bins.get(key, 0) + sign * n
+            if total > 0:
+                self.bins[key] = total
+            else:
+                self.bins.pop(key, None)
+
+    def add(self, values: Iterable[float]):
+        self._update(values, +1)
+
+    def remove(self, values: Iterable[float]):
+        """Remove previously added values (e.g. retired records)."""
+        self._update(values, -1)
+
+    def merge(self, other: 'QuantileSketch'):
+        if other.accuracy != self.accuracy:
+            raise ValueError("Cannot merge sketches with different accuracy")
+        for key, n in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + n
+        self.zero_count += other.zero_count
+        return self
+
+    def quantile(self, q: float) -> float:
+        """Value at quantile q, within ±accuracy (relative) of a true sample value."""
+        n = self.count
+        if n == 0:
+            return float('nan')
+        rank = q * (n - 1)
+        seen = self.zero_count
+        if seen > rank:
+            return 0.0
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if seen > rank:
+                return 2 * self.gamma ** key / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.bins) / (self.gamma + 1)
+
+    def to_dict(self) -> dict:
+        return {'zero': self.zero_count, 'bins': {str(k): v for k, v in self.bins.items()}}
+
+    @classmethod
+    def from_dict(cls, data: dict, accuracy: float) -> 'QuantileSketch':
+        sketch = cls(accuracy)
+        sketch.zero_count = data['zero']
+        sketch.bins = {int(k): v for k, v in data['bins'].items()}
+        return sketch
+
+
+def _partition_keys(df: pd.DataFrame) -> pd.Series:
+    parts = [df[c].astype(object).where(df[c].notna(), '').astype(str) if c in df.columns
+             else pd.Series('', index=df.index) for c in PARTITION_COLUMNS]
+    return parts[0].str.cat(parts[1:], sep='|')
+
+
+class SketchStore:
+    """One QuantileSketch per (city, exp_level, source) partition, saved as JSON."""
+
+    def __init__(self, path=SKETCH_PATH, accuracy: float = DEFAULT_ACCURACY):
+        self.path = Path(path)
+        self.accuracy = accuracy
+        self.partitions: Dict[str, QuantileSketch] = {}
+
+    @classmethod
+    def load(cls, path=SKETCH_PATH) -> 'SketchStore':
+        with open(path) as f:
+            data = json.load(f)
+        store = cls(path, data['accuracy'])
+        store.partitions = {key: QuantileSketch.from_dict(d, store.accuracy)
+                            for key, d in data['partitions'].items()}
+        return store
+
+    @classmethod
+    def build(cls, df: pd.DataFrame, path=SKETCH_PATH, accuracy: float = DEFAULT_ACCURACY,
+              value: str = 'salary_median') -> 'SketchStore':
+        store = cls(path, accuracy)
+        store.add(df, value)
+        return store
+
+    def _update(self, df: pd.DataFrame, value: str, sign: int):
+        if len(df) == 0:
+            return
+        for key, values in df[value].groupby(_partition_keys(df), sort=False):
+            sketch = self.partitions.setdefault(key, QuantileSketch(self.accuracy))
+            sketch._update(values.to_numpy(dtype=float, na_value=np.nan), sign)
+            if sketch.count == 0:
+                del self.partitions[key]
+
+    def add(self, df: pd.DataFrame, value: str = 'salary_median'):
+        self._update(df, value, +1)
+
+    def remove(self, df: pd.DataFrame, value: str = 'salary_median'):
+        self._update(df, value, -1)
+
+    def query(self, **filters) -> QuantileSketch:
+        """Merge the partitions matching e.g. city='Montreal', source='Glassdoor'."""
+        wanted = {PARTITION_COLUMNS.index(col): str(v) for col, v in filters.items()}
+        merged = QuantileSketch(self.accuracy)
+        for key, sketch in self.partitions.items():
+            fields = key.split('|')
+            if all(fields[i] == v for i, v in wanted.items()):
+                merged.merge(sketch)
+        return merged
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            'accuracy': self.accuracy,
+            'partition_columns': list(PARTITION_COLUMNS),
+            'partitions': {key: s.to_dict() for key, s in sorted(self.partitions.items())},
+        }
+        tmp = self.path.with_suffix('.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(data, f)
+        tmp.replace(self.path)
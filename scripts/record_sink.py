@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Streaming record sinks for the extractors.
+
+Extractors yield one dict per record; a sink buffers at most `batch_size`
+of them and appends each full batch to the output file, so an ingest never
+holds more than one batch in memory (no list of every record, no DataFrame
+copy of that list):
+- CSV (.csv): header from `columns`, or from the keys seen so far; a key
+  that first shows up after the header was written widens the file once
+- Parquet (.parquet): one row group per batch (requires pyarrow); `types`
+  pins column types a first batch may not show (e.g. a stat that is null
+  on the first pages)
+- JSON Lines (.jsonl / .ndjson): one JSON object per line
+
+    with open_sink('data/real_data/stat_real_data_submissions_all.csv', columns=cols) as sink:
+        sink.write_many(iter_submissions(html_files, date))
+    df = read_back(sink.path, ['location', 'salary_median_cad'])
+
+Nothing is written (and no file is created) until the first batch is flushed.
+"""
+
+import csv
+import json
+import os
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+class RecordSink(ABC):
+    """Buffered record writer; subclasses implement _open / _write_batch / _close."""
+
+    suffixes = ()
+
+    def __init__(self, path, columns: Optional[List[str]] = None,
+                 batch_size: int = DEFAULT_BATCH_SIZE, types: Optional[Dict[str, str]] = None):
+        self.path = Path(path)
+        self.columns = list(columns) if columns else None
+        self.types = dict(types or {})
+        self.fixed_columns = columns is not None
+        self.batch_size = max(1, batch_size)
+        self.count = 0
+        self._buffer: List[Dict] = []
+        self._opened = False
+
+    def write(self, record: Dict):
+        self._buffer.append(record)
+        self.count += 1
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def write_many(self, records: Iterable[Dict]) -> int:
+        """Consume an iterable (typically a generator) of records; returns how many."""
+        before = self.count
+        for record in records:
+            self.write(record)
+        return self.count - before
+
+    def _grow_columns(self, batch: List[Dict]) -> List[str]:
+        """Add keys not seen before to self.columns (first-seen order); returns the new ones."""
+        if self.columns is None:
+            self.columns = []
+        known = set(self.columns)
+        new = []
+        for record in batch:
+            for key in record:
+                if key not in known:
+                    known.add(key)
+                    new.append(key)
+        self.columns.extend(new)
+        return new
+
+    def flush(self):
+        if not self._buffer:
+            return
+        batch, self._buffer = self._buffer, []
+        if not self._opened:
+            if not self.fixed_columns:
+                self._grow_columns(batch)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._open(batch)
+            self._opened = True
+        self._write_batch(batch)
+
+    def close(self):
+        self.flush()
+        if self._opened:
+            self._close()
+            self._opened = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # Keep the records extracted before an error
+        self.close()
+        return False
+
+    @abstractmethod
+    def _open(self, first_batch: List[Dict]):
+        """Create the output file for the columns fixed so far."""
+
+    @abstractmethod
+    def _write_batch(self, batch: List[Dict]):
+        """Append one batch of records."""
+
+    @abstractmethod
+    def _close(self):
+        """Finish and close the output file."""
+
+
+class CsvSink(RecordSink):
+    suffixes = ('.csv',)
+
+    def _open(self, first_batch):
+        self._file = open(self.path, 'w', newline='', encoding='utf-8')
+        self._writer = csv.DictWriter(self._file, fieldnames=self.columns, extrasaction='ignore',
+                                      lineterminator='\n')
+        self._writer.writeheader()
+
+    def _write_batch(self, batch: List[Dict]):
+        if not self.fixed_columns and self._grow_columns(batch):
+            self._widen()
+        self._writer.writerows(batch)
+
+    def _widen(self):
+        """Rewrite the rows written so far under the wider header (streamed, not loaded)."""
+        self._file.close()
+        tmp = self.path.with_suffix(f'.tmp{os.getpid()}')
+        with open(self.path, newline='', encoding='utf-8') as src, \
+                open(tmp, 'w', newline='', encoding='utf-8') as dst:
+            reader = csv.reader(src)
+            writer = csv.writer(dst, lineterminator='\n')
+            width = len(next(reader))
+            writer.writerow(self.columns)
+            padding = [''] * (len(self.columns) - width)
+            for row in reader:
+                writer.writerow(row + padding)
+        os.replace(tmp, self.path)
+        self._file = open(self.path, 'a', newline='', encoding='utf-8')
+        self._writer = csv.DictWriter(self._file, fieldnames=self.columns, extrasaction='ignore',
+                                      lineterminator='\n')
+
+    def _close(self):
+        self._file.close()
+
+
+def _json_default(value):
+    # numpy scalars (e.g. records built from DataFrame rows)
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+
+class JsonLinesSink(RecordSink):
+    suffixes = ('.jsonl', '.ndjson')
+
+    def _open(self, first_batch):
+        self._file = open(self.path, 'w', encoding='utf-8')
+
+    def _write_batch(self, batch: List[Dict]):
+        lines = []
+        for record in batch:
+            if self.fixed_columns:
+                record = {c: record.get(c) for c in self.columns}
+            lines.append(json.dumps(record, ensure_ascii=False, default=_json_default))
+        self._file.write('\n'.join(lines) + '\n')
+
+    def _close(self):
+        self._file.close()
+
+
+class ParquetSink(RecordSink):
+    """One row group per batch. The schema is fixed by `columns` or the first batch:
+    integer columns are widened to float64 and all-null columns typed as string,
+    so later batches with decimals or values still fit. Columns listed in
+    `types` (name -> Arrow type alias, e.g. 'float64') take that type instead."""
+
+    suffixes = ('.parquet',)
+
+    def _open(self, first_batch):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self._pa = pa
+        sample = [{c: r.get(c) for c in self.columns} for r in first_batch]
+        fields = []
+        for field in pa.Table.from_pylist(sample).schema:
+            if field.name in self.types:
+                field = field.with_type(pa.type_for_alias(self.types[field.name]))
+            elif pa.types.is_integer(field.type):
+                field = field.with_type(pa.float64())
+            elif pa.types.is_null(field.type):
+                field = field.with_type(pa.string())
+            fields.append(field)
+        self._schema = pa.schema(fields)
+        self._writer = pq.ParquetWriter(self.path, self._schema)
+
+    def _write_batch(self, batch: List[Dict]):
+        if not self.fixed_columns:
+            new = self._grow_columns(batch)
+            if new:
+                raise ValueError(f"Columns {new} appeared after the Parquet schema was fixed; "
+                                 f"pass columns= to the sink")
+        pa = self._pa
+        try:
+            table = pa.Table.from_pylist(batch, schema=self._schema)
+        except (pa.ArrowTypeError, pa.ArrowInvalid):
+            # Values whose type differs from the first batch (e.g. numbers in a
+            # column that started all-null): infer, then cast to the file schema
+            rows = [{c: r.get(c) for c in self.columns} for r in batch]
+            table = pa.Table.from_pylist(rows).cast(self._schema, safe=False)
+        self._writer.write_table(table)
+
+    def _close(self):
+        self._writer.close()
+
+
+SINKS = [CsvSink, ParquetSink, JsonLinesSink]
+
+
+def sink_class(path) -> type:
+    suffix = Path(path).suffix.lower()
+    for cls in SINKS:
+        if suffix in cls.suffixes:
+            return cls
+    raise ValueError(f"Unsupported output format '{suffix}' (use .csv, .parquet or .jsonl)")
+
+
+def open_sink(path, columns: Optional[List[str]] = None,
+              batch_size: int = DEFAULT_BATCH_SIZE, types: Optional[Dict[str, str]] = None) -> RecordSink:
+    """Sink for `path`, format chosen by its suffix."""
+    return sink_class(path)(path, columns, batch_size, types)
+
+
+def write_records(records: Iterable[Dict], path, columns: Optional[List[str]] = None,
+                  batch_size: int = DEFAULT_BATCH_SIZE, types: Optional[Dict[str, str]] = None) -> int:
+    """Stream records into `path`; returns how many were written."""
+    with open_sink(path, columns, batch_size, types) as sink:
+        return sink.write_many(records)
+
+
+class TeeSink:
+    """Write the same records to several sinks."""
+
+    def __init__(self, *sinks: RecordSink):
+        self.sinks = sinks
+
+    @property
+    def count(self) -> int:
+        return self.sinks[0].count if self.sinks else 0
+
+    def write(self, record: Dict):
+        for sink in self.sinks:
+            sink.write(record)
+
+    def write_many(self, records: Iterable[Dict]) -> int:
+        n = 0
+        for record in records:
+            self.write(record)
+            n += 1
+        return n
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+def read_back(path, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """Load (only `columns` of) a file written by a sink, e.g. for a summary."""
+    cls = sink_class(path)
+    if cls is ParquetSink:
+        return pd.read_parquet(path, columns=columns)
+    if cls is JsonLinesSink:
+        df = pd.read_json(path, lines=True)
+        return df[[c for c in columns if c in df.columns]] if columns else df
+    if columns:
+        with open(path, newline='', encoding='utf-8') as f:
+            header = next(csv.reader(f), [])
+        columns = [c for c in columns if c in header]
+    return pd.read_csv(path, usecols=columns)
+
+
+def add_sink_args(parser):
+    """Add the standard --batch-size switch (the format follows the --out suffix)."""
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help='Records buffered before each write to the output '
+                             '(.csv, .parquet or .jsonl, chosen by the --out suffix)')
+    return parser
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Salary-string parsing shared by every extractor.
+
+One set of precompiled patterns understands the formats found in the saved
+Glassdoor / Levels.fyi pages and exports:
+- currency markers before or after the number: $, $CA, CA$, C$, CAD, USD
+- k / M multipliers, with or without a space: 86K, 875,5 k, 1.2M
+- digit grouping with commas or (non-breaking) spaces: 120,000, 71 000
+- decimal points or decimal commas: 92.5K, 875,5 k
+- ranges with -, – or — (or "to"): $89K–$160K/yr, 73-141K
+- Levels.fyi breakdowns, base | stock | bonus (or total | base | stock | bonus),
+  with N/A for missing parts
+
+Amounts are returned as written (no currency conversion). Digits glued to
+letters ('L3', 'SDE2') are not amounts, and a bare small number ahead of a
+currency-marked amount ('Level 5 $150,000') gives way to that amount.
+
+    parse_salary('875,5 k $CA')               # 875500
+    parse_range('$89K–$160K/yr')              # (89000, 160000)
+    parse_compensation('107 k | 5 k | 10 k')  # (122000, 107000, 5000, 10000)
+    parse_salary_column(df['totalyearlycompensation'])  # vectorized
+
+CORPUS holds the reference cases; `python scripts/benchmarks.py salary`
+checks them and times the scalar and vectorized paths.
+"""
+
+import re
+from typing import List, Optional, Tuple
+
+import importlib.util
+
+import numpy as np
+import pandas as pd
+
+# Anything but a letter or digit on both sides, then an integer part (grouped
+# by 3 with , or spaces, or plain digits), optional decimal part and optional
+# multiplier: so "L3" holds no amount, the "M" of "120 Montreal" is not a
+# million and "1,2345" is not 1,234. Written for both Python re and RE2
+# (pyarrow), so the scalar and vectorized paths match the same way: named
+# groups, no lookarounds, ASCII digits.
+SPACES = ' \u00a0\u202f'  # space, no-break space, narrow no-break space
+GROUP_SEPARATORS = '[,' + SPACES + ']'
+AMOUNT_START = r'(?:^|[^A-Za-z0-9])'
+AMOUNT_END = r'(?:[^A-Za-z0-9]|$)'
+
+
+def _amount_body(prefix: str = '') -> str:
+    return (r'(?P<' + prefix + r'integer>[0-9]{1,3}(?:' + GROUP_SEPARATORS + r'[0-9]{3})+|[0-9]+)'
+            r'(?:[.,](?P<' + prefix + r'fraction>[0-9]+))?'
+            r'(?:[' + SPACES + r']?(?P<' + prefix + r'multiplier>[kKmM]))?')
+
+
+AMOUNT_PATTERN = AMOUNT_START + _amount_body() + AMOUNT_END
+AMOUNT_RE = re.compile(AMOUNT_PATTERN)
+# An amount right after a leading currency marker: '$150,000', 'CA$120K', 'C$ 95,000'
+PREFIXED_PATTERN = r'(?:\$CA|CA\$|C\$|\$)[' + SPACES + r']?' + _amount_body() + AMOUNT_END
+PREFIXED_RE = re.compile(PREFIXED_PATTERN)
+# A lone number of at most 3 digits (no decimals, grouping or multiplier): 'Level 5'
+BARE_INTEGER_RE = re.compile(r'[0-9]{1,3}')
+CURRENCY = r'(?:\$CA|CA\$|C\$|CAD|USD|\$)?'
+RANGE_RE = re.compile(AMOUNT_START + _amount_body('low_')
+                      + r'\s*' + CURRENCY + r'\s*(?:[-–—]|to)\s*' + CURRENCY + r'\s*'
+                      + _amount_body('high_') + AMOUNT_END)
+GROUP_SEPARATORS_RE = re.compile(GROUP_SEPARATORS)
+MULTIPLIERS = {'k': 1e3, 'm': 1e6}
+_HAS_PYARROW = importlib.util.find_spec('pyarrow') is not None
+
+
+def _value(integer: str, fraction: Optional[str], multiplier: Optional[str]) -> float:
+    value = float(GROUP_SEPARATORS_RE.sub('', integer) + ('.' + fraction if fraction else ''))
+    return value * MULTIPLIERS[multiplier.lower()] if multiplier else value
+
+
+def _is_bare(integer: str, fraction: Optional[str], multiplier: Optional[str]) -> bool:
+    return not fraction and not multiplier and BARE_INTEGER_RE.fullmatch(integer) is not None
+
+
+def parse_amount(text) -> Optional[float]:
+    """First amount in text, as a float (None if there is none).
+
+    A bare number of at most 3 digits ('Level 5') is skipped for a
+    currency-marked amount elsewhere in the text ('$150,000').
+    """
+    if not text:
+        return None
+    text = str(text)
+    match = AMOUNT_RE.search(text)
+    if match is None:
+        return None
+    if _is_bare(*match.groups()):
+        prefixed = PREFIXED_RE.search(text)
+        if prefixed is not None:
+            return _value(*prefixed.groups())
+    return _value(*match.groups())
+
+
+def parse_salary(text) -> Optional[int]:
+    """First amount in text, rounded to whole dollars (None if there is none)."""
+    value = parse_amount(text)
+    return int(round(value)) if value is not None else None
+
+
+def find_amounts(text) -> List[float]:
+    """Every amount in text, in order."""
+    if not text:
+        return []
+    text = str(text)
+    amounts = []
+    match = AMOUNT_RE.search(text)
+    while match is not None:
+        amounts.append(_value(*match.groups()))
+        # The character after an amount may be the one before the next ('100-200')
+        end = max(match.end(group) for group in ('integer', 'fraction', 'multiplier')
+                  if match.group(group) is not None)
+        match = AMOUNT_RE.search(text, end)
+    return amounts
+
+
+def parse_range(text) -> Optional[Tuple[int, int]]:
+    """(low, high) of a range like '$72K - $110K'; None if text is not a range.
+
+    A multiplier written only on the high end applies to both: '73-141K'.
+    """
+    if not text:
+        return None
+    match = RANGE_RE.search(str(text))
+    if not match:
+        return None
+    low_int, low_frac, low_mult, high_int, high_frac, high_mult = match.groups()
+    low = _value(low_int, low_frac, low_mult)
+    if low_mult is None and high_mult is not None and low < 1000:
+        low = _value(low_int, low_frac, high_mult)
+    high = _value(high_int, high_frac, high_mult)
+    return int(round(low)), int(round(high))
+
+
+def parse_compensation(text) -> Tuple[Optional[int], Optional[int], Optional[int], Optional[int]]:
+    """(total, base, stock, bonus) from a Levels.fyi compensation string.
+
+    'a | b | c' is base | stock | bonus (total = their sum), 'a | b | c | d'
+    is total | base | stock | bonus, and a single amount is the total.
+    """
+    if not text:
+        return None, None, None, None
+    parts = [parse_salary(p) for p in str(text).split('|')]
+    if len(parts) == 1:
+        return parts[0], None, None, None
+    if len(parts) >= 4:
+        total, base, stock, bonus = parts[:4]
+    else:
+        base, stock, bonus = (parts + [None])[:3]
+        total = None
+    if total is None and any(p is not None for p in (base, stock, bonus)):
+        total = (base or 0) + (stock or 0) + (bonus or 0)
+    return total, base, stock, bonus
+
+
+# ---------------------------------------------------------------------------
+# Vectorized paths: one regex pass over a whole column
+# ---------------------------------------------------------------------------
+
+def _arrow_strings(values):
+    import pyarrow as pa
+
+    try:
+        return pa.array(values, type=pa.large_string(), from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):  # mixed object column
+        return pa.array([str(v) for v in values], type=pa.large_string())
+
+
+def _extract_arrow(texts, pattern):
+    """(amount, bare) of the first match of `pattern` per string (amount NaN = none)."""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    match = pc.extract_regex(texts, pattern)
+    raw_integer = pc.struct_field(match, 'integer')
+    integer = raw_integer
+    for separator in GROUP_SEPARATORS[1:-1]:
+        integer = pc.replace_substring(integer, separator, '')
+    fraction = pc.struct_field(match, 'fraction')
+    point = pa.scalar('.', integer.type)
+    number = pc.if_else(pc.equal(fraction, ''), integer,
+                        pc.binary_join_element_wise(integer, fraction, point))
+    amount = pc.cast(number, pa.float64()).to_numpy(zero_copy_only=False)
+    multiplier = pc.utf8_lower(pc.struct_field(match, 'multiplier'))
+    bare = pc.and_(pc.and_(pc.equal(fraction, ''), pc.equal(multiplier, '')),
+                   pc.match_substring_regex(raw_integer, '^' + BARE_INTEGER_RE.pattern + '$'))
+    multiplier = multiplier.to_numpy(zero_copy_only=False)
+    for suffix, factor in MULTIPLIERS.items():
+        amount = np.where(multiplier == suffix, amount * factor, amount)
+    return amount, pc.fill_null(bare, False).to_numpy(zero_copy_only=False)
+
+
+def _amounts_arrow(texts) -> np.ndarray:
+    """parse_amount() over an Arrow string array with RE2 kernels (float64, NaN = none)."""
+    amount, bare = _extract_arrow(texts, AMOUNT_PATTERN)
+    if bare.any():
+        prefixed, _ = _extract_arrow(texts, PREFIXED_PATTERN)
+        amount = np.where(bare & ~np.isnan(prefixed), prefixed, amount)
+    return amount
+
+
+def _amounts(texts) -> np.ndarray:
+    """Amount of each distinct string (list-like), float64 with NaN for none."""
+    if _HAS_PYARROW:
+        return _amounts_arrow(_arrow_strings(texts))
+    return np.array([parse_amount(str(t)) for t in texts], dtype=float)
+
+
+def parse_salary_column(values) -> pd.Series:
+    """parse_salary() over a Series: float64, NaN where there is no amount.
+
+    Each distinct string is parsed once (salary columns repeat a lot), with
+    pyarrow's vectorized regex kernels when pyarrow is installed.
+    """
+    values = pd.Series(values)
+    if pd.api.types.is_numeric_dtype(values):
+        return values.astype('float64').round()
+    codes, uniques = pd.factorize(values)
+    parsed = np.append(_amounts(uniques).round(), np.nan)  # code -1 (missing) -> NaN
+    return pd.Series(parsed[codes], index=values.index, name=values.name)
+
+
+def _compensation_parts(texts):
+    """(number of |-separated parts, first four parts parsed) for distinct strings."""
+    if _HAS_PYARROW:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        texts = _arrow_strings(texts)
+        n_parts = pc.count_substring(texts, '|').to_numpy(zero_copy_only=False) + 1
+        # Pad so every string has at least four parts
+        padding, empty = pa.scalar('|||', pa.large_string()), pa.scalar('', pa.large_string())
+        parts = pc.split_pattern(pc.binary_join_element_wise(texts, padding, empty), '|', max_splits=4)
+        # Parts repeat far more than whole strings do: parse each distinct part once
+        parts = [pc.dictionary_encode(pc.list_element(parts, i)) for i in range(4)]
+        return n_parts, [_amounts_arrow(p.dictionary)[p.indices.to_numpy()] for p in parts]
+
+    split = [(str(t).split('|') + [''] * 3) for t in texts]
+    n_parts = np.array([len(p) - 3 for p in split])
+    return n_parts, [np.array([parse_amount(p[i]) for p in split], dtype=float) for i in range(4)]
+
+
+def parse_compensation_column(values) -> pd.DataFrame:
+    """parse_compensation() over a Series: total/base/stock/bonus columns (float64)."""
+    values = pd.Series(values)
+    codes, uniques = pd.factorize(values)
+    n_parts, parsed = _compensation_parts(uniques)
+    parsed = [p.round() for p in parsed]
+
+    single = n_parts == 1
+    four = n_parts >= 4
+    three = ~single & ~four
+    base = np.where(three, parsed[0], np.where(four, parsed[1], np.nan))
+    stock = np.where(three, parsed[1], np.where(four, parsed[2], np.nan))
+    bonus = np.where(three, parsed[2], np.where(four, parsed[3], np.nan))
+    # An explicit total (single amount, or first of four), else the breakdown's sum
+    breakdown = np.vstack([base, stock, bonus])
+    breakdown_sum = np.where(np.isnan(breakdown).all(axis=0), np.nan, np.nansum(breakdown, axis=0))
+    total = np.where(single | four, parsed[0], np.nan)
+    total = np.where(np.isnan(total) & ~single, breakdown_sum, total)
+
+    columns = {name: np.append(column, np.nan)[codes]  # code -1 (missing) -> NaN
+               for name, column in [('total', total), ('base', base), ('stock', stock), ('bonus', bonus)]}
+    return pd.DataFrame(columns, index=values.index)
+
+
+# ---------------------------------------------------------------------------
+# Reference cases: (text, parse_salary, parse_range, parse_compensation)
+# ---------------------------------------------------------------------------
+
+CORPUS = [
+    ('$86K', 86000, None, (86000, None, None, None)),
+    ('$117k', 117000, None, (117000, None, None, None)),
+    ('$150,000', 150000, None, (150000, None, None, None)),
+    ('150000', 150000, None, (150000, None, None, None)),
+    ('92.5K', 92500, None, (92500, None, None, None)),
+    ('71 000 $CA', 71000, None, (71000, None, None, None)),
+    ('1\u202f250\u202f000', 1250000, None, (1250000, None, None, None)),
+    ('214 000 $CA', 214000, None, (214000, None, None, None)),
+    ('71\u00a0000\u00a0$CA', 71000, None, (71000, None, None, None)),
+    ('875,5 k $CA includes Equity', 875500, None, (875500, None, None, None)),
+    ('CA$120K', 120000, None, (120000, None, None, None)),
+    ('C$ 95,000 CAD', 95000, None, (95000, None, None, None)),
+    ('$1.2M', 1200000, None, (1200000, None, None, None)),
+    ('120 Montreal', 120, None, (120, None, None, None)),
+    ('$86K/yr', 86000, None, (86000, None, None, None)),
+    ('$72K - $110K', 72000, (72000, 110000), (72000, None, None, None)),
+    ('$89K–$160K/yr', 89000, (89000, 160000), (89000, None, None, None)),
+    ('73-141K', 73, (73000, 141000), (73, None, None, None)),
+    ('90,000 — 120,000 CAD', 90000, (90000, 120000), (90000, None, None, None)),
+    ('72 000 $CA to 110 000 $CA', 72000, (72000, 110000), (72000, None, None, None)),
+    ('107 k | 5 k | 10 k', 107000, None, (122000, 107000, 5000, 10000)),
+    ('120 k | N/A | N/A', 120000, None, (120000, 120000, None, None)),
+    ('N/A | N/A | N/A', None, None, (None, None, None, None)),
+    ('250 k | 180 k | 50 k | 20 k', 250000, None, (250000, 180000, 50000, 20000)),
+    ('N/A', None, None, (None, None, None, None)),
+    ('', None, None, (None, None, None, None)),
+    ('L3', None, None, (None, None, None, None)),
+    ('SDE2 $120k', 120000, None, (120000, None, None, None)),
+    ('Level 5 $150,000', 150000, None, (150000, None, None, None)),
+]
+
+
+def check_corpus() -> List[str]:
+    """Run the scalar and vectorized parsers on CORPUS; returns the mismatches."""
+    errors = []
+    for text, salary, salary_range, compensation in CORPUS:
+        for name, got, want in [('parse_salary', parse_salary(text), salary),
+                                ('parse_range', parse_range(text), salary_range),
+                                ('parse_compensation', parse_compensation(text), compensation)]:
+            if got != want:
+                errors.append(f"{name}({text!r}) = {got!r}, expected {want!r}")
+
+    texts = pd.Series([c[0] for c in CORPUS])
+    column = parse_salary_column(texts)
+    for text, got, (_, want, _, _) in zip(texts, column, CORPUS):
+        if not (pd.isna(got) and want is None or got == want):
+            errors.append(f"parse_salary_column({text!r}) = {got!r}, expected {want!r}")
+
+    breakdown = parse_compensation_column(texts)
+    for i, (text, _, _, want) in enumerate(CORPUS):
+        got = tuple(None if pd.isna(v) else int(v) for v in breakdown.iloc[i])
+        if got != want:
+            errors.append(f"parse_compensation_column({text!r}) = {got!r}, expected {want!r}")
+    return errors
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Concurrent, polite HTTP fetching for the salary scrapers.
+
+Instead of one request at a time followed by a 2-5 s sleep, jobs are fetched
+concurrently with asyncio + aiohttp:
+- one pooled connector, bounded in total (max_connections) and per host
+  (per_host)
+- a token bucket per host: at most `rate` requests/s on average, with short
+  bursts up to `burst`, so each domain sees the same politeness limit however
+  many jobs are queued
+- transient failures (connection errors, 429, 5xx) are retried with backoff,
+  honoring Retry-After
+
+    fetcher = AsyncFetcher(headers, per_host=2, rate=0.5)
+    results = fetcher.run([FetchJob('indeed:p1', url, params), ...])
+
+Requires aiohttp (pip install aiohttp).
+"""
+
+import asyncio
+import time
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+
+import aiohttp
+
+
+class FetchJob:
+    """One URL to fetch; `key` identifies it in the results."""
+
+    def __init__(self, key, url: str, params: Optional[Dict] = None):
+        self.key = key
+        self.url = url
+        self.params = params
+        self.host = urlsplit(url).netloc
+
+    def __repr__(self):
+        return f"FetchJob({self.key!r}, {self.url!r})"
+
+
+class FetchResult:
+    def __init__(self, job: FetchJob, status: Optional[int] = None, body: bytes = b'',
+                 headers: Optional[Dict] = None, error: Optional[str] = None,
+                 attempts: int = 0, elapsed: float = 0.0):
+        self.job = job
+        self.status = status
+        self.body = body
+        self.headers = headers or {}
+        self.error = error
+        self.attempts = attempts
+        self.elapsed = elapsed
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.status is not None and 200 <= self.status < 300
+
+
+class TokenBucket:
+    """Async token bucket: `rate` tokens per second, holding at most `burst`."""
+
+    def __init__(self, rate: float, burst: float = 1):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class AsyncFetcher:
+    """Fetch many FetchJobs concurrently within global and per-host limits."""
+
+    def __init__(self, headers: Optional[Dict] = None, max_connections: int = 10,
+                 per_host: int = 2, rate: float = 0.5, burst: float = 1,
+                 timeout: float = 10, retries: int = 2, backoff: float = 1.0):
+        self.headers = headers or {}
+        self.max_connections = max_connections
+        self.per_host = per_host
+        self.rate = rate
+        self.burst = burst
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.buckets: Dict[str, TokenBucket] = {}
+
+    def _bucket(self, host: str) -> TokenBucket:
+        if host not in self.buckets:
+            self.buckets[host] = TokenBucket(self.rate, self.burst)
+        return self.buckets[host]
+
+    def _lookup(self, job: FetchJob):
+        """(status, body, headers) if the job can be answered without a request."""
+        return None
+
+    async def _request(self, session, job: FetchJob):
+        """One GET; returns (status, body, headers). Override to add caching."""
+        async with session.get(job.url, params=job.params) as response:
+            body = await response.read()
+            return response.status, body, dict(response.headers)
+
+    async def fetch(self, session, job: FetchJob) -> FetchResult:
+        start = time.monotonic()
+        cached = self._lookup(job)
+        if cached is not None:
+            status, body, headers = cached
+            return FetchResult(job, status, body, headers, attempts=0)
+        attempt = 0
+        while True:
+            attempt += 1
+            await self._bucket(job.host).acquire()
+            try:
+                status, body, headers = await self._request(session, job)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if attempt > self.retries:
+                    return FetchResult(job, error=f"{type(e).__name__}: {e}", attempts=attempt,
+                                       elapsed=time.monotonic() - start)
+                await asyncio.sleep(self.backoff * 2 ** (attempt - 1))
+                continue
+
+            if status in RETRY_STATUSES and attempt <= self.retries:
+                retry_after = headers.get('Retry-After', '')
+                wait = float(retry_after) if retry_after.isdigit() else self.backoff * 2 ** (attempt - 1)
+                await asyncio.sleep(wait)
+                continue
+
+            error = None if 200 <= status < 400 else f"HTTP {status}"
+            return FetchResult(job, status, body, headers, error, attempt, time.monotonic() - start)
+
+    def _session(self):
+        connector = aiohttp.TCPConnector(limit=self.max_connections, limit_per_host=self.per_host)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        return aiohttp.ClientSession(connector=connector, timeout=timeout, headers=self.headers)
+
+    async def iter_results(self, jobs: Iterable[FetchJob]):
+        """Yield FetchResults as they complete (completion order)."""
+        async with self._session() as session:
+            tasks = [asyncio.ensure_future(self.fetch(session, job)) for job in jobs]
+            try:
+                for task in asyncio.as_completed(tasks):
+                    yield await task
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+    async def fetch_all(self, jobs: Iterable[FetchJob]) -> List[FetchResult]:
+        """Fetch all jobs; results in job order."""
+        async with self._session() as session:
+            return await asyncio.gather(*(self.fetch(session, job) for job in jobs))
+
+    def run(self, jobs: Iterable[FetchJob]) -> List[FetchResult]:
+        """Blocking wrapper around fetch_all()."""
+        return asyncio.run(self.fetch_all(list(jobs)))
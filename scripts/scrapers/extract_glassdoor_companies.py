@@ -3,35 +3,17 @@
 Extract salary ranges by company from Glassdoor HTML page.
 """
 
-import re
+import sys
 import json
 import argparse
 from pathlib import Path
 from bs4 import BeautifulSoup
 import pandas as pd
 
+from glassdoor_selectors import CARD, OPEN_JOBS_RE, PageTimer, scan_page
 
-def extract_salary_number(text):
-    """Extract numeric salary from text like '$86K' or '$117K'."""
-    if not text:
-        return None
-    
-    # Remove $ and any non-numeric characters except K/k
-    clean = text.strip().replace('$', '').replace(',', '')
-    
-    # Handle K notation
-    if 'K' in clean or 'k' in clean:
-        num_str = clean.replace('K', '').replace('k', '').strip()
-        try:
-            return int(float(num_str) * 1000)
-        except:
-            return None
-    
-    # Try direct conversion
-    try:
-        return int(float(clean))
-    except:
-        return None
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from salary_parser import parse_range, parse_salary
 
 
 def extract_companies_from_html(html_path):
@@ -39,29 +21,35 @@ def extract_companies_from_html(html_path):
     with open(html_path, 'r', encoding='utf-8') as f:
         html = f.read()
     
+    timer = PageTimer()
     soup = BeautifulSoup(html, 'lxml')
+    timer.lap('parse')
     
     companies = []
     
     # Find all salary card items
-    salary_items = soup.find_all('div', class_=re.compile('SalariesList_Item'))
+    salary_items = scan_page(soup)['salary_item']
+    timer.lap('scan')
     
     print(f"Found {len(salary_items)} salary items")
     
     for idx, item in enumerate(salary_items):
         try:
+            # Resolve all card fields in one pass over the card subtree
+            fields = CARD.first(item)
+            
             # Extract company name
-            company_name_elem = item.find('p', class_=re.compile('salary-card_EmployerName'))
+            company_name_elem = fields.get('company_name')
             if not company_name_elem:
                 continue
             company_name = company_name_elem.get_text(strip=True)
             
             # Extract rating
-            rating_elem = item.find('p', class_=re.compile('salary-card_Rating'))
+            rating_elem = fields.get('rating')
             rating = float(rating_elem.get_text(strip=True)) if rating_elem else None
             
             # Extract total pay range (e.g., "$86K - $117K")
-            total_pay_elem = item.find('div', class_=re.compile('salary-card_TotalPay'))
+            total_pay_elem = fields.get('total_pay')
             total_pay = None
             min_pay = None
             max_pay = None
@@ -69,29 +57,28 @@ def extract_companies_from_html(html_path):
             if total_pay_elem:
                 total_pay_text = total_pay_elem.get_text(strip=True)
                 # Parse range like "$86K - $117K"
-                parts = total_pay_text.split('-')
-                if len(parts) == 2:
-                    min_pay = extract_salary_number(parts[0])
-                    max_pay = extract_salary_number(parts[1])
+                pay_range = parse_range(total_pay_text)
+                if pay_range:
+                    min_pay, max_pay = pay_range
                     total_pay = total_pay_text
             
             # Extract median salary
-            median_elem = item.find('div', class_=re.compile('salary-card_BreakdownBold'))
+            median_elem = fields.get('median')
             median_salary = None
             if median_elem:
                 median_text = median_elem.get_text(strip=True)
-                median_salary = extract_salary_number(median_text)
+                median_salary = parse_salary(median_text)
             
             # Extract job title (should be "AI Engineer")
-            job_title_elem = item.find('section', class_=re.compile('salary-card_TitleTrim'))
+            job_title_elem = fields.get('job_title')
             job_title = job_title_elem.get_text(strip=True) if job_title_elem else "AI Engineer"
             
             # Extract open jobs count
-            open_jobs_elem = item.find('span', class_=re.compile('button_ButtonContent'))
+            open_jobs_elem = fields.get('open_jobs')
             open_jobs = 0
             if open_jobs_elem:
                 open_jobs_text = open_jobs_elem.get_text(strip=True)
-                match = re.search(r'(\d+)\s+open', open_jobs_text)
+                match = OPEN_JOBS_RE.search(open_jobs_text)
                 if match:
                     open_jobs = int(match.group(1))
             
@@ -113,6 +100,9 @@ def extract_companies_from_html(html_path):
             print(f"  Error parsing item {idx}: {e}")
             continue
     
+    timer.lap('extract')
+    print(f"\n⏱️  Parse time: {timer.summary()}")
+    
     return companies
 
 
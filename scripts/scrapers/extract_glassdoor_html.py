@@ -1,6 +1,7 @@
 import argparse
 import csv
 import re
+import sys
 from pathlib import Path
 
 try:
@@ -8,21 +9,12 @@ try:
 except ImportError:  # pragma: no cover
     raise SystemExit("Please install beautifulsoup4: pip install beautifulsoup4")
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from parse_cache import add_cache_args, cache_from_args
+from salary_parser import find_amounts, parse_amount
 
-def parse_amount(raw: str) -> float | None:
-    if not raw:
-        return None
-    m = re.search(r"([\d.,]+)\s*([kK]?)", raw)
-    if not m:
-        return None
-    num = m.group(1).replace(",", "")
-    try:
-        val = float(num)
-    except ValueError:
-        return None
-    if m.group(2).lower() == "k":
-        val *= 1000
-    return val
+# Bump when extraction output changes so cached results are invalidated
+CACHE_KEY = "glassdoor_percentiles:2"
 
 
 def extract_percentile(text: str, labels: list[str]) -> float | None:
@@ -48,12 +40,33 @@ def extract_median(text: str) -> float | None:
 
 
 def extract_all_numbers(text: str) -> list[float]:
-    nums = []
-    for m in re.finditer(r"[$£€]?\s*([\d.,]+\s*[kK]?)", text):
-        amt = parse_amount(m.group(1))
-        if amt:
-            nums.append(amt)
-    return nums
+    return [amt for amt in find_amounts(text) if amt]
+
+
+def extract_percentiles_from_html(html_file: Path) -> tuple:
+    """Return (p10, p25, p50, p75, p90) found in one saved page."""
+    text = html_file.read_text(encoding="utf-8", errors="ignore")
+    soup = BeautifulSoup(text, "html.parser")
+    flat = soup.get_text(" ", strip=True)
+
+    p10 = extract_percentile(flat, ["10th", "10%", "10 percentile"])
+    p25 = extract_percentile(flat, ["25th", "25%", "25 percentile", "low end"])
+    p50 = extract_percentile(flat, ["50th", "50%", "median", "middle", "typical"])
+    p75 = extract_percentile(flat, ["75th", "75%", "75 percentile", "high end"])
+    p90 = extract_percentile(flat, ["90th", "90%", "90 percentile", "top"])
+
+    if p50 is None:
+        p50 = extract_median(flat)
+
+    # Fallback: if only three numbers present, map to p25/p50/p75 heuristically
+    nums = extract_all_numbers(flat)
+    if not any([p10, p25, p50, p75, p90]) and len(nums) >= 3:
+        nums_sorted = sorted(nums)
+        p25 = nums_sorted[0]
+        p50 = nums_sorted[len(nums_sorted)//2]
+        p75 = nums_sorted[-1]
+
+    return p10, p25, p50, p75, p90
 
 
 def main() -> None:
@@ -66,29 +79,12 @@ def main() -> None:
     parser.add_argument("--date", default="2025-12-31", help="Date for the snapshot (YYYY-MM-DD)")
     parser.add_argument("--currency", default="CAD", help="Currency code")
     parser.add_argument("--out", default="data/salaries_glassdoor.csv", help="Output CSV path")
+    add_cache_args(parser)
     args = parser.parse_args()
+    cache = cache_from_args(args)
 
     def process_one(html_file: Path):
-        text = html_file.read_text(encoding="utf-8", errors="ignore")
-        soup = BeautifulSoup(text, "html.parser")
-        flat = soup.get_text(" ", strip=True)
-
-        p10 = extract_percentile(flat, ["10th", "10%", "10 percentile"])
-        p25 = extract_percentile(flat, ["25th", "25%", "25 percentile", "low end"])
-        p50 = extract_percentile(flat, ["50th", "50%", "median", "middle", "typical"])
-        p75 = extract_percentile(flat, ["75th", "75%", "75 percentile", "high end"])
-        p90 = extract_percentile(flat, ["90th", "90%", "90 percentile", "top"])
-
-        if p50 is None:
-            p50 = extract_median(flat)
-
-        # Fallback: if only three numbers present, map to p25/p50/p75 heuristically
-        nums = extract_all_numbers(flat)
-        if not any([p10, p25, p50, p75, p90]) and len(nums) >= 3:
-            nums_sorted = sorted(nums)
-            p25 = nums_sorted[0]
-            p50 = nums_sorted[len(nums_sorted)//2]
-            p75 = nums_sorted[-1]
+        p10, p25, p50, p75, p90 = cache.load_or_parse(html_file, CACHE_KEY, extract_percentiles_from_html)
 
         out_path = Path(args.out)
         out_path.parent.mkdir(parents=True, exist_ok=True)
@@ -128,6 +124,8 @@ def main() -> None:
             raise SystemExit(f"HTML file not found: {html_path}")
         process_one(html_path)
 
+    print(cache.summary())
+
 
 if __name__ == "__main__":
     main()
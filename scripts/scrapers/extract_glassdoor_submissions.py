@@ -5,31 +5,21 @@ These are user-submitted salaries with experience level, location, and date.
 """
 
 import re
+import sys
+import mmap
 import argparse
+import functools
 from pathlib import Path
 from bs4 import BeautifulSoup
-import pandas as pd
 from datetime import datetime
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from parse_cache import add_cache_args, cache_from_args
+from record_sink import add_sink_args, open_sink, read_back
+from salary_parser import parse_range, parse_salary
 
-def extract_salary_number(text):
-    """Extract numeric salary from text like '$92K' or '$108K'."""
-    if not text:
-        return None
-    
-    clean = text.strip().replace('$', '').replace(',', '')
-    
-    if 'K' in clean or 'k' in clean:
-        num_str = clean.replace('K', '').replace('k', '').strip()
-        try:
-            return int(float(num_str) * 1000)
-        except:
-            return None
-    
-    try:
-        return int(float(clean))
-    except:
-        return None
+# Bump when extraction output changes so cached results are invalidated
+CACHE_KEY = 'glassdoor_submissions:3'
 
 
 def parse_experience_years(exp_text):
@@ -51,77 +41,124 @@ def parse_experience_years(exp_text):
     return None, None
 
 
-def extract_submissions_from_html(html_path):
-    """Extract individual salary submissions from Glassdoor HTML."""
-    with open(html_path, 'r', encoding='utf-8') as f:
-        html = f.read()
-    
-    soup = BeautifulSoup(html, 'lxml')
+def parse_salary_text(salary_text):
+    """(min, max, median) from '92-108K' or '$95K'."""
+    salary_range = parse_range(salary_text)
+    if salary_range:
+        salary_min, salary_max = salary_range
+        return salary_min, salary_max, int((salary_min + salary_max) / 2)
+    salary = parse_salary(salary_text)
+    return salary, salary, salary
+
+
+# Method 1: salary range entries with location and experience, matched on the raw page
+SUBMISSION_PATTERN = (
+    r'AI Engineer\s*\|?\s*'
+    r'(\d+-\d+\s+Years?|Less than 1 Year)'
+    r'\s*([^|]+?)\s*'
+    r'submitted on\s+([A-Za-z]+\s+\d+,\s+\d{4})'
+    r'\s*\$?([\d,]+-[\d,]+K?|\d+K)\s*/yr'
+)
+SUBMISSION_RE = re.compile(SUBMISSION_PATTERN, re.IGNORECASE | re.DOTALL)
+
+# Same pattern over the bytes of a memory-mapped file. Bytes-mode \s is ASCII
+# only, so it is spelled out as the UTF-8 encoding of every character str-mode
+# \s matches (e.g. the no-break space in '$92-108K\u00a0/yr')
+UNICODE_SPACES = ('\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f \x85\xa0\u1680\u2000\u2001\u2002\u2003\u2004'
+                  '\u2005\u2006\u2007\u2008\u2009\u200a\u2028\u2029\u202f\u205f\u3000')
+UTF8_SPACE = b'(?:' + b'|'.join(re.escape(char.encode('utf-8')) for char in UNICODE_SPACES) + b')'
+SUBMISSION_BYTES_RE = re.compile(SUBMISSION_PATTERN.encode().replace(rb'\s', UTF8_SPACE),
+                                 re.IGNORECASE | re.DOTALL)
+
+
+def submission_from_groups(experience, location, submitted_date, salary_text):
+    """Submission record from the four SUBMISSION_RE groups."""
+    experience = experience.strip()
+    location = location.strip()
+    submitted_date = submitted_date.strip()
+    salary_text = salary_text.strip()
     
-    submissions = []
+    # Parse experience
+    exp_min, exp_max = parse_experience_years(experience)
     
-    # Look for salary submission cards/entries
-    # Common patterns in Glassdoor individual submissions
+    # Parse salary
+    salary_min, salary_max, salary_median = parse_salary_text(salary_text)
     
-    # Method 1: Look for salary range patterns with location and experience
-    salary_pattern = re.compile(
-        r'AI Engineer\s*\|?\s*'
-        r'(\d+-\d+\s+Years?|Less than 1 Year)'
-        r'\s*([^|]+?)\s*'
-        r'submitted on\s+([A-Za-z]+\s+\d+,\s+\d{4})'
-        r'\s*\$?([\d,]+-[\d,]+K?|\d+K)\s*/yr',
-        re.IGNORECASE | re.DOTALL
-    )
+    # Parse location (extract city)
+    city_match = re.match(r'([^,]+)', location)
+    city = city_match.group(1).strip() if city_match else location
     
-    # Find all matches
-    for match in salary_pattern.finditer(html):
+    return {
+        'job_title': 'AI Engineer',
+        'experience_text': experience,
+        'experience_min_years': exp_min,
+        'experience_max_years': exp_max,
+        'location': city,
+        'location_full': location,
+        'submitted_date': submitted_date,
+        'salary_min_cad': salary_min,
+        'salary_max_cad': salary_max,
+        'salary_median_cad': salary_median,
+        'salary_text': salary_text
+    }
+
+
+def _submissions_from_matches(matches, decode=None):
+    submissions = []
+    for match in matches:
         try:
-            experience = match.group(1).strip()
-            location = match.group(2).strip()
-            submitted_date = match.group(3).strip()
-            salary_text = match.group(4).strip()
-            
-            # Parse experience
-            exp_min, exp_max = parse_experience_years(experience)
-            
-            # Parse salary
-            if '-' in salary_text:
-                parts = salary_text.replace('$', '').split('-')
-                salary_min = extract_salary_number(parts[0])
-                salary_max = extract_salary_number(parts[1])
-                salary_median = int((salary_min + salary_max) / 2) if salary_min and salary_max else None
-            else:
-                salary_median = extract_salary_number(salary_text)
-                salary_min = salary_median
-                salary_max = salary_median
-            
-            # Parse location (extract city)
-            city_match = re.match(r'([^,]+)', location)
-            city = city_match.group(1).strip() if city_match else location
-            
-            submission = {
-                'job_title': 'AI Engineer',
-                'experience_text': experience,
-                'experience_min_years': exp_min,
-                'experience_max_years': exp_max,
-                'location': city,
-                'location_full': location,
-                'submitted_date': submitted_date,
-                'salary_min_cad': salary_min,
-                'salary_max_cad': salary_max,
-                'salary_median_cad': salary_median,
-                'salary_text': salary_text
-            }
-            
-            submissions.append(submission)
-            
+            groups = match.groups()
+            if decode:
+                groups = [decode(g) for g in groups]
+            submissions.append(submission_from_groups(*groups))
         except Exception as e:
             print(f"    ⚠️  Error parsing submission: {e}")
             continue
+    return submissions
+
+
+def _read_text(html_path):
+    with open(html_path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def scan_submissions_text(html):
+    """Regex fast path over the page text (no DOM)."""
+    return _submissions_from_matches(SUBMISSION_RE.finditer(html))
+
+
+def scan_submissions_mmap(html_path):
+    """Regex fast path over the memory-mapped file, without reading it into a str."""
+    with open(html_path, 'rb') as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            return []
+        with mapped:
+            return _submissions_from_matches(SUBMISSION_BYTES_RE.finditer(mapped),
+                                             decode=lambda b: b.decode('utf-8', errors='replace'))
+
+
+def extract_submissions_from_html(html_path, use_mmap=True):
+    """Extract individual salary submissions from Glassdoor HTML.
+    
+    The regex fast path runs on the raw file (memory-mapped unless
+    use_mmap=False); the BeautifulSoup tree is only built for the structured
+    fallback, when the regex finds nothing.
+    """
+    html = None
+    if use_mmap:
+        submissions = scan_submissions_mmap(html_path)
+    else:
+        html = _read_text(html_path)
+        submissions = scan_submissions_text(html)
     
     # Method 2: Parse from structured HTML elements if regex fails
     if len(submissions) == 0:
         print("    Trying structured HTML parsing...")
+        if html is None:
+            html = _read_text(html_path)
+        soup = BeautifulSoup(html, 'lxml')
         
         # Look for common Glassdoor salary card structures
         salary_cards = soup.find_all(['div', 'article'], class_=re.compile(r'salary|submission|report', re.I))
@@ -149,15 +186,7 @@ def extract_submissions_from_html(html_path):
                     
                     exp_min, exp_max = parse_experience_years(experience)
                     
-                    if '-' in salary_text:
-                        parts = salary_text.split('-')
-                        salary_min = extract_salary_number(parts[0])
-                        salary_max = extract_salary_number(parts[1])
-                        salary_median = int((salary_min + salary_max) / 2) if salary_min and salary_max else None
-                    else:
-                        salary_median = extract_salary_number(salary_text)
-                        salary_min = salary_median
-                        salary_max = salary_median
+                    salary_min, salary_max, salary_median = parse_salary_text(salary_text)
                     
                     submission = {
                         'job_title': 'AI Engineer',
@@ -181,13 +210,44 @@ def extract_submissions_from_html(html_path):
     return submissions
 
 
+SUBMISSION_COLUMNS = ['source', 'collection_date', 'source_file', 'job_title',
+                      'experience_text', 'experience_min_years', 'experience_max_years',
+                      'location', 'location_full', 'submitted_date',
+                      'salary_min_cad', 'salary_max_cad', 'salary_median_cad', 'salary_text']
+
+
+def iter_submissions(html_files, date, cache=None, use_mmap=True):
+    """Yield submissions (with source metadata) file by file, without collecting them."""
+    extract = functools.partial(extract_submissions_from_html, use_mmap=use_mmap)
+    for html_path in sorted(html_files):
+        print(f"Processing: {html_path.name}")
+        
+        if cache is not None:
+            submissions = cache.load_or_parse(html_path, CACHE_KEY, extract)
+        else:
+            submissions = extract(html_path)
+        
+        # Add metadata
+        for sub in submissions:
+            sub['source'] = 'Glassdoor'
+            sub['collection_date'] = date
+            sub['source_file'] = html_path.name
+            yield sub
+        
+        print(f"  Found {len(submissions)} submissions\n")
+
+
 def main():
     parser = argparse.ArgumentParser(description='Extract individual salary submissions from Glassdoor HTML')
     parser.add_argument('html_files', nargs='*', help='Path to Glassdoor HTML file(s)')
     parser.add_argument('--html-dir', help='Process all HTML files in directory')
     parser.add_argument('--out', default='data/real_data/stat_real_data_submissions_all.csv',
-                       help='Output CSV file')
+                       help='Output file (.csv, .parquet or .jsonl)')
     parser.add_argument('--date', default='2026-01-12', help='Collection date (YYYY-MM-DD)')
+    parser.add_argument('--no-mmap', action='store_true',
+                       help='Read each file into memory instead of scanning it memory-mapped')
+    add_cache_args(parser)
+    add_sink_args(parser)
     
     args = parser.parse_args()
     
@@ -211,42 +271,23 @@ def main():
     
     print(f"\n=== Extracting salary submissions from {len(html_files)} files ===\n")
     
-    all_submissions = []
+    cache = cache_from_args(args)
     
-    for html_path in sorted(html_files):
-        print(f"Processing: {html_path.name}")
-        
-        submissions = extract_submissions_from_html(html_path)
-        
-        # Add metadata
-        for sub in submissions:
-            sub['source'] = 'Glassdoor'
-            sub['collection_date'] = args.date
-            sub['source_file'] = html_path.name
-        
-        all_submissions.extend(submissions)
-        print(f"  Found {len(submissions)} submissions\n")
+    # Records go straight from the extractor to disk, one batch at a time
+    out_path = Path(args.out)
+    with open_sink(out_path, SUBMISSION_COLUMNS, args.batch_size) as sink:
+        sink.write_many(iter_submissions(html_files, args.date, cache, use_mmap=not args.no_mmap))
+    
+    print(cache.summary())
     
-    if not all_submissions:
+    if not sink.count:
         print("❌ No submissions found!")
         return 1
     
-    # Convert to DataFrame
-    df = pd.DataFrame(all_submissions)
-    
-    # Reorder columns
-    cols = ['source', 'collection_date', 'source_file', 'job_title', 
-            'experience_text', 'experience_min_years', 'experience_max_years',
-            'location', 'location_full', 'submitted_date',
-            'salary_min_cad', 'salary_max_cad', 'salary_median_cad', 'salary_text']
-    df = df[[c for c in cols if c in df.columns]]
-    
-    # Save CSV
-    out_path = Path(args.out)
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    df.to_csv(out_path, index=False)
+    print(f"\n✅ Saved {sink.count} submissions to {out_path}\n")
     
-    print(f"\n✅ Saved {len(df)} submissions to {out_path}\n")
+    # The summary only needs a few columns: read those back
+    df = read_back(out_path, ['location', 'submitted_date', 'experience_text', 'salary_median_cad'])
     
     # Print summary statistics
     print(f"=== Summary Statistics ===")
@@ -18,39 +18,112 @@ How to collect:
 """
 
 import re
+import sys
 import argparse
 import csv
 from pathlib import Path
 from bs4 import BeautifulSoup
 import pandas as pd
-from typing import List, Dict
+from typing import Dict, Iterator, List
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from salary_parser import parse_salary, parse_salary_column
 
-def extract_salary_number(text):
-    """Extract numeric salary from text like '150K' or '$150,000'."""
-    if not text:
-        return None
-    
-    clean = text.strip().replace('$', '').replace(',', '')
-    
-    if 'K' in clean or 'k' in clean:
-        num_str = clean.replace('K', '').replace('k', '').strip()
-        try:
-            return int(float(num_str) * 1000)
-        except:
-            return None
-    
+
+# Accepted header names per field (matched case-insensitively), in priority order
+COLUMN_ALIASES = {
+    'company': ['company', 'employer', 'company_name'],
+    'title': ['title', 'role', 'job_title'],
+    'level': ['level', 'seniority_level'],
+    'location': ['location', 'city', 'province'],
+    'total_compensation_cad': ['total comp', 'total_comp', 'total compensation', 'total_compensation',
+                               'compensation'],
+    'base_salary_cad': ['base', 'base salary', 'base_salary'],
+    'stock_value_cad': ['stock', 'equity', 'rsu', 'stock_value'],
+    'bonus_cad': ['bonus', 'signing bonus', 'signing_bonus'],
+    'years_of_experience': ['years of experience', 'years_of_experience', 'yoe', 'experience'],
+}
+COMPENSATION_FIELDS = ['total_compensation_cad', 'base_salary_cad', 'stock_value_cad', 'bonus_cad']
+OUTPUT_COLUMNS = ['source', 'company', 'title', 'level', 'location'] + COMPENSATION_FIELDS + [
+    'years_of_experience']
+
+# Substring test, same as the original per-row check ('ai', 'ml' or 'machine' anywhere)
+AI_ML_TITLE_RE = re.compile(r'ai|ml|machine', re.I)
+
+DEFAULT_CHUNKSIZE = 250_000
+
+
+def resolve_columns(header: List[str]) -> Dict[str, str]:
+    """Map each field to the CSV column that provides it (first alias present)."""
+    normalized = {col.lower().strip(): col for col in header}
+    mapping = {}
+    for field, aliases in COLUMN_ALIASES.items():
+        for alias in aliases:
+            if alias in normalized:
+                mapping[field] = normalized[alias]
+                break
+    return mapping
+
+
+def normalize_levelsfyi_chunk(chunk: pd.DataFrame, mapping: Dict[str, str]) -> pd.DataFrame:
+    """AI/ML rows of one CSV chunk in the output schema (vectorized).
+
+    `mapping` comes from resolve_columns() and must include company and title.
+    """
+    company = chunk[mapping['company']]
+    title = chunk[mapping['title']]
+    keep = (company.notna() & (company.astype(str) != '') &
+            title.astype(str).str.contains(AI_ML_TITLE_RE, na=False))
+    chunk = chunk[keep]
+
+    out = pd.DataFrame(index=chunk.index)
+    out['source'] = 'Levels.fyi'
+    for field in OUTPUT_COLUMNS[1:]:
+        column = mapping.get(field)
+        if column is None:
+            out[field] = None
+        elif field in COMPENSATION_FIELDS:
+            out[field] = parse_salary_column(chunk[column])
+        else:
+            out[field] = chunk[column]
+    out['location'] = out['location'].replace('', None).fillna('Canada')
+    return out.reset_index(drop=True)
+
+
+def iter_levelsfyi_csv(csv_path: Path, chunksize: int = DEFAULT_CHUNKSIZE) -> Iterator[pd.DataFrame]:
+    """Normalized AI/ML rows of a Levels.fyi CSV export, one DataFrame per chunk.
+
+    The column mapping is resolved once from the header and only the mapped
+    columns are read, so multi-million-row exports stream in bounded memory.
+    """
+    header = list(pd.read_csv(csv_path, nrows=0).columns)
+    print(f"  Found columns: {header}")
+    mapping = resolve_columns(header)
+    missing = [field for field in ('company', 'title') if field not in mapping]
+    if missing:
+        print(f"  ⚠️  No column for {', '.join(missing)}")
+        return
+    for chunk in pd.read_csv(csv_path, usecols=sorted(set(mapping.values())), chunksize=chunksize):
+        yield normalize_levelsfyi_chunk(chunk, mapping)
+
+
+def load_levelsfyi_csv(csv_path: Path, chunksize: int = DEFAULT_CHUNKSIZE) -> pd.DataFrame:
+    """All normalized AI/ML rows of a Levels.fyi CSV export (empty frame on error)."""
     try:
-        return int(float(clean))
-    except:
-        return None
+        chunks = list(iter_levelsfyi_csv(csv_path, chunksize))
+    except Exception as e:
+        print(f"  Error reading CSV: {e}")
+        chunks = []
+    if not chunks:
+        return pd.DataFrame(columns=OUTPUT_COLUMNS)
+    return pd.concat(chunks, ignore_index=True)
 
 
-def parse_levelsfyi_csv(csv_path: Path) -> List[Dict]:
+def parse_levelsfyi_csv(csv_path: Path, chunksize: int = DEFAULT_CHUNKSIZE) -> List[Dict]:
     """
     Parse Levels.fyi CSV export.
     
-    Expected columns (may vary):
+    Expected columns (may vary, see COLUMN_ALIASES):
     - Company
     - Title / Role
     - Level (L3, L4, L5, L6, L7, L8)
@@ -62,103 +135,7 @@ def parse_levelsfyi_csv(csv_path: Path) -> List[Dict]:
     - Years of Experience
     - Timestamp / Date
     """
-    data = []
-    
-    try:
-        df = pd.read_csv(csv_path)
-        
-        print(f"  Found columns: {list(df.columns)}")
-        
-        # Normalize column names (case-insensitive)
-        df.columns = [col.lower().strip() for col in df.columns]
-        
-        for idx, row in df.iterrows():
-            # Extract company
-            company = None
-            for col in ['company', 'employer', 'company_name']:
-                if col in df.columns:
-                    company = row[col]
-                    break
-            
-            if not company:
-                continue
-            
-            # Extract title
-            title = None
-            for col in ['title', 'role', 'job_title']:
-                if col in df.columns:
-                    title = row[col]
-                    break
-            
-            if not title or 'ai' not in str(title).lower() and 'ml' not in str(title).lower() and 'machine' not in str(title).lower():
-                continue  # Skip non-AI/ML roles
-            
-            # Extract level
-            level = None
-            for col in ['level', 'seniority_level']:
-                if col in df.columns:
-                    level = row[col]
-                    break
-            
-            # Extract location
-            location = None
-            for col in ['location', 'city', 'province']:
-                if col in df.columns:
-                    location = row[col]
-                    break
-            
-            if not location:
-                location = "Canada"
-            
-            # Extract compensation figures
-            total_comp = None
-            for col in ['total comp', 'total_comp', 'total compensation', 'total_compensation', 'compensation']:
-                if col in df.columns:
-                    total_comp = extract_salary_number(str(row[col]))
-                    break
-            
-            base_salary = None
-            for col in ['base', 'base salary', 'base_salary']:
-                if col in df.columns:
-                    base_salary = extract_salary_number(str(row[col]))
-                    break
-            
-            stock = None
-            for col in ['stock', 'equity', 'rsu', 'stock_value']:
-                if col in df.columns:
-                    stock = extract_salary_number(str(row[col]))
-                    break
-            
-            bonus = None
-            for col in ['bonus', 'signing bonus', 'signing_bonus']:
-                if col in df.columns:
-                    bonus = extract_salary_number(str(row[col]))
-                    break
-            
-            # Experience
-            experience = None
-            for col in ['years of experience', 'years_of_experience', 'yoe', 'experience']:
-                if col in df.columns:
-                    experience = row[col]
-                    break
-            
-            data.append({
-                'source': 'Levels.fyi',
-                'company': company,
-                'title': title,
-                'level': level,
-                'location': location,
-                'total_compensation_cad': total_comp,
-                'base_salary_cad': base_salary,
-                'stock_value_cad': stock,
-                'bonus_cad': bonus,
-                'years_of_experience': experience
-            })
-        
-    except Exception as e:
-        print(f"  Error reading CSV: {e}")
-    
-    return data
+    return load_levelsfyi_csv(csv_path, chunksize).to_dict('records')
 
 
 def parse_levelsfyi_html(html_path: Path) -> List[Dict]:
@@ -197,7 +174,7 @@ def parse_levelsfyi_html(html_path: Path) -> List[Dict]:
                 title = cell_texts[1] if len(cell_texts) > 1 else None
                 level = cell_texts[2] if len(cell_texts) > 2 else None
                 location = cell_texts[3] if len(cell_texts) > 3 else None
-                total_comp = extract_salary_number(cell_texts[4]) if len(cell_texts) > 4 else None
+                total_comp = parse_salary(cell_texts[4]) if len(cell_texts) > 4 else None
                 
                 if company and 'ai' in str(title).lower() or 'ml' in str(title).lower():
                     data.append({
@@ -304,6 +281,8 @@ def main():
                        help='Output CSV file')
     parser.add_argument('--date', default='2026-01-12',
                        help='Collection date (YYYY-MM-DD)')
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE,
+                       help='CSV rows read per chunk')
     
     args = parser.parse_args()
     
@@ -315,8 +294,6 @@ def main():
         print("3. Run: python3 scripts/scrapers/extract_levelsfyi_data.py --csv data/real_data/levelsfyi_template.csv")
         return 0
     
-    data = []
-    
     if args.csv:
         csv_path = Path(args.csv)
         if not csv_path.exists():
@@ -324,7 +301,7 @@ def main():
             return 1
         
         print(f"\n📊 Parsing Levels.fyi CSV: {csv_path.name}")
-        data = parse_levelsfyi_csv(csv_path)
+        df = load_levelsfyi_csv(csv_path, args.chunksize)
     
     elif args.html:
         html_path = Path(args.html)
@@ -333,22 +310,18 @@ def main():
             return 1
         
         print(f"\n🌐 Parsing Levels.fyi HTML: {html_path.name}")
-        data = parse_levelsfyi_html(html_path)
+        df = pd.DataFrame(parse_levelsfyi_html(html_path), columns=OUTPUT_COLUMNS)
     
     else:
         print("❌ Provide either --csv, --html, or --create-template")
         return 1
     
-    if not data:
+    if df.empty:
         print("❌ No salary data found!")
         return 1
     
     # Add metadata
-    for entry in data:
-        entry['collection_date'] = args.date
-    
-    # Convert to DataFrame
-    df = pd.DataFrame(data)
+    df['collection_date'] = args.date
     
     # Save
     out_path = Path(args.out)
@@ -7,12 +7,41 @@ with company names, levels, experience, and compensation breakdowns.
 """
 
 import re
+import sys
 import argparse
+import functools
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict
 import pandas as pd
 from bs4 import BeautifulSoup
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from company_matcher import CompanyMatcher, add_company_args, matcher_from_args
+from parse_cache import add_cache_args, cache_from_args
+from record_sink import add_sink_args, open_sink, read_back
+from salary_parser import parse_salary
+
+# Bump when extraction output changes so cached results are invalidated
+CACHE_KEY = 'levelsfyi_detailed:2'
+
+# Known company names (extend with --companies)
+COMPANY_NAMES = [
+    'Synechron', 'Matador', 'Matador.ai', 'Zapier', 'Intact', 'Intact Financial',
+    'ETS', 'Hightouch', 'Guidepoint', 'Tecsys', 'Chubb', 'Dialpad',
+    'Google', 'Meta', 'Apple', 'Amazon', 'Microsoft', 'Netflix', 'Stripe', 'Uber',
+    'Shopify', 'Twilio', 'Slack', 'Gitlab', 'Figma', 'Notion'
+]
+COMPANIES = CompanyMatcher(COMPANY_NAMES)
+
+LEVELS = ['L1', 'L2', 'L3', 'L4', 'L5', 'L6', 'L7', 'L8',
+          'Senior', 'Junior', 'Associate', 'Staff', 'Principal', 'Director']
+
+LOCATION_RE = re.compile(r'([A-Za-z\s]+),\s*([A-Z]{2}),\s*Canada|Remote')
+EXPERIENCE_RE = re.compile(r'(\d+)\s+yrs?\s+[/|]\s+(\d+)\s+yrs?', re.I)
+SALARY_BREAKDOWN_RE = re.compile(
+    r'(\d+\s*\d*\s*\d*)\s*[k|K]?\s*\|\s*(\d+\s*\d*)\s*[k|K]?\s*\|\s*(\d+\s*\d*)\s*[k|K]?')
+SALARY_RE = re.compile(r'(\d+\s*\d*\s*\d*)\s*(?:\$|k|K)\s*(?:CAD)?')
+
 
 def extract_text_content(html_path: str) -> str:
     """Extract clean text content from HTML."""
@@ -30,31 +59,7 @@ def extract_text_content(html_path: str) -> str:
     return text
 
 
-def parse_salary_value(value_str: str) -> Optional[int]:
-    """Parse salary value to CAD integer.
-    Examples: "71K", "71 000", "107k|5k|10k", "214 000 $CA"
-    """
-    if not value_str or 'N/A' in value_str:
-        return None
-    
-    # Clean up
-    value_str = value_str.strip().replace('$CA', '').replace('$', '').replace(',', '').replace(' ', '')
-    
-    # Handle variations
-    if 'k' in value_str.lower():
-        try:
-            num = float(value_str.lower().replace('k', ''))
-            return int(num * 1000)
-        except:
-            pass
-    
-    try:
-        return int(float(value_str))
-    except:
-        return None
-
-
-def extract_records_from_text(text: str) -> List[Dict]:
+def extract_records_from_text(text: str, companies: CompanyMatcher = COMPANIES) -> List[Dict]:
     """Extract salary records from plain text using pattern matching."""
     records = []
     
@@ -63,17 +68,6 @@ def extract_records_from_text(text: str) -> List[Dict]:
     
     lines = text.split('\n')
     
-    # Known company names and patterns
-    companies = {
-        'Synechron', 'Matador', 'Matador.ai', 'Zapier', 'Intact', 'Intact Financial',
-        'ETS', 'Hightouch', 'Guidepoint', 'Tecsys', 'Chubb', 'Dialpad',
-        'Google', 'Meta', 'Apple', 'Amazon', 'Microsoft', 'Netflix', 'Stripe', 'Uber',
-        'Shopify', 'Twilio', 'Slack', 'Gitlab', 'Figma', 'Notion'
-    }
-    
-    levels = ['L1', 'L2', 'L3', 'L4', 'L5', 'L6', 'L7', 'L8', 
-              'Senior', 'Junior', 'Associate', 'Staff', 'Principal', 'Director']
-    
     current_record = {}
     
     for i, line in enumerate(lines):
@@ -82,27 +76,23 @@ def extract_records_from_text(text: str) -> List[Dict]:
             continue
         
         # Check for company name
-        for company in companies:
-            if company.lower() in line.lower():
-                if current_record and 'company' in current_record:
-                    # Save previous record if complete
-                    if 'salary_cad' in current_record:
-                        records.append(current_record.copy())
-                
-                current_record = {
-                    'source': 'Levels.fyi',
-                    'collection_date': '2026-01-12',
-                    'company': company,
-                    'job_title': 'ML / AI Engineer'
-                }
-                break
+        company = companies.find(line)
+        if company:
+            if current_record and 'company' in current_record:
+                # Save previous record if complete
+                if 'salary_cad' in current_record:
+                    records.append(current_record.copy())
+            
+            current_record = {
+                'source': 'Levels.fyi',
+                'collection_date': '2026-01-12',
+                'company': company,
+                'job_title': 'ML / AI Engineer'
+            }
         
         # Look for location (City, Province pattern)
         if 'current_record' in dir() and current_record:
-            location_match = re.search(
-                r'([A-Za-z\s]+),\s*([A-Z]{2}),\s*Canada|Remote',
-                line
-            )
+            location_match = LOCATION_RE.search(line)
             if location_match:
                 if 'Remote' in line:
                     current_record['location'] = 'Remote'
@@ -110,30 +100,27 @@ def extract_records_from_text(text: str) -> List[Dict]:
                     current_record['location'] = line.strip()
             
             # Level detection
-            for level in levels:
+            for level in LEVELS:
                 if level in line:
                     current_record['level'] = level
                     break
             
             # Experience pattern (e.g., "2 yrs / 2 yrs")
-            exp_match = re.search(r'(\d+)\s+yrs?\s+[/|]\s+(\d+)\s+yrs?', line, re.I)
+            exp_match = EXPERIENCE_RE.search(line)
             if exp_match:
                 current_record['total_experience_years'] = int(exp_match.group(1))
                 current_record['company_experience_years'] = int(exp_match.group(2))
             
             # Salary with breakdown (e.g., "107 k | 5 k | 10 k")
-            salary_breakdown = re.search(
-                r'(\d+\s*\d*\s*\d*)\s*[k|K]?\s*\|\s*(\d+\s*\d*)\s*[k|K]?\s*\|\s*(\d+\s*\d*)\s*[k|K]?',
-                line
-            )
+            salary_breakdown = SALARY_BREAKDOWN_RE.search(line)
             if salary_breakdown:
                 base_str = salary_breakdown.group(1).strip()
                 stock_str = salary_breakdown.group(2).strip()
                 bonus_str = salary_breakdown.group(3).strip()
                 
-                base = parse_salary_value(base_str + 'k')
-                stock = parse_salary_value(stock_str + 'k')
-                bonus = parse_salary_value(bonus_str + 'k')
+                base = parse_salary(base_str + 'k')
+                stock = parse_salary(stock_str + 'k')
+                bonus = parse_salary(bonus_str + 'k')
                 
                 current_record['base_salary_cad'] = base
                 current_record['stock_cad'] = stock
@@ -142,10 +129,10 @@ def extract_records_from_text(text: str) -> List[Dict]:
             
             # Simple salary (e.g., "214 000" or "120K")
             elif 'salary_cad' not in current_record:
-                salary_match = re.search(r'(\d+\s*\d*\s*\d*)\s*(?:\$|k|K)\s*(?:CAD)?', line)
+                salary_match = SALARY_RE.search(line)
                 if salary_match and 'company' in current_record:
                     salary_str = salary_match.group(1).replace(' ', '')
-                    salary_val = parse_salary_value(salary_str + 'k' if len(salary_str) <= 3 else salary_str)
+                    salary_val = parse_salary(salary_str + 'k' if len(salary_str) <= 3 else salary_str)
                     if salary_val:
                         current_record['total_compensation_cad'] = salary_val
                         current_record['base_salary_cad'] = salary_val
@@ -157,28 +144,59 @@ def extract_records_from_text(text: str) -> List[Dict]:
     return records
 
 
+def extract_records_from_html(html_path, companies: CompanyMatcher = COMPANIES) -> List[Dict]:
+    """Extract salary records from one saved page (text extraction + parsing)."""
+    return extract_records_from_text(extract_text_content(str(html_path)), companies)
+
+
+DETAILED_COLUMNS = ['source', 'collection_date', 'company', 'location', 'level', 'job_title',
+                    'total_experience_years', 'company_experience_years',
+                    'total_compensation_cad', 'base_salary_cad', 'stock_cad', 'bonus_cad']
+
+
+def iter_unique_records(html_files, cache=None, companies: CompanyMatcher = COMPANIES):
+    """Yield records across pages, dropping repeats of (company, location, salary).
+
+    Only the dedup keys are kept in memory, not the records.
+    """
+    extract = functools.partial(extract_records_from_html, companies=companies)
+    # Results depend on the company dictionary too
+    cache_key = f"{CACHE_KEY}:{companies.digest}"
+    seen = set()
+    for html_path in html_files:
+        print(f"📄 {html_path.name}...")
+        if cache is not None:
+            records = cache.load_or_parse(html_path, cache_key, extract)
+        else:
+            records = extract(html_path)
+        for r in records:
+            key = (r.get('company'), r.get('location'), r.get('total_compensation_cad'))
+            if key not in seen:
+                seen.add(key)
+                yield r
+        print(f"  ✓ {len(records)} records")
+
+
 def main():
     parser = argparse.ArgumentParser(description='Extract Levels.fyi detailed salary records')
     parser.add_argument('--html', help='Single HTML file path')
     parser.add_argument('--html-dir', help='Directory containing HTML files')
     parser.add_argument('--out', default='data/real_data/stat_real_data_levelsfyi_detailed.csv',
-                       help='Output CSV file')
+                       help='Output file (.csv, .parquet or .jsonl)')
+    add_company_args(parser)
+    add_cache_args(parser)
+    add_sink_args(parser)
     
     args = parser.parse_args()
     
-    all_records = []
+    cache = cache_from_args(args)
     
     if args.html:
         html_path = Path(args.html)
         if not html_path.exists():
             print(f"❌ {html_path} not found")
             return 1
-        
-        print(f"📄 Processing: {html_path.name}")
-        text = extract_text_content(str(html_path))
-        records = extract_records_from_text(text)
-        all_records.extend(records)
-        print(f"✓ Extracted {len(records)} records")
+        html_files = [html_path]
     
     elif args.html_dir:
         html_dir = Path(args.html_dir)
@@ -188,47 +206,27 @@ def main():
         
         html_files = sorted(html_dir.glob('*.html'))
         print(f"\n📂 Processing {len(html_files)} files...\n")
-        
-        for html_path in html_files:
-            print(f"📄 {html_path.name}...")
-            text = extract_text_content(str(html_path))
-            records = extract_records_from_text(text)
-            all_records.extend(records)
-            print(f"  ✓ {len(records)} records")
     
     else:
         print("❌ Provide --html or --html-dir")
         return 1
     
-    if not all_records:
-        print("❌ No records extracted")
-        return 1
-    
-    # Remove duplicates by (company, location, salary)
-    seen = set()
-    unique_records = []
-    for r in all_records:
-        key = (r.get('company'), r.get('location'), r.get('total_compensation_cad'))
-        if key not in seen:
-            seen.add(key)
-            unique_records.append(r)
+    # Unique records go straight from the extractor to disk, one batch at a time
+    out_path = Path(args.out)
+    with open_sink(out_path, DETAILED_COLUMNS, args.batch_size) as sink:
+        sink.write_many(iter_unique_records(html_files, cache, matcher_from_args(args, COMPANIES)))
     
-    # Convert to DataFrame
-    df = pd.DataFrame(unique_records)
+    print(cache.summary())
     
-    # Reorder and select columns
-    cols = ['source', 'collection_date', 'company', 'location', 'level', 'job_title',
-            'total_experience_years', 'company_experience_years',
-            'total_compensation_cad', 'base_salary_cad', 'stock_cad', 'bonus_cad']
-    df = df[[c for c in cols if c in df.columns]]
+    if not sink.count:
+        print("❌ No records extracted")
+        return 1
     
-    # Save
-    out_path = Path(args.out)
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    df.to_csv(out_path, index=False)
+    # The summary only needs a few columns: read those back
+    df = read_back(out_path, ['company', 'level', 'total_compensation_cad'])
     
     print(f"\n{'='*70}")
-    print(f"✅ Extracted {len(df)} unique records → {out_path}")
+    print(f"✅ Extracted {sink.count} unique records → {out_path}")
     print(f"{'='*70}\n")
     
     # Summary stats
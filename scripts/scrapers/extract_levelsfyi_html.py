@@ -11,39 +11,20 @@ Levels.fyi data includes:
 """
 
 import re
+import sys
 import json
 from pathlib import Path
 from bs4 import BeautifulSoup
 import pandas as pd
 import argparse
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from salary_parser import find_amounts
+
 
 def extract_salary_numbers(text):
-    """Extract all salary numbers from text."""
-    if not text:
-        return []
-    
-    # Pattern: $123K or 123,456 or 123K
-    pattern = r'[\$]?([\d,]+\.?\d*)[KkM]?'
-    matches = re.findall(pattern, str(text))
-    
-    numbers = []
-    for match in matches:
-        try:
-            num_str = match.replace(',', '')
-            if 'K' in str(text) or 'k' in str(text):
-                num = int(float(num_str) * 1000)
-            elif 'M' in str(text):
-                num = int(float(num_str) * 1000000)
-            else:
-                num = int(float(num_str))
-            
-            if 50000 <= num <= 500000:  # Reasonable salary range
-                numbers.append(num)
-        except:
-            pass
-    
-    return numbers
+    """Salary-sized amounts (50K-500K) in text."""
+    return [int(round(v)) for v in find_amounts(text) if 50000 <= v <= 500000]
 
 
 def extract_levelsfyi_data(html_path):
@@ -14,55 +14,42 @@ Each record contains:
 """
 
 import re
+import sys
 import argparse
+import functools
 from pathlib import Path
 from bs4 import BeautifulSoup
 import pandas as pd
 from typing import List, Dict
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from company_matcher import CompanyMatcher, add_company_args, matcher_from_args
+from parse_cache import add_cache_args, cache_from_args
+from record_sink import add_sink_args, open_sink, read_back
+from salary_parser import parse_compensation
 
-def parse_salary_string(salary_text):
-    """Parse salary with possible breakdown.
-    Examples:
-    - "71 000 $CA"
-    - "214 000 $CA" 
-    - "120 k | N/A | N/A"
-    - "107 k | 5 k | 10 k"
-    - "875,5 k $CA includes Equity"
-    """
-    if not salary_text:
-        return None, None, None, None
-    
-    # Remove currency markers and clean up
-    text = salary_text.replace('$CA', '').replace('$', '').replace(',', '.').strip()
-    
-    # Check if has breakdown (| separated)
-    if '|' in text:
-        parts = [p.strip() for p in text.split('|')]
-        try:
-            total = int(float(parts[0].replace('k', '').replace('K', '').strip()) * 1000) if parts[0] and 'N/A' not in parts[0] else None
-            base = int(float(parts[1].replace('k', '').replace('K', '').strip()) * 1000) if len(parts) > 1 and parts[1] and 'N/A' not in parts[1] else None
-            stock = int(float(parts[2].replace('k', '').replace('K', '').strip()) * 1000) if len(parts) > 2 and parts[2] and 'N/A' not in parts[2] else None
-            bonus = int(float(parts[3].replace('k', '').replace('K', '').strip()) * 1000) if len(parts) > 3 and parts[3] and 'N/A' not in parts[3] else None
-            
-            # If total not provided but have base, calculate
-            if not total and base:
-                total = (base or 0) + (stock or 0) + (bonus or 0)
-            
-            return total, base, stock, bonus
-        except:
-            pass
-    
-    # Single number (just total)
-    try:
-        match = re.search(r'([\d.]+)\s*[k|K]?', text)
-        if match:
-            total = int(float(match.group(1)) * 1000)
-            return total, None, None, None
-    except:
-        pass
-    
-    return None, None, None, None
+# Bump when extraction output changes so cached results are invalidated
+CACHE_KEY = 'levelsfyi_records:2'
+
+# A line that is only a compensation string: "107 k | 5 k | N/A", "214 000 $CA includes Equity"
+_AMOUNT = r'\$?\s*\d[\d\s.,]*(?:[kKmM]\b)?\s*(?:\$\s*CA|\$|CAD|USD)?'
+COMPENSATION_LINE_RE = re.compile(
+    rf'{_AMOUNT}(?:\s*\|\s*(?:N/A|{_AMOUNT}))*(?:\s*includes?\s+Equity)?', re.I)
+
+# Company names to match (extend with --companies)
+COMPANY_KEYWORDS = [
+    'Synechron', 'Matador', 'Zapier', 'Intact', 'ETS', 'Hightouch',
+    'Guidepoint', 'Tecsys', 'Chubb', 'Dialpad', 'Google', 'Meta', 'Amazon',
+    'Microsoft', 'Apple', 'Netflix', 'Stripe', 'Airbnb', 'Uber', 'Shopify'
+]
+COMPANIES = CompanyMatcher(COMPANY_KEYWORDS)
+
+# Location patterns (City, Province, Country)
+LOCATION_RE = re.compile(
+    r'([A-Za-z\s]+),\s*([A-Z]{2}),\s*Canada|([A-Za-z\s]+),\s*ON|([A-Za-z\s]+),\s*QC|Remote')
+# Level detection (L1-L8, Senior, Associate, etc.)
+LEVEL_RE = re.compile(r'\b(L[1-8]|Senior|Junior|Associate|Staff|Principal|Director)\b', re.I)
+EXPERIENCE_RE = re.compile(r'(\d+)\s*yrs?(?:\s+.*?(\d+)\s*yrs?)?', re.I)
 
 
 def parse_experience(exp_text):
@@ -81,7 +68,7 @@ def parse_experience(exp_text):
     return None, None
 
 
-def extract_levelsfyi_records(html_path) -> List[Dict]:
+def extract_levelsfyi_records(html_path, companies: CompanyMatcher = COMPANIES) -> List[Dict]:
     """Extract individual salary records from Levels.fyi HTML."""
     
     with open(html_path, 'r', encoding='utf-8') as f:
@@ -110,28 +97,12 @@ def extract_levelsfyi_records(html_path) -> List[Dict]:
         if not line:
             continue
         
-        # Company names to match
-        company_keywords = [
-            'Synechron', 'Matador', 'Zapier', 'Intact', 'ETS', 'Hightouch', 
-            'Guidepoint', 'Tecsys', 'Chubb', 'Dialpad', 'Google', 'Meta', 'Amazon',
-            'Microsoft', 'Apple', 'Netflix', 'Stripe', 'Airbnb', 'Uber', 'Shopify'
-        ]
-        
         # Check if this line contains a company name
-        company_found = None
-        for company in company_keywords:
-            if company.lower() in line.lower():
-                company_found = company
-                break
-        
+        company_found = companies.find(line)
         if company_found:
             current_record['company'] = company_found
         
-        # Location patterns (City, Province, Country)
-        location_match = re.search(
-            r'([A-Za-z\s]+),\s*([A-Z]{2}),\s*Canada|([A-Za-z\s]+),\s*ON|([A-Za-z\s]+),\s*QC|Remote',
-            line
-        )
+        location_match = LOCATION_RE.search(line)
         if location_match:
             if 'Remote' in line:
                 current_record['location'] = 'Remote'
@@ -140,8 +111,7 @@ def extract_levelsfyi_records(html_path) -> List[Dict]:
             else:
                 current_record['location'] = line
         
-        # Level detection (L1-L8, Senior, Associate, etc.)
-        level_match = re.search(r'\b(L[1-8]|Senior|Junior|Associate|Staff|Principal|Director)\b', line, re.I)
+        level_match = LEVEL_RE.search(line)
         if level_match:
             current_record['level'] = level_match.group(1)
         
@@ -152,7 +122,7 @@ def extract_levelsfyi_records(html_path) -> List[Dict]:
             current_record['job_title'] = 'Software Engineer'
         
         # Experience pattern
-        exp_match = re.search(r'(\d+)\s*yrs?(?:\s+.*?(\d+)\s*yrs?)?', line, re.I)
+        exp_match = EXPERIENCE_RE.search(line)
         if exp_match:
             total_exp = int(exp_match.group(1))
             company_exp = int(exp_match.group(2)) if exp_match.group(2) else None
@@ -161,10 +131,10 @@ def extract_levelsfyi_records(html_path) -> List[Dict]:
                 current_record['company_experience_years'] = company_exp
         
         # Salary patterns
-        salary_match = re.search(r'(\d+\s*\d*)\s*(?:\$|k|K)?(?:\s*CAD?|\s*USD?)?\s*(?:includes?\s+Equity)?', line)
+        salary_match = COMPENSATION_LINE_RE.fullmatch(line)
         if salary_match and len(current_record) > 2:  # Only if we have some context
             salary_str = line
-            total, base, stock, bonus = parse_salary_string(salary_str)
+            total, base, stock, bonus = parse_compensation(salary_str)
             
             if total:
                 current_record['total_compensation_cad'] = total
@@ -203,7 +173,7 @@ def extract_levelsfyi_records(html_path) -> List[Dict]:
             
             # Parse salary
             salary_str = match.group(9)
-            total, base, stock, bonus = parse_salary_string(salary_str + ' $CA')
+            total, base, stock, bonus = parse_compensation(salary_str + ' $CA')
             record['total_compensation_cad'] = total
             record['base_salary_cad'] = base
             record['stock_cad'] = stock
@@ -225,27 +195,47 @@ def extract_levelsfyi_records(html_path) -> List[Dict]:
     return unique_records
 
 
+RECORD_COLUMNS = ['source', 'collection_date', 'company', 'location', 'city', 'province',
+                  'level', 'job_title', 'total_experience_years', 'company_experience_years',
+                  'total_compensation_cad', 'base_salary_cad', 'stock_cad', 'bonus_cad', 'posted_date']
+
+
+def iter_levelsfyi_records(html_files, cache=None, companies: CompanyMatcher = COMPANIES):
+    """Yield the records of each page in turn, without collecting them."""
+    extract = functools.partial(extract_levelsfyi_records, companies=companies)
+    # Results depend on the company dictionary too
+    cache_key = f"{CACHE_KEY}:{companies.digest}"
+    for html_path in html_files:
+        print(f"📄 {html_path.name}")
+        if cache is not None:
+            records = cache.load_or_parse(html_path, cache_key, extract)
+        else:
+            records = extract(html_path)
+        yield from records
+        print(f"  ✓ Found {len(records)} records")
+
+
 def main():
     parser = argparse.ArgumentParser(description='Extract individual salary records from Levels.fyi')
     parser.add_argument('--html', help='Single HTML file')
     parser.add_argument('--html-dir', help='Directory with multiple HTML files')
     parser.add_argument('--out', default='data/real_data/stat_real_data_levelsfyi_records.csv',
-                       help='Output CSV file')
+                       help='Output file (.csv, .parquet or .jsonl)')
     parser.add_argument('--date', default='2026-01-12', help='Collection date')
+    add_company_args(parser)
+    add_cache_args(parser)
+    add_sink_args(parser)
     
     args = parser.parse_args()
     
-    all_records = []
+    cache = cache_from_args(args)
     
     if args.html:
         html_path = Path(args.html)
         if not html_path.exists():
             print(f"❌ Error: {html_path} not found")
             return 1
-        print(f"\n📄 Processing: {html_path.name}")
-        records = extract_levelsfyi_records(html_path)
-        all_records.extend(records)
-        print(f"  Found {len(records)} records")
+        html_files = [html_path]
     
     elif args.html_dir:
         html_dir = Path(args.html_dir)
@@ -253,40 +243,29 @@ def main():
             print(f"❌ Error: {html_dir} not found")
             return 1
         
-        html_files = list(html_dir.glob('*.html'))
+        html_files = sorted(html_dir.glob('*.html'))
         print(f"\n📂 Processing {len(html_files)} HTML files...\n")
-        
-        for html_path in sorted(html_files):
-            print(f"📄 {html_path.name}")
-            records = extract_levelsfyi_records(html_path)
-            all_records.extend(records)
-            print(f"  ✓ Found {len(records)} records")
     
     else:
         print("❌ Provide either --html or --html-dir")
         return 1
     
-    if not all_records:
-        print("❌ No records found!")
-        return 1
+    # Records go straight from the extractor to disk, one batch at a time
+    out_path = Path(args.out)
+    with open_sink(out_path, RECORD_COLUMNS, args.batch_size) as sink:
+        sink.write_many(iter_levelsfyi_records(html_files, cache, matcher_from_args(args, COMPANIES)))
     
-    # Convert to DataFrame
-    df = pd.DataFrame(all_records)
+    print(cache.summary())
     
-    # Reorder columns
-    cols = ['source', 'collection_date', 'company', 'location', 'city', 'province',
-            'level', 'job_title', 'total_experience_years', 'company_experience_years',
-            'total_compensation_cad', 'base_salary_cad', 'stock_cad', 'bonus_cad', 'posted_date']
-    cols = [c for c in cols if c in df.columns]
-    df = df[cols]
+    if not sink.count:
+        print("❌ No records found!")
+        return 1
     
-    # Save
-    out_path = Path(args.out)
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    df.to_csv(out_path, index=False)
+    # The summary only needs a few columns: read those back
+    df = read_back(out_path, ['company', 'city', 'level', 'total_compensation_cad'])
     
     print(f"\n{'='*70}")
-    print(f"✅ Saved {len(df)} records to {out_path}")
+    print(f"✅ Saved {sink.count} records to {out_path}")
     print(f"{'='*70}\n")
     
     # Summary
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Precompiled selectors for Glassdoor's CSS-module markup.
+
+Glassdoor class names are a stable prefix plus a build hash
+(e.g. 'salary-card_EmployerName__3xk1p'). Instead of passing a fresh
+re.compile(...) to every soup.find() call, each group of prefixes is
+compiled once into a single alternation, and all fields of a group are
+resolved in one walk over the subtree.
+"""
+
+import re
+import time
+from typing import Dict, List, Tuple
+
+from bs4 import Tag
+
+
+class ClassSelector:
+    """Match several (tag name, class prefix) fields in one pass over a subtree.
+
+    fields maps a field key to (tag_name, prefix) or (tag_name, prefix, attr).
+    attr defaults to 'class'; any other attribute is matched on its string value.
+    Several fields may share a prefix (e.g. the same class on an <a> or a
+    <span>): the prefix is matched once and each field checks its tag name.
+    """
+
+    def __init__(self, fields: Dict[str, Tuple]):
+        self.fields = fields
+        self.tag_names = {}
+        self.patterns = {}
+        self.keys_by_group = {}
+        by_attr = {}
+        for key, spec in fields.items():
+            name, prefix = spec[0], spec[1]
+            attr = spec[2] if len(spec) > 2 else 'class'
+            self.tag_names[key] = name
+            by_attr.setdefault(attr, {}).setdefault(prefix, []).append(key)
+        for attr, by_prefix in by_attr.items():
+            groups = []
+            # Longest first, so a prefix of another prefix does not shadow it
+            for prefix in sorted(by_prefix, key=len, reverse=True):
+                group = f'p{len(self.keys_by_group)}'
+                self.keys_by_group[group] = by_prefix[prefix]
+                groups.append(f'(?P<{group}>{re.escape(prefix)})')
+            self.patterns[attr] = re.compile('|'.join(groups))
+
+    def match(self, tag: Tag) -> List[str]:
+        """Return the field keys this tag satisfies."""
+        keys = []
+        for attr, pattern in self.patterns.items():
+            value = tag.attrs.get(attr)
+            if not value:
+                continue
+            values = value if isinstance(value, list) else [value]
+            for v in values:
+                m = pattern.search(v)
+                if not m:
+                    continue
+                for key in self.keys_by_group[m.lastgroup]:
+                    if self.tag_names[key] == tag.name and key not in keys:
+                        keys.append(key)
+        return keys
+
+    def first(self, root: Tag) -> Dict[str, Tag]:
+        """First matching descendant per field (document order), like soup.find()."""
+        found = {}
+        wanted = len(self.fields)
+        for tag in root.find_all(True):
+            for key in self.match(tag):
+                if key not in found:
+                    found[key] = tag
+            if len(found) == wanted:
+                break
+        return found
+
+    def all(self, root: Tag) -> Dict[str, List[Tag]]:
+        """All matching descendants per field (document order), like soup.find_all()."""
+        found = {key: [] for key in self.fields}
+        for tag in root.find_all(True):
+            for key in self.match(tag):
+                found[key].append(tag)
+        return found
+
+
+# Page-level elements: header stats, career steps and the salary card list
+PAGE = ClassSelector({
+    'base_pay': ('span', 'TotalPayRange_StyledAverageBasePay'),
+    'avg_comp': ('span', 'TotalPayRange_StyledAverageComp'),
+    'companies_count': ('p', 'SalariesSubHeader_DesktopSalariesCount'),
+    'career_step': ('div', 'occ-career-progress', 'data-test'),
+    'salary_item': ('div', 'SalariesList_Item'),
+})
+
+# Fields inside one salary card
+CARD = ClassSelector({
+    'company_name': ('p', 'salary-card_EmployerName'),
+    'rating': ('p', 'salary-card_Rating'),
+    'total_pay': ('div', 'salary-card_TotalPay'),
+    'median': ('div', 'salary-card_BreakdownBold'),
+    'job_title': ('section', 'salary-card_TitleTrim'),
+    'open_jobs': ('span', 'button_ButtonContent'),
+})
+
+# Title element inside one career progression step
+CAREER_STEP = ClassSelector({
+    'title_link': ('a', 'CareerSteps_JobTitleLink'),
+    'title_span': ('span', 'CareerSteps_JobTitleLink'),
+})
+
+OPEN_JOBS_RE = re.compile(r'(\d+)\s+open')
+COMPANIES_COUNT_RE = re.compile(r'(\d+)\s+companies')
+
+
+def scan_page(soup) -> Dict[str, List[Tag]]:
+    """Collect every page-level element in a single pass over the document."""
+    return PAGE.all(soup)
+
+
+class PageTimer:
+    """Accumulate wall-clock timings (ms) for the stages of one page."""
+
+    def __init__(self):
+        self.timings = {}
+        self._start = time.perf_counter()
+
+    def lap(self, stage: str):
+        now = time.perf_counter()
+        self.timings[stage] = round((now - self._start) * 1000, 1)
+        self._start = now
+
+    def summary(self) -> str:
+        total = sum(self.timings.values())
+        stages = ' + '.join(f"{stage} {ms:.1f}" for stage, ms in self.timings.items())
+        return f"{total:.1f} ms ({stages})"
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Disk-backed HTTP cache with conditional revalidation for the scrapers.
+
+Stores each GET response body with its ETag / Last-Modified validators:
+- while an entry is fresh (Cache-Control max-age, or the default max age)
+  it is served from disk without a request
+- once stale, the request is sent with If-None-Match / If-Modified-Since;
+  a 304 refreshes the entry and the cached body is returned
+- no-store responses are never cached; the cache is bounded in size,
+  evicting least recently used entries
+
+    cache = HttpCache('data/.http_cache', max_mb=256)
+    session = CachedSession(cache)          # drop-in requests.Session
+    fetcher = CachingFetcher(cache, ...)    # async_fetch.AsyncFetcher
+
+Every response gets a `cache_status` of 'hit', 'revalidated' or 'miss'.
+"""
+
+import hashlib
+import os
+import pickle
+import re
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+DEFAULT_CACHE_DIR = 'data/.http_cache'
+DEFAULT_MAX_MB = 256
+
+# Headers that describe the transfer, not the (already decoded) body
+TRANSFER_HEADERS = {'content-encoding', 'transfer-encoding', 'content-length', 'connection'}
+MAX_AGE_RE = re.compile(r'max-age=(\d+)')
+
+
+class CacheEntry:
+    def __init__(self, url: str, status: int, headers: Dict[str, str], body: bytes):
+        self.url = url
+        self.status = status
+        self.headers = {k: v for k, v in headers.items() if k.lower() not in TRANSFER_HEADERS}
+        self.body = body
+        self.stored_at = time.time()
+
+    @property
+    def etag(self) -> Optional[str]:
+        return CaseInsensitiveDict(self.headers).get('ETag')
+
+    @property
+    def last_modified(self) -> Optional[str]:
+        return CaseInsensitiveDict(self.headers).get('Last-Modified')
+
+    def max_age(self, default: float) -> float:
+        cache_control = CaseInsensitiveDict(self.headers).get('Cache-Control', '')
+        if 'no-cache' in cache_control:
+            return 0
+        match = MAX_AGE_RE.search(cache_control)
+        return float(match.group(1)) if match else default
+
+    def is_fresh(self, default_max_age: float) -> bool:
+        return time.time() - self.stored_at < self.max_age(default_max_age)
+
+
+def is_storable(status: int, headers) -> bool:
+    return status == 200 and 'no-store' not in CaseInsensitiveDict(headers).get('Cache-Control', '')
+
+
+class HttpCache:
+    """Pickled CacheEntries keyed by URL, with LRU eviction by total size."""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_mb: float = DEFAULT_MAX_MB,
+                 default_max_age: float = 0):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.default_max_age = default_max_age
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self._size = None  # bytes on disk, computed on first store()
+
+    def _path(self, url: str) -> Path:
+        return self.cache_dir / f"{hashlib.sha256(url.encode()).hexdigest()}.pkl"
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        path = self._path(url)
+        try:
+            with open(path, 'rb') as f:
+                entry = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+        os.utime(path)  # mark as recently used
+        return entry
+
+    def store(self, entry: CacheEntry):
+        path = self._path(entry.url)
+        tmp = path.with_suffix(f'.tmp{os.getpid()}')
+        with open(tmp, 'wb') as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+        if self._size is None:
+            self._size = sum(e.stat().st_size for e in self.cache_dir.glob('*.pkl'))
+        else:
+            self._size += path.stat().st_size
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def conditional_headers(self, entry: Optional[CacheEntry]) -> Dict[str, str]:
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def refresh(self, entry: CacheEntry, headers) -> CacheEntry:
+        """Handle a 304: keep the body, take the new validators / max-age."""
+        entry.headers.update({k: v for k, v in headers.items()
+                              if k.lower() not in TRANSFER_HEADERS})
+        entry.stored_at = time.time()
+        self.store(entry)
+        self.revalidated += 1
+        return entry
+
+    def evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes."""
+        entries = []
+        for entry in self.cache_dir.glob('*.pkl'):
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            entry.unlink(missing_ok=True)
+            total -= size
+        self._size = total
+
+    def summary(self) -> str:
+        return (f"HTTP cache: {self.hits} hits, {self.revalidated} revalidated (304), "
+                f"{self.misses} misses ({self.cache_dir})")
+
+
+def _response_from_entry(entry: CacheEntry, request, cache_status: str) -> requests.Response:
+    response = requests.Response()
+    response.status_code = entry.status
+    response._content = entry.body
+    response.headers = CaseInsensitiveDict(entry.headers)
+    response.url = entry.url
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    response.request = request
+    response.cache_status = cache_status
+    return response
+
+
+class CachedSession(requests.Session):
+    """requests.Session whose GETs go through an HttpCache."""
+
+    def __init__(self, cache: HttpCache):
+        super().__init__()
+        self.cache = cache
+
+    def request(self, method, url, params=None, headers=None, **kwargs):
+        if method.upper() != 'GET':
+            return super().request(method, url, params=params, headers=headers, **kwargs)
+
+        prepared = self.prepare_request(requests.Request(method, url, params=params, headers=headers))
+        entry = self.cache.get(prepared.url)
+        if entry is not None and entry.is_fresh(self.cache.default_max_age):
+            self.cache.hits += 1
+            return _response_from_entry(entry, prepared, 'hit')
+
+        headers = {**(headers or {}), **self.cache.conditional_headers(entry)}
+        response = super().request(method, url, params=params, headers=headers, **kwargs)
+        if response.status_code == 304 and entry is not None:
+            return _response_from_entry(self.cache.refresh(entry, response.headers), prepared, 'revalidated')
+
+        self.cache.misses += 1
+        if is_storable(response.status_code, response.headers):
+            self.cache.store(CacheEntry(prepared.url, response.status_code,
+                                        dict(response.headers), response.content))
+        response.cache_status = 'miss'
+        return response
+
+
+try:
+    from async_fetch import AsyncFetcher
+except ImportError:  # aiohttp not installed: only CachedSession is available
+    AsyncFetcher = None
+
+
+def _job_url(job) -> str:
+    return requests.Request('GET', job.url, params=job.params).prepare().url
+
+
+if AsyncFetcher is not None:
+    class CachingFetcher(AsyncFetcher):
+        """AsyncFetcher whose requests go through an HttpCache."""
+
+        def __init__(self, cache: HttpCache, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.cache = cache
+
+        def _lookup(self, job):
+            entry = self.cache.get(_job_url(job))
+            if entry is not None and entry.is_fresh(self.cache.default_max_age):
+                self.cache.hits += 1
+                return entry.status, entry.body, entry.headers
+            return None
+
+        async def _request(self, session, job):
+            url = _job_url(job)
+            entry = self.cache.get(url)
+            async with session.get(url, headers=self.cache.conditional_headers(entry)) as response:
+                body = await response.read()
+                status, headers = response.status, dict(response.headers)
+            if status == 304 and entry is not None:
+                entry = self.cache.refresh(entry, headers)
+                return entry.status, entry.body, entry.headers
+
+            self.cache.misses += 1
+            if is_storable(status, headers):
+                self.cache.store(CacheEntry(url, status, headers, body))
+            return status, body, headers
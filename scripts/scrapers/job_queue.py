@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Persistent, resumable work queue for scraping sweeps (SQLite).
+
+Each unit of work is one (source, query, page) fetch. Units and their
+extracted records live in a SQLite file, so a sweep that dies halfway
+(timeout, Ctrl-C, crash) picks up where it stopped on the next run:
+- enqueue() is idempotent: re-running the same sweep re-adds nothing
+- completed units are buffered and flushed in one transaction every
+  `batch_size` completions (and on close), records included
+- pending() returns units not done yet; failed units are retried up to
+  max_attempts times
+
+    queue = JobQueue('data/.scrape_queue.sqlite', run='2026-01-sweep')
+    queue.enqueue([('indeed', {'job_title': ..., 'location': ...}, 0), ...])
+    for unit in queue.pending():
+        queue.complete(unit, records)
+    queue.flush()
+    records = queue.results()
+"""
+
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+DEFAULT_QUEUE_PATH = 'data/.scrape_queue.sqlite'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    run TEXT NOT NULL,
+    source TEXT NOT NULL,
+    query TEXT NOT NULL,
+    page INTEGER NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    updated_at REAL,
+    UNIQUE (run, source, query, page)
+);
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    job_id INTEGER NOT NULL REFERENCES jobs(id),
+    record TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_job ON results(job_id);
+"""
+
+
+class WorkUnit:
+    """One (source, query, page) fetch, as stored in the queue."""
+
+    def __init__(self, id: int, source: str, query: Dict, page: int, attempts: int = 0):
+        self.id = id
+        self.source = source
+        self.query = query
+        self.page = page
+        self.attempts = attempts
+
+    def __repr__(self):
+        return f"WorkUnit({self.id}, {self.source!r}, {self.query!r}, page={self.page})"
+
+
+class JobQueue:
+    def __init__(self, path=DEFAULT_QUEUE_PATH, run: str = 'default', batch_size: int = 10,
+                 max_attempts: int = 3):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.run = run
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript(SCHEMA)
+        self._done: List[Tuple[WorkUnit, List[Dict]]] = []
+        self._failed: List[Tuple[WorkUnit, str]] = []
+
+    def enqueue(self, units: Iterable[Tuple[str, Dict, int]]) -> int:
+        """Add (source, query, page) units; returns how many were new."""
+        rows = [(self.run, source, json.dumps(query, sort_keys=True), page)
+                for source, query, page in units]
+        with self.conn:
+            before = self.conn.total_changes
+            self.conn.executemany(
+                'INSERT OR IGNORE INTO jobs (run, source, query, page) VALUES (?, ?, ?, ?)', rows)
+            return self.conn.total_changes - before
+
+    def pending(self) -> List[WorkUnit]:
+        """Units still to do, in enqueue order (failed ones under max_attempts included)."""
+        rows = self.conn.execute(
+            "SELECT id, source, query, page, attempts FROM jobs "
+            "WHERE run = ? AND (status = 'pending' OR (status = 'failed' AND attempts < ?)) "
+            "ORDER BY id", (self.run, self.max_attempts))
+        return [WorkUnit(id, source, json.loads(query), page, attempts)
+                for id, source, query, page, attempts in rows]
+
+    def complete(self, unit: WorkUnit, records: List[Dict]):
+        self._done.append((unit, records))
+        if len(self._done) + len(self._failed) >= self.batch_size:
+            self.flush()
+
+    def fail(self, unit: WorkUnit, error: str):
+        self._failed.append((unit, error))
+        if len(self._done) + len(self._failed) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Write buffered completions and failures in one transaction."""
+        if not self._done and not self._failed:
+            return
+        now = time.time()
+        with self.conn:
+            for unit, records in self._done:
+                # Replace, in case an earlier attempt got as far as writing records
+                self.conn.execute('DELETE FROM results WHERE job_id = ?', (unit.id,))
+                self.conn.executemany('INSERT INTO results (job_id, record) VALUES (?, ?)',
+                                      [(unit.id, json.dumps(r, ensure_ascii=False)) for r in records])
+                self.conn.execute(
+                    "UPDATE jobs SET status = 'done', attempts = attempts + 1, error = NULL, "
+                    "updated_at = ? WHERE id = ?", (now, unit.id))
+            for unit, error in self._failed:
+                self.conn.execute(
+                    "UPDATE jobs SET status = 'failed', attempts = attempts + 1, error = ?, "
+                    "updated_at = ? WHERE id = ?", (error, now, unit.id))
+        self._done, self._failed = [], []
+
+    def iter_results(self) -> Iterator[Dict]:
+        """Records of this run in enqueue order, streamed from the database."""
+        rows = self.conn.execute(
+            'SELECT r.record FROM results r JOIN jobs j ON j.id = r.job_id '
+            'WHERE j.run = ? ORDER BY j.id, r.id', (self.run,))
+        for (record,) in rows:
+            yield json.loads(record)
+
+    def results(self) -> List[Dict]:
+        """All records of this run, in enqueue order."""
+        return list(self.iter_results())
+
+    def counts(self) -> Dict[str, int]:
+        rows = self.conn.execute('SELECT status, COUNT(*) FROM jobs WHERE run = ? GROUP BY status',
+                                 (self.run,))
+        return dict(rows.fetchall())
+
+    def reset(self):
+        """Forget this run's units and results (start the sweep over)."""
+        with self.conn:
+            self.conn.execute('DELETE FROM results WHERE job_id IN (SELECT id FROM jobs WHERE run = ?)',
+                              (self.run,))
+            self.conn.execute('DELETE FROM jobs WHERE run = ?', (self.run,))
+
+    def summary(self) -> str:
+        counts = self.counts()
+        parts = ', '.join(f"{n} {status}" for status, n in sorted(counts.items()))
+        return f"Job queue '{self.run}': {parts or 'empty'} ({self.path})"
+
+    def close(self):
+        self.flush()
+        self.conn.close()
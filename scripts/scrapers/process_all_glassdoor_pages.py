@@ -6,33 +6,37 @@ Process all Glassdoor HTML files in a directory and extract:
 3. Consolidated data across all locations
 """
 
-import re
+import os
+import sys
 import json
 import argparse
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from bs4 import BeautifulSoup
-import pandas as pd
 from typing import Dict, List, Tuple
 
+from glassdoor_selectors import (
+    CARD, CAREER_STEP, COMPANIES_COUNT_RE, OPEN_JOBS_RE, PageTimer, scan_page
+)
 
-def extract_salary_number(text):
-    """Extract numeric salary from text like '$86K' or '$117K'."""
-    if not text:
-        return None
-    
-    clean = text.strip().replace('$', '').replace(',', '')
-    
-    if 'K' in clean or 'k' in clean:
-        num_str = clean.replace('K', '').replace('k', '').strip()
-        try:
-            return int(float(num_str) * 1000)
-        except:
-            return None
-    
-    try:
-        return int(float(clean))
-    except:
-        return None
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from parse_cache import add_cache_args, cache_from_args
+from record_sink import add_sink_args, open_sink, read_back, write_records
+from salary_parser import parse_range, parse_salary
+
+# Bump when extraction output changes so cached results are invalidated
+CACHE_KEY = 'glassdoor_pages:3'
+
+# Consolidated file columns (fixed, since a page may lack some of the stats)
+COMPANY_COLUMNS = ['company_name', 'rating', 'job_title', 'total_pay_range', 'min_salary_cad',
+                   'max_salary_cad', 'median_salary_cad', 'open_jobs',
+                   'location', 'collection_date', 'source']
+LOCATION_STATS_COLUMNS = ['overall_min_cad', 'overall_max_cad', 'overall_median_cad', 'total_companies',
+                          'location', 'source_file', 'collection_date', 'source']
+# Numeric columns that may be empty on the first pages (Parquet schema)
+COMPANY_TYPES = {c: 'float64' for c in ['rating', 'min_salary_cad', 'max_salary_cad',
+                                        'median_salary_cad', 'open_jobs']}
+LOCATION_STATS_TYPES = {c: 'float64' for c in LOCATION_STATS_COLUMNS[:4]}
 
 
 def extract_location_from_filename(filename: str) -> str:
@@ -48,32 +52,30 @@ def extract_location_from_filename(filename: str) -> str:
     return name.capitalize()
 
 
-def extract_overall_stats(soup) -> Dict:
+def extract_overall_stats(soup, page: Dict = None) -> Dict:
     """Extract overall salary statistics from the page header."""
     stats = {}
+    if page is None:
+        page = scan_page(soup)
     
     # Base pay range (e.g., "$72K - $110K")
-    base_pay_elem = soup.find('span', class_=re.compile('TotalPayRange_StyledAverageBasePay'))
-    if base_pay_elem:
-        base_pay_text = base_pay_elem.get_text(strip=True)
-        parts = base_pay_text.split('–') or base_pay_text.split('-')
-        if len(parts) == 2:
-            stats['overall_min_cad'] = extract_salary_number(parts[0])
-            stats['overall_max_cad'] = extract_salary_number(parts[1])
+    if page['base_pay']:
+        base_pay_text = page['base_pay'][0].get_text(strip=True)
+        base_pay = parse_range(base_pay_text)
+        if base_pay:
+            stats['overall_min_cad'], stats['overall_max_cad'] = base_pay
     
     # Average/median base pay
-    avg_comp_elem = soup.find('span', class_=re.compile('TotalPayRange_StyledAverageComp'))
-    if avg_comp_elem:
-        avg_text = avg_comp_elem.get_text(strip=True)
-        stats['overall_median_cad'] = extract_salary_number(avg_text)
+    if page['avg_comp']:
+        avg_text = page['avg_comp'][0].get_text(strip=True)
+        stats['overall_median_cad'] = parse_salary(avg_text)
     
     # Career progression data
-    career_steps = soup.find_all('div', attrs={'data-test': re.compile('occ-career-progress')})
     career_data = []
     
-    for step in career_steps:
-        title_elem = step.find('a', class_=re.compile('CareerSteps_JobTitleLink')) or \
-                     step.find('span', class_=re.compile('CareerSteps_JobTitleLink'))
+    for step in page['career_step']:
+        title_fields = CAREER_STEP.first(step)
+        title_elem = title_fields.get('title_link') or title_fields.get('title_span')
         
         if title_elem:
             title = title_elem.get_text(strip=True)
@@ -81,78 +83,78 @@ def extract_overall_stats(soup) -> Dict:
             if salary_elem:
                 salary_text = salary_elem.get_text(strip=True)
                 # Parse range like "$89K–$160K/yr"
-                salary_clean = salary_text.replace('/yr', '').strip()
-                parts = salary_clean.split('–') or salary_clean.split('-')
-                if len(parts) == 2:
+                salary_range = parse_range(salary_text)
+                if salary_range:
                     career_data.append({
                         'title': title,
-                        'min_cad': extract_salary_number(parts[0]),
-                        'max_cad': extract_salary_number(parts[1])
+                        'min_cad': salary_range[0],
+                        'max_cad': salary_range[1]
                     })
     
     if career_data:
         stats['career_progression'] = career_data
     
     # Number of companies
-    companies_header = soup.find('p', class_=re.compile('SalariesSubHeader_DesktopSalariesCount'))
-    if companies_header:
-        text = companies_header.get_text(strip=True)
-        match = re.search(r'(\d+)\s+companies', text)
+    if page['companies_count']:
+        text = page['companies_count'][0].get_text(strip=True)
+        match = COMPANIES_COUNT_RE.search(text)
         if match:
             stats['total_companies'] = int(match.group(1))
     
     return stats
 
 
-def extract_companies(soup) -> List[Dict]:
+def extract_companies(soup, page: Dict = None) -> List[Dict]:
     """Extract company salary data from Glassdoor HTML."""
     companies = []
+    if page is None:
+        page = scan_page(soup)
     
-    salary_items = soup.find_all('div', class_=re.compile('SalariesList_Item'))
-    
-    for item in salary_items:
+    for item in page['salary_item']:
         try:
+            # All card fields in one pass over the card subtree
+            fields = CARD.first(item)
+            
             # Company name
-            company_name_elem = item.find('p', class_=re.compile('salary-card_EmployerName'))
+            company_name_elem = fields.get('company_name')
             if not company_name_elem:
                 continue
             company_name = company_name_elem.get_text(strip=True)
             
             # Rating
-            rating_elem = item.find('p', class_=re.compile('salary-card_Rating'))
+            rating_elem = fields.get('rating')
             rating = float(rating_elem.get_text(strip=True)) if rating_elem else None
             
             # Total pay range
-            total_pay_elem = item.find('div', class_=re.compile('salary-card_TotalPay'))
+            total_pay_elem = fields.get('total_pay')
             total_pay = None
             min_pay = None
             max_pay = None
             
             if total_pay_elem:
                 total_pay_text = total_pay_elem.get_text(strip=True)
-                parts = total_pay_text.split('-')
-                if len(parts) == 2:
-                    min_pay = extract_salary_number(parts[0])
-                    max_pay = extract_salary_number(parts[1])
+                pay_range = parse_range(total_pay_text)
+                if pay_range:
+                    min_pay, max_pay = pay_range
                     total_pay = total_pay_text
             
             # Median salary
-            median_elem = item.find('div', class_=re.compile('salary-card_BreakdownBold'))
+            median_elem = fields.get('median')
             median_salary = None
             if median_elem:
                 median_text = median_elem.get_text(strip=True)
-                median_salary = extract_salary_number(median_text)
+                median_salary = parse_salary(median_text)
             
             # Job title
-            job_title_elem = item.find('section', class_=re.compile('salary-card_TitleTrim'))
+            job_title_elem = fields.get('job_title')
             job_title = job_title_elem.get_text(strip=True) if job_title_elem else "AI Engineer"
             
             # Open jobs
-            open_jobs_elem = item.find('span', class_=re.compile('button_ButtonContent'))
+            open_jobs_elem = fields.get('open_jobs')
             open_jobs = 0
             if open_jobs_elem:
                 open_jobs_text = open_jobs_elem.get_text(strip=True)
-                match = re.search(r'(\d+)\s+open', open_jobs_text)
+                match = OPEN_JOBS_RE.search(open_jobs_text)
                 if match:
                     open_jobs = int(match.group(1))
             
@@ -174,27 +176,107 @@ def extract_companies(soup) -> List[Dict]:
     return companies
 
 
-def process_html_file(html_path: Path, location: str = None) -> Tuple[Dict, List[Dict]]:
-    """Process a single HTML file and return overall stats + companies."""
-    if not location:
-        location = extract_location_from_filename(html_path.name)
-    
+def parse_html_file(html_path: Path) -> Tuple[Dict, List[Dict]]:
+    """Parse one saved page. Depends only on file content, so it is cacheable."""
     with open(html_path, 'r', encoding='utf-8') as f:
         html = f.read()
     
+    timer = PageTimer()
     soup = BeautifulSoup(html, 'lxml')
+    timer.lap('parse')
+    page = scan_page(soup)
+    timer.lap('scan')
     
     # Extract overall statistics
-    overall_stats = extract_overall_stats(soup)
-    overall_stats['location'] = location
-    overall_stats['source_file'] = html_path.name
+    overall_stats = extract_overall_stats(soup, page)
     
     # Extract companies
-    companies = extract_companies(soup)
+    companies = extract_companies(soup, page)
+    timer.lap('extract')
+    overall_stats['timings'] = timer.summary()
+    
+    return overall_stats, companies
+
+
+def process_html_file(html_path: Path, location: str = None) -> Tuple[Dict, List[Dict]]:
+    """Process a single HTML file and return overall stats + companies."""
+    if not location:
+        location = extract_location_from_filename(html_path.name)
+    
+    overall_stats, companies = parse_html_file(html_path)
+    overall_stats['location'] = location
+    overall_stats['source_file'] = html_path.name
     
     return overall_stats, companies
 
 
+def _parse_html_file_safe(html_path: Path) -> Tuple[Dict, List[Dict], str]:
+    """Worker wrapper: return the error message instead of raising across processes."""
+    try:
+        overall_stats, companies = parse_html_file(html_path)
+        return overall_stats, companies, None
+    except Exception as e:
+        return None, None, str(e)
+
+
+def _iter_parsed(html_files: List[Path], workers: int):
+    """Yield (overall_stats, companies, error) per file, in input order."""
+    if workers <= 1 or len(html_files) <= 1:
+        for html_file in html_files:
+            yield _parse_html_file_safe(html_file)
+        return
+    
+    chunksize = max(1, len(html_files) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(_parse_html_file_safe, html_files, chunksize=chunksize)
+
+
+def iter_processed_files(html_files: List[Path], workers: int = 1, cache=None):
+    """Yield (html_file, overall_stats, companies, error) in input order.
+
+    Files whose content is already in the parse cache are not parsed again.
+    With workers > 1 the remaining files are parsed on a process pool;
+    results are still streamed back in the order of html_files so output
+    is identical to the serial path.
+    """
+    entries = {}
+    cached = {}
+    if cache is not None:
+        for html_file in html_files:
+            entries[html_file], value = cache.lookup(html_file, CACHE_KEY)
+            if value is not None:
+                cached[html_file] = value
+    
+    parsed = _iter_parsed([f for f in html_files if f not in cached], workers)
+    
+    for html_file in html_files:
+        if html_file in cached:
+            overall_stats, companies = cached.pop(html_file)
+            overall_stats['timings'] = 'cache hit'
+            error = None
+        else:
+            overall_stats, companies, error = next(parsed)
+            if error is None and cache is not None:
+                cache.store(entries[html_file], (overall_stats, companies))
+        
+        if error is None:
+            overall_stats['location'] = extract_location_from_filename(html_file.name)
+            overall_stats['source_file'] = html_file.name
+        
+        yield html_file, overall_stats, companies, error
+
+
+def add_metadata(overall_stats: Dict, companies: List[Dict], date: str):
+    """Stamp a page's results with collection date, source and location."""
+    overall_stats['collection_date'] = date
+    overall_stats['source'] = 'Glassdoor'
+    
+    for company in companies:
+        company['location'] = overall_stats['location']
+        company['collection_date'] = date
+        company['source'] = 'Glassdoor'
+
+
 def main():
     parser = argparse.ArgumentParser(description='Process all Glassdoor HTML files')
     parser.add_argument('--html-dir', default='data/glassdoor_pages',
@@ -204,6 +286,12 @@ def main():
                        help='Output directory for CSV files')
     parser.add_argument('--consolidated', action='store_true',
                        help='Create consolidated CSV with all locations')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Number of worker processes for parsing (0 = all cores)')
+    parser.add_argument('--consolidated-format', choices=['csv', 'parquet', 'jsonl'], default='csv',
+                       help='File format of the consolidated datasets')
+    add_cache_args(parser)
+    add_sink_args(parser)
     
     args = parser.parse_args()
     
@@ -222,29 +310,37 @@ def main():
         print(f"❌ No HTML files found in {html_dir}")
         return 1
     
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+    
     print(f"\n{'='*60}")
     print(f"  Processing {len(html_files)} Glassdoor HTML files")
+    if workers > 1:
+        print(f"  Workers: {workers}")
     print(f"{'='*60}\n")
     
-    all_overall_stats = []
-    all_companies = []
+    cache = cache_from_args(args)
     
-    for html_file in sorted(html_files):
+    # Consolidated datasets are streamed page by page instead of collected
+    companies_sink = overall_sink = None
+    if args.consolidated:
+        companies_sink = open_sink(out_dir / f'stat_real_data_all_companies.{args.consolidated_format}',
+                                   COMPANY_COLUMNS, args.batch_size, COMPANY_TYPES)
+        overall_sink = open_sink(out_dir / f'stat_real_data_location_stats.{args.consolidated_format}',
+                                 LOCATION_STATS_COLUMNS, args.batch_size, LOCATION_STATS_TYPES)
+    
+    for html_file, overall_stats, companies, error in iter_processed_files(sorted(html_files), workers, cache):
         print(f"📄 {html_file.name}")
         
+        if error:
+            print(f"   ❌ Error processing {html_file.name}: {error}\n")
+            continue
+        
         try:
-            overall_stats, companies = process_html_file(html_file)
-            
             location = overall_stats['location']
+            timings = overall_stats.pop('timings', None)
             
             # Add metadata
-            overall_stats['collection_date'] = args.date
-            overall_stats['source'] = 'Glassdoor'
-            
-            for company in companies:
-                company['location'] = location
-                company['collection_date'] = args.date
-                company['source'] = 'Glassdoor'
+            add_metadata(overall_stats, companies, args.date)
             
             # Print summary
             print(f"   📍 Location: {location}")
@@ -252,6 +348,8 @@ def main():
             print(f"   📊 Median: ${overall_stats.get('overall_median_cad', 0)/1000:.0f}K")
             print(f"   🏢 Companies: {len(companies)}")
             print(f"   💼 Open jobs: {sum(c['open_jobs'] for c in companies)}")
+            if timings:
+                print(f"   ⏱️  Parse time: {timings}")
             
             # Career progression
             if 'career_progression' in overall_stats:
@@ -264,14 +362,14 @@ def main():
             
             # Save companies CSV
             if companies:
-                companies_df = pd.DataFrame(companies)
                 companies_csv = out_dir / f'stat_real_data_companies_{location_clean}.csv'
-                companies_df.to_csv(companies_csv, index=False)
+                write_records(companies, companies_csv)
                 print(f"   ✅ Saved: {companies_csv.name}")
             
-            # Collect for consolidated files
-            all_overall_stats.append(overall_stats)
-            all_companies.extend(companies)
+            # Append to the consolidated files
+            if args.consolidated:
+                companies_sink.write_many(companies)
+                overall_sink.write({k: v for k, v in overall_stats.items() if k != 'career_progression'})
             
             print()
             
@@ -280,29 +378,23 @@ def main():
             continue
     
     # Create consolidated files
-    if args.consolidated and all_companies:
+    if args.consolidated:
+        companies_sink.close()
+        overall_sink.close()
+    
+    if args.consolidated and companies_sink.count:
         print(f"{'='*60}")
         print(f"  Creating consolidated datasets")
         print(f"{'='*60}\n")
         
-        # All companies consolidated
-        all_companies_df = pd.DataFrame(all_companies)
-        consolidated_csv = out_dir / 'stat_real_data_all_companies.csv'
-        all_companies_df.to_csv(consolidated_csv, index=False)
-        print(f"✅ Consolidated companies: {consolidated_csv}")
+        # The summaries only need a few columns: read those back
+        all_companies_df = read_back(companies_sink.path, ['company_name', 'location', 'median_salary_cad',
+                                                           'rating', 'open_jobs'])
+        print(f"✅ Consolidated companies: {companies_sink.path}")
         print(f"   Total companies: {len(all_companies_df)}")
         print(f"   Total locations: {all_companies_df['location'].nunique()}")
         print(f"   Total open jobs: {all_companies_df['open_jobs'].sum()}")
-        
-        # Overall stats per location
-        overall_df = pd.DataFrame(all_overall_stats)
-        # Flatten career_progression if exists
-        if 'career_progression' in overall_df.columns:
-            overall_df = overall_df.drop('career_progression', axis=1)
-        
-        overall_csv = out_dir / 'stat_real_data_location_stats.csv'
-        overall_df.to_csv(overall_csv, index=False)
-        print(f"✅ Location statistics: {overall_csv}")
+        print(f"✅ Location statistics: {overall_sink.path}")
         
         # Summary by location
         print(f"\n{'='*60}")
@@ -341,6 +433,8 @@ def main():
         
         print()
     
+    print(cache.summary())
+    
     print(f"\n{'='*60}")
     print(f"  ✅ Processing complete!")
     print(f"{'='*60}\n")
@@ -11,6 +11,8 @@ Note: Always check robots.txt and Terms of Service before scraping.
 Use responsibly with appropriate delays between requests.
 """
 
+import argparse
+import asyncio
 import requests
 from bs4 import BeautifulSoup
 import pandas as pd
@@ -18,12 +20,25 @@ import time
 import json
 from datetime import datetime
 import re
+import sys
 from typing import List, Dict
 import random
 from pathlib import Path
 
+from http_cache import CachedSession, HttpCache
+from http_cache import DEFAULT_CACHE_DIR as DEFAULT_HTTP_CACHE_DIR
+from http_cache import DEFAULT_MAX_MB as DEFAULT_HTTP_CACHE_MAX_MB
+from job_queue import DEFAULT_QUEUE_PATH, JobQueue
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from record_sink import DEFAULT_BATCH_SIZE, TeeSink, open_sink
+
+INDEED_URL = "https://ca.indeed.com/jobs"
+JOB_BANK_URL = "https://www.jobbank.gc.ca/marketreport/wages-occupation/{job_code}/ca"
+
 class AISalaryScraper:
-    def __init__(self, output_dir='data/real_data'):
+    def __init__(self, output_dir='data/real_data', indeed_url=INDEED_URL, job_bank_url=JOB_BANK_URL,
+                 http_cache=None, sink=None):
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
@@ -31,72 +46,99 @@ class AISalaryScraper:
             'Accept-Encoding': 'gzip, deflate',
             'Connection': 'keep-alive',
         }
-        self.session = requests.Session()
+        # With an HttpCache, unchanged pages cost a 304 (or nothing while fresh)
+        self.http_cache = http_cache
+        self.session = CachedSession(http_cache) if http_cache else requests.Session()
+        self.indeed_url = indeed_url
+        self.job_bank_url = job_bank_url
+        # With a sink, records are written as they are scraped instead of kept in results
+        self.sink = sink
         self.results = []
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         
+    def collect(self, records):
+        """Keep scraped records: stream them to the sink if there is one"""
+        if self.sink is not None:
+            self.sink.write_many(records)
+        else:
+            self.results.extend(records)
+    
     def delay(self, min_seconds=2, max_seconds=5):
         """Add random delay to be respectful to servers"""
         time.sleep(random.uniform(min_seconds, max_seconds))
     
+    def delay_after(self, response):
+        """Delay only if the server was actually contacted (not a fresh cache hit)"""
+        if getattr(response, 'cache_status', 'miss') != 'hit':
+            self.delay()
+    
+    def parse_indeed_page(self, content, job_title):
+        """Extract job records from one Indeed search results page"""
+        soup = BeautifulSoup(content, 'html.parser')
+        records = []
+        
+        # Find job cards (structure may vary)
+        job_cards = soup.find_all('div', class_=re.compile('job_seen_beacon|jobsearch-SerpJobCard'))
+        
+        for card in job_cards:
+            try:
+                # Extract title
+                title_elem = card.find('h2', class_=re.compile('jobTitle'))
+                title = title_elem.get_text(strip=True) if title_elem else 'N/A'
+                
+                # Extract company
+                company_elem = card.find('span', class_=re.compile('companyName'))
+                company = company_elem.get_text(strip=True) if company_elem else 'N/A'
+                
+                # Extract location
+                location_elem = card.find('div', class_=re.compile('companyLocation'))
+                job_location = location_elem.get_text(strip=True) if location_elem else 'N/A'
+                
+                # Extract salary if available
+                salary_elem = card.find('div', class_=re.compile('salary-snippet'))
+                salary = salary_elem.get_text(strip=True) if salary_elem else 'Not Listed'
+                
+                records.append({
+                    'source': 'Indeed.ca',
+                    'job_title': title,
+                    'company': company,
+                    'location': job_location,
+                    'salary': salary,
+                    'search_term': job_title,
+                    'scraped_date': datetime.now().strftime('%Y-%m-%d')
+                })
+            except Exception as e:
+                print(f"  ⚠️  Error parsing job card: {e}")
+                continue
+        
+        return records
+    
+    def indeed_params(self, job_title, location, page):
+        return {
+            'q': job_title,
+            'l': location,
+            'start': page * 10
+        }
+    
     def scrape_indeed_ca(self, job_title="AI Engineer", location="Canada", max_pages=3):
         """
         Scrape Indeed.ca for job listings
         Note: Indeed's structure changes frequently
         """
         print(f"\n🔍 Scraping Indeed.ca for {job_title} in {location}...")
-        base_url = "https://ca.indeed.com/jobs"
         
         for page in range(max_pages):
             try:
-                params = {
-                    'q': job_title,
-                    'l': location,
-                    'start': page * 10
-                }
+                params = self.indeed_params(job_title, location, page)
                 
-                response = self.session.get(base_url, params=params, headers=self.headers, timeout=10)
+                response = self.session.get(self.indeed_url, params=params, headers=self.headers, timeout=10)
                 response.raise_for_status()
                 
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Find job cards (structure may vary)
-                job_cards = soup.find_all('div', class_=re.compile('job_seen_beacon|jobsearch-SerpJobCard'))
-                
-                for card in job_cards:
-                    try:
-                        # Extract title
-                        title_elem = card.find('h2', class_=re.compile('jobTitle'))
-                        title = title_elem.get_text(strip=True) if title_elem else 'N/A'
-                        
-                        # Extract company
-                        company_elem = card.find('span', class_=re.compile('companyName'))
-                        company = company_elem.get_text(strip=True) if company_elem else 'N/A'
-                        
-                        # Extract location
-                        location_elem = card.find('div', class_=re.compile('companyLocation'))
-                        job_location = location_elem.get_text(strip=True) if location_elem else 'N/A'
-                        
-                        # Extract salary if available
-                        salary_elem = card.find('div', class_=re.compile('salary-snippet'))
-                        salary = salary_elem.get_text(strip=True) if salary_elem else 'Not Listed'
-                        
-                        self.results.append({
-                            'source': 'Indeed.ca',
-                            'job_title': title,
-                            'company': company,
-                            'location': job_location,
-                            'salary': salary,
-                            'search_term': job_title,
-                            'scraped_date': datetime.now().strftime('%Y-%m-%d')
-                        })
-                    except Exception as e:
-                        print(f"  ⚠️  Error parsing job card: {e}")
-                        continue
+                self.collect(self.parse_indeed_page(response.content, job_title))
                 
                 print(f"  ✓ Scraped page {page + 1}")
-                self.delay()
+                self.delay_after(response)
                 
             except Exception as e:
                 print(f"  ✗ Error scraping page {page + 1}: {e}")
@@ -116,6 +158,33 @@ class AISalaryScraper:
         # In practice, you'd need to handle authentication, JavaScript rendering, etc.
         return
     
+    def parse_job_bank_page(self, content, job_code):
+        """Extract the wage table of one Job Bank NOC report (None if empty)"""
+        soup = BeautifulSoup(content, 'html.parser')
+        
+        # Extract wage information
+        wage_data = {}
+        
+        # Look for wage tables
+        tables = soup.find_all('table')
+        for table in tables:
+            rows = table.find_all('tr')
+            for row in rows:
+                cells = row.find_all(['td', 'th'])
+                if len(cells) >= 2:
+                    key = cells[0].get_text(strip=True)
+                    value = cells[1].get_text(strip=True)
+                    wage_data[key] = value
+        
+        if not wage_data:
+            return None
+        return {
+            'source': 'Job Bank Canada',
+            'job_title': f'NOC {job_code}',
+            'wage_data': json.dumps(wage_data),
+            'scraped_date': datetime.now().strftime('%Y-%m-%d')
+        }
+    
     def scrape_job_bank_ca(self, job_code="21211"):
         """
         Scrape Government of Canada Job Bank
@@ -127,43 +196,150 @@ class AISalaryScraper:
         
         try:
             # Job Bank wage report URL
-            url = f"https://www.jobbank.gc.ca/marketreport/wages-occupation/{job_code}/ca"
+            url = self.job_bank_url.format(job_code=job_code)
             
             response = self.session.get(url, headers=self.headers, timeout=10)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Extract wage information
-            wage_data = {}
-            
-            # Look for wage tables
-            tables = soup.find_all('table')
-            for table in tables:
-                rows = table.find_all('tr')
-                for row in rows:
-                    cells = row.find_all(['td', 'th'])
-                    if len(cells) >= 2:
-                        key = cells[0].get_text(strip=True)
-                        value = cells[1].get_text(strip=True)
-                        wage_data[key] = value
-            
-            if wage_data:
-                self.results.append({
-                    'source': 'Job Bank Canada',
-                    'job_title': f'NOC {job_code}',
-                    'wage_data': json.dumps(wage_data),
-                    'scraped_date': datetime.now().strftime('%Y-%m-%d')
-                })
+            record = self.parse_job_bank_page(response.content, job_code)
+            if record:
+                self.collect([record])
                 print(f"  ✓ Collected wage data")
             else:
                 print(f"  ⚠️  No wage data found")
                 
-            self.delay()
+            self.delay_after(response)
             
         except Exception as e:
             print(f"  ✗ Error: {e}")
     
+    def work_units(self, indeed_searches=(), noc_codes=()):
+        """(source, query, page) units for (job_title, location, max_pages) searches and NOC codes"""
+        units = []
+        for job_title, location, max_pages in indeed_searches:
+            for page in range(max_pages):
+                units.append(('indeed', {'job_title': job_title, 'location': location}, page))
+        for job_code in noc_codes:
+            units.append(('job_bank', {'job_code': job_code}, 0))
+        return units
+    
+    def unit_request(self, source, query, page):
+        """(key, url, params) to fetch one unit"""
+        if source == 'indeed':
+            job_title, location = query['job_title'], query['location']
+            return (('indeed', job_title, location, page), self.indeed_url,
+                    self.indeed_params(job_title, location, page))
+        job_code = query['job_code']
+        return ('job_bank', job_code), self.job_bank_url.format(job_code=job_code), None
+    
+    def build_jobs(self, indeed_searches=(), noc_codes=()):
+        """FetchJobs for (job_title, location, max_pages) searches and NOC codes"""
+        from async_fetch import FetchJob
+        return [FetchJob(*self.unit_request(*unit)) for unit in self.work_units(indeed_searches, noc_codes)]
+    
+    def describe(self, key):
+        if key[0] == 'indeed':
+            _, job_title, location, page = key
+            return f"Indeed {job_title} / {location} page {page + 1}"
+        return f"Job Bank NOC {key[1]}"
+    
+    def parse_page(self, key, content):
+        """Records from a fetched page, dispatched on its job key"""
+        if key[0] == 'indeed':
+            return self.parse_indeed_page(content, key[1])
+        record = self.parse_job_bank_page(content, key[1])
+        return [record] if record else []
+    
+    def handle_result(self, result):
+        """Parse one FetchResult into records (empty list on failure)"""
+        label = self.describe(result.job.key)
+        if not result.ok:
+            print(f"  ✗ {label}: {result.error}")
+            return []
+        
+        records = self.parse_page(result.job.key, result.body)
+        print(f"  ✓ {label}: {len(records)} records ({result.elapsed:.1f}s, {result.attempts} attempt(s))")
+        return records
+    
+    def make_fetcher(self, max_connections=10, per_host=2, rate=0.5):
+        from async_fetch import AsyncFetcher
+        if self.http_cache:
+            from http_cache import CachingFetcher
+            return CachingFetcher(self.http_cache, self.headers, max_connections=max_connections,
+                                  per_host=per_host, rate=rate)
+        return AsyncFetcher(self.headers, max_connections=max_connections, per_host=per_host, rate=rate)
+    
+    def scrape_concurrently(self, indeed_searches=(), noc_codes=(), fetcher=None):
+        """
+        Fetch all Indeed pages and Job Bank reports concurrently.
+        Politeness comes from the fetcher's per-host connection limit and
+        token bucket (rate requests/s per domain) instead of fixed sleeps.
+        """
+        fetcher = fetcher or self.make_fetcher()
+        jobs = self.build_jobs(indeed_searches, noc_codes)
+        print(f"\n🔍 Fetching {len(jobs)} pages concurrently "
+              f"(≤{fetcher.per_host}/host, {fetcher.rate:g} req/s/host)...")
+        
+        start = time.time()
+        for result in fetcher.run(jobs):
+            self.collect(self.handle_result(result))
+        print(f"  ⏱️  {len(jobs)} pages in {time.time() - start:.1f}s")
+    
+    def scrape_queued(self, queue, indeed_searches=(), noc_codes=(), fetcher=None):
+        """
+        Checkpointed sweep: every (source, query, page) unit goes through a
+        persistent JobQueue, completed units are flushed in batches, and a
+        re-run only fetches what is still pending. With a fetcher, pending
+        units are fetched concurrently; otherwise one by one.
+        """
+        new = queue.enqueue(self.work_units(indeed_searches, noc_codes))
+        pending = queue.pending()
+        print(f"\n📋 {queue.summary()}")
+        print(f"   {len(pending)} units to fetch ({new} newly queued)")
+        
+        try:
+            if fetcher is None:
+                for unit in pending:
+                    key, url, params = self.unit_request(unit.source, unit.query, unit.page)
+                    try:
+                        response = self.session.get(url, params=params, headers=self.headers, timeout=10)
+                        response.raise_for_status()
+                        records = self.parse_page(key, response.content)
+                        queue.complete(unit, records)
+                        print(f"  ✓ {self.describe(key)}: {len(records)} records")
+                        self.delay_after(response)
+                    except Exception as e:
+                        queue.fail(unit, str(e))
+                        print(f"  ✗ {self.describe(key)}: {e}")
+            else:
+                from async_fetch import FetchJob
+                
+                units = {}
+                jobs = []
+                for unit in pending:
+                    job = FetchJob(*self.unit_request(unit.source, unit.query, unit.page))
+                    units[job.key] = unit
+                    jobs.append(job)
+                
+                async def consume():
+                    async for result in fetcher.iter_results(jobs):
+                        records = self.handle_result(result)
+                        if result.ok:
+                            queue.complete(units[result.job.key], records)
+                        else:
+                            queue.fail(units[result.job.key], result.error)
+                
+                asyncio.run(consume())
+        finally:
+            # Keep whatever finished, even if the sweep is interrupted
+            queue.flush()
+        
+        if self.sink is not None:
+            self.sink.write_many(queue.iter_results())
+        else:
+            self.results = queue.results()
+        print(f"   {queue.summary()}")
+    
     def scrape_with_selenium(self, url):
         """
         Example using Selenium for JavaScript-heavy sites
@@ -229,30 +405,103 @@ class AISalaryScraper:
         print(f"✅ Exported to {output_path}")
 
 
-def main():
+INDEED_SEARCHES = [
+    ("AI Engineer", "Toronto, ON", 2),
+    ("Data Scientist", "Vancouver, BC", 2),
+    ("Machine Learning Engineer", "Montreal, QC", 2),
+]
+NOC_CODES = [
+    "21211",  # Data Scientists
+    "21231",  # Software Engineers
+]
+
+
+def main(argv=None):
     """Main execution function"""
+    parser = argparse.ArgumentParser(description='Scrape AI salary data for Canada')
+    parser.add_argument('--concurrent', action='store_true',
+                        help='Fetch all pages concurrently (asyncio + aiohttp) instead of one by one')
+    parser.add_argument('--max-connections', type=int, default=10, help='Connection pool size (--concurrent)')
+    parser.add_argument('--per-host', type=int, default=2, help='Max parallel requests per domain (--concurrent)')
+    parser.add_argument('--rate', type=float, default=0.5, help='Requests per second per domain (--concurrent)')
+    parser.add_argument('--no-http-cache', action='store_true',
+                        help='Always download full pages (no conditional requests)')
+    parser.add_argument('--http-cache-dir', default=DEFAULT_HTTP_CACHE_DIR, help='HTTP cache directory')
+    parser.add_argument('--http-cache-max-mb', type=float, default=DEFAULT_HTTP_CACHE_MAX_MB,
+                        help='Evict least recently used responses above this size')
+    parser.add_argument('--max-age', type=float, default=0,
+                        help='Seconds a cached page is reused without revalidation, '
+                             'unless the server sends Cache-Control max-age')
+    parser.add_argument('--queue', nargs='?', const=DEFAULT_QUEUE_PATH, default=None,
+                        help=f'Checkpoint the sweep in a SQLite job queue and resume it on re-run '
+                             f'(default path: {DEFAULT_QUEUE_PATH})')
+    parser.add_argument('--run', default=datetime.now().strftime('%Y-%m-%d'),
+                        help='Name of the queued sweep to create or resume (--queue)')
+    parser.add_argument('--batch-size', type=int, default=10,
+                        help='Flush finished units to the queue every N completions (--queue)')
+    parser.add_argument('--fresh', action='store_true',
+                        help='Discard the queued sweep and start it over (--queue)')
+    parser.add_argument('--stream', action='store_true',
+                        help='Write records to CSV + JSON Lines as they are scraped '
+                             'instead of collecting them in memory')
+    parser.add_argument('--stream-batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help='Records buffered before each write (--stream)')
+    args = parser.parse_args(argv)
+    
     print("="*60)
     print("AI Salary Data Scraper for Canada")
     print("="*60)
     
-    scraper = AISalaryScraper(output_dir='data/real_data')
-    
-    # Example 1: Scrape Indeed for AI Engineer positions
-    scraper.scrape_indeed_ca(job_title="AI Engineer", location="Toronto, ON", max_pages=2)
-    
-    # Example 2: Scrape Indeed for Data Scientist positions
-    scraper.scrape_indeed_ca(job_title="Data Scientist", location="Vancouver, BC", max_pages=2)
+    http_cache = None
+    if not args.no_http_cache:
+        http_cache = HttpCache(args.http_cache_dir, args.http_cache_max_mb, args.max_age)
+    sink = None
+    if args.stream:
+        output_dir = Path('data/real_data')
+        sink = TeeSink(open_sink(output_dir / 'stat_real_data_scraped_jobs.csv', batch_size=args.stream_batch_size),
+                       open_sink(output_dir / 'stat_real_data_scraped_jobs.jsonl', batch_size=args.stream_batch_size))
+    scraper = AISalaryScraper(output_dir='data/real_data', http_cache=http_cache, sink=sink)
     
-    # Example 3: Scrape Indeed for Machine Learning positions
-    scraper.scrape_indeed_ca(job_title="Machine Learning Engineer", location="Montreal, QC", max_pages=2)
+    fetcher = None
+    if args.concurrent:
+        try:
+            fetcher = scraper.make_fetcher(args.max_connections, args.per_host, args.rate)
+        except ImportError:
+            print("  ℹ️  aiohttp not installed. Run: pip install aiohttp")
+            return None
     
-    # Example 4: Get data from Job Bank Canada
-    scraper.scrape_job_bank_ca(job_code="21211")  # Data Scientists
-    scraper.scrape_job_bank_ca(job_code="21231")  # Software Engineers
+    if args.queue:
+        queue = JobQueue(args.queue, run=args.run, batch_size=args.batch_size)
+        if args.fresh:
+            queue.reset()
+        scraper.scrape_queued(queue, INDEED_SEARCHES, NOC_CODES, fetcher)
+        queue.close()
+    elif fetcher is not None:
+        scraper.scrape_concurrently(INDEED_SEARCHES, NOC_CODES, fetcher)
+    else:
+        # Indeed: AI Engineer, Data Scientist and Machine Learning positions
+        for job_title, location, max_pages in INDEED_SEARCHES:
+            scraper.scrape_indeed_ca(job_title=job_title, location=location, max_pages=max_pages)
+        
+        # Job Bank Canada wage reports
+        for job_code in NOC_CODES:
+            scraper.scrape_job_bank_ca(job_code=job_code)
     
     # Save results
-    df = scraper.save_results('stat_real_data_scraped_jobs.csv')
-    scraper.export_to_json('stat_real_data_scraped_jobs.json')
+    if sink is not None:
+        sink.close()
+        df = None
+        if sink.count:
+            paths = ', '.join(str(s.path) for s in sink.sinks)
+            print(f"\n✅ Streamed {sink.count} records to {paths}")
+        else:
+            print("\n⚠️  No data collected to save")
+    else:
+        df = scraper.save_results('stat_real_data_scraped_jobs.csv')
+        scraper.export_to_json('stat_real_data_scraped_jobs.json')
+    
+    if http_cache:
+        print(f"\n🗄️  {http_cache.summary()}")
     
     print("\n" + "="*60)
     print("✅ Scraping Complete!")
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Typed table storage for the pipeline's data/real_data tables.
+
+Tables are addressed by name (e.g. 'stat_master_salaries', 'stat_agg_city')
+and stored as Parquet when pyarrow is installed, CSV otherwise:
+- low-cardinality text columns (city, source, country) are stored and
+  loaded as categoricals, so consumers skip dtype inference
+- read_table(name, columns=[...]) only reads the requested columns
+- CSV stays available as an export format (--csv-export) for spreadsheets
+  and for tools that still read the .csv files
+
+When both files exist, read_table() uses whichever was written last.
+"""
+
+import importlib.util
+from pathlib import Path
+
+import pandas as pd
+
+DATA_DIR = Path('data/real_data')
+CATEGORICAL_COLUMNS = ('city', 'source', 'country')
+
+
+class CsvBackend:
+    suffix = '.csv'
+
+    def write(self, df: pd.DataFrame, path: Path, index: bool):
+        df.to_csv(path, index=index)
+
+    def read(self, path: Path, columns=None) -> pd.DataFrame:
+        dtype = {c: 'category' for c in CATEGORICAL_COLUMNS}
+        return pd.read_csv(path, usecols=columns, dtype=dtype)
+
+
+class ParquetBackend:
+    suffix = '.parquet'
+
+    def write(self, df: pd.DataFrame, path: Path, index: bool):
+        df.to_parquet(path, index=index)
+
+    def read(self, path: Path, columns=None) -> pd.DataFrame:
+        return pd.read_parquet(path, columns=columns)
+
+
+BACKENDS = {'csv': CsvBackend(), 'parquet': ParquetBackend()}
+
+
+def parquet_available() -> bool:
+    return importlib.util.find_spec('pyarrow') is not None
+
+
+def default_format() -> str:
+    return 'parquet' if parquet_available() else 'csv'
+
+
+def with_categories(df: pd.DataFrame) -> pd.DataFrame:
+    """Make CATEGORICAL_COLUMNS (and only those) categoricals."""
+    for col in df.columns:
+        is_category = isinstance(df[col].dtype, pd.CategoricalDtype)
+        if col in CATEGORICAL_COLUMNS and not is_category:
+            df[col] = df[col].astype('category')
+        elif col not in CATEGORICAL_COLUMNS and is_category:
+            # e.g. exp_level from pd.cut: load it back as plain labels, like the CSV
+            df[col] = df[col].astype(object)
+    return df
+
+
+def table_path(name: str, fmt: str, data_dir=DATA_DIR) -> Path:
+    return Path(data_dir) / f"{name}{BACKENDS[fmt].suffix}"
+
+
+def write_table(df: pd.DataFrame, name: str, fmt: str = None, csv_export: bool = False,
+                index: bool = False, data_dir=DATA_DIR) -> list:
+    """Write a table in the given format (plus a CSV copy if csv_export).
+
+    Returns the paths written.
+    """
+    fmt = fmt or default_format()
+    Path(data_dir).mkdir(parents=True, exist_ok=True)
+    formats = [fmt] + (['csv'] if csv_export and fmt != 'csv' else [])
+    typed = with_categories(df.copy())
+    paths = []
+    for f in formats:
+        path = table_path(name, f, data_dir)
+        BACKENDS[f].write(typed, path, index)
+        paths.append(path)
+    return paths
+
+
+def find_table(name: str, data_dir=DATA_DIR):
+    """Return (format, path) of the most recently written copy of a table."""
+    candidates = []
+    for fmt in BACKENDS:
+        if fmt == 'parquet' and not parquet_available():
+            continue
+        path = table_path(name, fmt, data_dir)
+        if path.exists():
+            candidates.append((path.stat().st_mtime, fmt, path))
+    if not candidates:
+        raise FileNotFoundError(f"No stored table '{name}' in {data_dir}")
+    _, fmt, path = max(candidates)
+    return fmt, path
+
+
+def read_table(name: str, columns=None, data_dir=DATA_DIR) -> pd.DataFrame:
+    """Load a table, reading only `columns` if given."""
+    fmt, path = find_table(name, data_dir)
+    return with_categories(BACKENDS[fmt].read(path, columns))
+
+
+def add_storage_args(parser):
+    """Add the standard --format / --csv-export switches."""
+    parser.add_argument('--format', choices=sorted(BACKENDS), default=default_format(),
+                        help='Storage format for output tables (default: parquet if pyarrow is installed)')
+    parser.add_argument('--csv-export', action='store_true',
+                        help='Also write a .csv copy of each table')
+    return parser